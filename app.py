@@ -11,6 +11,7 @@ import streamlit as st
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config.settings import APP_NAME, APP_TAGLINE, APP_ICON
+from services import api_client
 from services.auth_service import (
     init_session, is_authenticated, login, signup, logout
 )
@@ -590,6 +591,9 @@ def render_sidebar():
 
                 if st.button(label, key=f"nav_{item['key']}", use_container_width=True):
                     st.session_state["current_page"] = item["key"]
+                    # Paged listings are re-fetched fresh when a page is reopened
+                    st.session_state.pop("campaign_pages", None)
+                    st.session_state.pop("reply_history", None)
                     st.rerun()
 
                 if is_active:
@@ -622,6 +626,19 @@ def render_sidebar():
 #  MAIN ROUTING
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _refresh_if_published():
+    try:
+        published = api_client.get_scheduler_status().get("published_total")
+    except Exception:
+        return  # backend unreachable: keep what's shown
+    if published is None:
+        return
+    last = st.session_state.get("scheduler_published_total")
+    st.session_state["scheduler_published_total"] = published
+    if last is not None and published != last and "generated_content" in st.session_state:
+        del st.session_state["generated_content"]
+
+
 def main():
     if not is_authenticated():
         render_auth()
@@ -629,13 +646,10 @@ def main():
 
     render_sidebar()
 
-    # ── Auto-publish: flip overdue scheduled posts to published ──
-    from services.db_service import auto_publish_overdue
-    published_count = auto_publish_overdue()
-    if published_count:
-        # Clear cached content so UI refreshes with updated statuses
-        if "generated_content" in st.session_state:
-            del st.session_state["generated_content"]
+    # Scheduled posts are auto-published by the API's background scheduler.
+    # When it has published since the last rerun, drop cached content so the
+    # UI refreshes with updated statuses.
+    _refresh_if_published()
 
     # Route to selected page
     page_key = st.session_state.get("current_page", "Dashboard")
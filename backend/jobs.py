@@ -0,0 +1,22 @@
+"""
+NEXUS — Background Job Helpers
+Shared by the endpoints that can run as background jobs (?background=true).
+"""
+
+from fastapi import Query
+from fastapi.responses import JSONResponse
+
+from services import job_queue
+
+BackgroundParam = Query(False, description="Run as a background job; poll /api/jobs/{job_id} for the result.")
+
+
+async def submit_job(kind: str, params: dict) -> JSONResponse:
+    """Queue a job and answer 202 with its id (an identical pending job is reused)."""
+    job_id, deduplicated = await job_queue.submit(kind, params)
+    return JSONResponse(status_code=202, content={
+        "success": True,
+        "job_id": job_id,
+        "status_url": f"/api/jobs/{job_id}",
+        "deduplicated": deduplicated,
+    })
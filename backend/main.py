@@ -2,15 +2,52 @@
 NEXUS — FastAPI Backend Entry Point
 """
 
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.routers import auth, campaigns, content, analytics, correspondence
+from backend.routers import auth, campaigns, content, analytics, correspondence, scheduler, metrics, jobs
+from services import ai_service, async_db_service, job_queue, publish_scheduler
+
+
+async def _warm_up():
+    """Connect the database and create the Gemini client concurrently, off the event loop."""
+    backend, ai_ready = await asyncio.gather(
+        async_db_service.warm_up(),
+        asyncio.to_thread(ai_service.warm_up),
+    )
+    print(f"✅ Warm-up done (database: {backend}, Gemini: {'ready' if ai_ready else 'fallback'}).")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients are created lazily; warming them here keeps the first requests
+    # (and the scheduler/job resync below) off the connect path.
+    # NEXUS_WARMUP=0 leaves it to first use.
+    if os.getenv("NEXUS_WARMUP", "1") != "0":
+        await _warm_up()
+    # Auto-publish scheduled posts from the API process (NEXUS_SCHEDULER=0 disables)
+    scheduler_enabled = os.getenv("NEXUS_SCHEDULER", "1") != "0"
+    if scheduler_enabled:
+        # start() resyncs from the database and stop() joins the worker thread:
+        # both block, so neither runs on the event loop
+        await asyncio.to_thread(publish_scheduler.start)
+    # Workers for ?background=true generation/insights jobs
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    if scheduler_enabled:
+        await asyncio.to_thread(publish_scheduler.stop)
+
 
 app = FastAPI(
     title="NEXUS API",
     description="Backend API for NEXUS — AI Marketing Command Center",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # ── CORS (allow Streamlit frontend to call the API) ──
@@ -28,6 +65,9 @@ app.include_router(campaigns.router,      prefix="/api/campaigns",      tags=["C
 app.include_router(content.router,        prefix="/api/content",        tags=["Content"])
 app.include_router(analytics.router,      prefix="/api/analytics",      tags=["Analytics"])
 app.include_router(correspondence.router, prefix="/api/correspondence", tags=["Correspondence"])
+app.include_router(scheduler.router,      prefix="/api/scheduler",      tags=["Scheduler"])
+app.include_router(metrics.router,        prefix="/api/metrics",        tags=["Metrics"])
+app.include_router(jobs.router,           prefix="/api/jobs",           tags=["Jobs"])
 
 
 @app.get("/")
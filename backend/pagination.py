@@ -0,0 +1,35 @@
+"""
+NEXUS — Keyset Pagination Helpers
+Shared by the list endpoints that accept ?limit=&cursor=.
+"""
+
+from fastapi import HTTPException, Query
+
+from services.db_service import encode_cursor, decode_cursor
+
+MAX_PAGE_SIZE = 200
+
+LimitParam = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to return everything.")
+CursorParam = Query(None, description="Opaque cursor from a previous page's next_cursor.")
+
+
+def check_cursor(cursor: str):
+    """Reject malformed cursors with a 400 before they reach the database."""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def page_response(docs: list, limit: int, to_dict) -> dict:
+    """
+    Build a page from docs fetched with limit + 1: the extra doc only tells us
+    whether another page exists.
+    """
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    return {
+        "items": [to_dict(d) for d in docs],
+        "next_cursor": encode_cursor(docs[-1]) if has_more and docs else None,
+    }
@@ -0,0 +1,27 @@
+"""
+NEXUS — Field Projection Helpers
+Lets list endpoints return slim documents via ?fields=a,b,c.
+"""
+
+from fastapi import HTTPException, Query
+
+FieldsParam = Query(None, description="Comma-separated fields to return (id is always included).")
+
+
+def parse_fields(fields: str, allowed: tuple = None) -> list:
+    """Split ?fields= into a list of field names, or None for full documents."""
+    if not fields:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip() and f.strip() != "id"]
+    if allowed is not None:
+        unknown = [f for f in names if f not in allowed]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}")
+    return names or None
+
+
+def select_fields(result: dict, fields: list = None) -> dict:
+    """Trim a serialized document to id plus the requested fields."""
+    if not fields:
+        return result
+    return {"id": result["id"], **{k: result[k] for k in fields if k in result}}
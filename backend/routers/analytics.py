@@ -7,10 +7,13 @@ import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from backend.models import InsightRequest
-from services.db_service import get_analytics, save_analytics, get_campaign
+from backend.jobs import BackgroundParam, submit_job
+from services.async_db_service import get_analytics, save_analytics, get_campaign
 from utils.seed_analytics import generate_analytics_data
 from services.ai_service import generate_insights as ai_insights
+from services import job_queue
 
 router = APIRouter()
 
@@ -24,17 +27,17 @@ def _doc_to_dict(doc: dict) -> dict:
 
 
 @router.get("/{campaign_id}")
-def read_analytics(campaign_id: str):
-    doc = get_analytics(campaign_id)
+async def read_analytics(campaign_id: str):
+    doc = await get_analytics(campaign_id)
     if not doc:
         return {"message": "No analytics found. Seed data first.", "data": None}
     return {"data": _doc_to_dict(doc)}
 
 
 @router.post("/{campaign_id}/seed")
-def seed_analytics(campaign_id: str):
+async def seed_analytics(campaign_id: str):
     """Seed simulated analytics for a campaign."""
-    campaign = get_campaign(campaign_id)
+    campaign = await get_campaign(campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
@@ -43,7 +46,7 @@ def seed_analytics(campaign_id: str):
     analytics_data["campaign_id"] = campaign_id
 
     # Save to DB (replaces existing)
-    save_analytics(analytics_data)
+    await save_analytics(analytics_data)
 
     return {
         "success": True,
@@ -53,29 +56,39 @@ def seed_analytics(campaign_id: str):
 
 
 @router.post("/insights")
-def generate_insights(req: InsightRequest):
+async def generate_insights(req: InsightRequest, background: bool = BackgroundParam):
     """Generate AI insights from analytics data."""
+    if background:
+        return await submit_job("analytics.insights", req.model_dump())
+    return await _insights(**req.model_dump())
+
+
+async def _insights(campaign_id: str, business_name: str, campaign_objective: str = "") -> dict:
     # Get analytics data first
-    analytics_doc = get_analytics(req.campaign_id)
+    analytics_doc = await get_analytics(campaign_id)
     if not analytics_doc:
         raise HTTPException(status_code=404, detail="No analytics data found. Seed data first.")
 
-    campaign = get_campaign(req.campaign_id)
+    campaign = await get_campaign(campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found.")
 
-    # Call AI insights
-    insights = ai_insights(
+    # Call AI insights (blocking model call — keep it off the event loop)
+    insights = await run_in_threadpool(
+        ai_insights,
         analytics_data=analytics_doc,
         campaign=campaign,
-        business_name=req.business_name,
+        business_name=business_name,
     )
 
     # Save insights alongside analytics
     analytics_doc["insights"] = insights
-    save_analytics(analytics_doc)
+    await save_analytics(analytics_doc)
 
     return {
         "success": True,
         "insights": insights,
     }
+
+
+job_queue.register("analytics.insights", _insights)
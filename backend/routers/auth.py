@@ -9,8 +9,10 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pymongo.errors import DuplicateKeyError
 from backend.models import SignupRequest, LoginRequest, AuthResponse
-from services.db_service import get_user_by_email, create_user, get_user_by_id
+from services.async_db_service import get_user_by_email, create_user, get_user_by_id
 import bcrypt
 
 router = APIRouter()
@@ -24,17 +26,21 @@ def _check_pw(password: str, hashed: str) -> bool:
 
 
 @router.post("/signup", response_model=AuthResponse)
-def signup(req: SignupRequest):
+async def signup(req: SignupRequest):
     if len(req.password) < 6:
         return AuthResponse(success=False, message="Password must be at least 6 characters.")
 
-    existing = get_user_by_email(req.email)
+    existing = await get_user_by_email(req.email)
     if existing:
         return AuthResponse(success=False, message="An account with this email already exists.")
 
-    hashed = _hash_pw(req.password)
-    user_id = create_user(req.email, hashed, req.name)
-    user = get_user_by_id(user_id)
+    hashed = await run_in_threadpool(_hash_pw, req.password)
+    try:
+        user_id = await create_user(req.email, hashed, req.name)
+    except DuplicateKeyError:
+        # A concurrent signup with the same email won the race
+        return AuthResponse(success=False, message="An account with this email already exists.")
+    user = await get_user_by_id(user_id)
 
     return AuthResponse(
         success=True,
@@ -46,15 +52,15 @@ def signup(req: SignupRequest):
 
 
 @router.post("/login", response_model=AuthResponse)
-def login(req: LoginRequest):
-    user = get_user_by_email(req.email)
+async def login(req: LoginRequest):
+    user = await get_user_by_email(req.email)
     if not user:
         return AuthResponse(success=False, message="No account found with this email.")
 
     if user.get("auth_provider") == "google":
         return AuthResponse(success=False, message="This account uses Google Sign-In.")
 
-    if not _check_pw(req.password, user["password"]):
+    if not await run_in_threadpool(_check_pw, req.password, user["password"]):
         return AuthResponse(success=False, message="Incorrect password.")
 
     return AuthResponse(
@@ -8,12 +8,17 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from fastapi import APIRouter, HTTPException
 from backend.models import CampaignCreate, CampaignUpdate, CampaignResponse
-from services.db_service import (
+from backend.pagination import LimitParam, CursorParam, check_cursor, page_response
+from backend.projection import FieldsParam, parse_fields, select_fields
+from services.async_db_service import (
     save_campaign, get_campaigns, get_campaign, update_campaign, delete_campaign
 )
 
 router = APIRouter()
 
+_FIELDS = ("name", "objective", "audience", "tone", "channels",
+           "duration_weeks", "status", "created_at", "updated_at")
+
 
 def _doc_to_response(doc: dict) -> dict:
     """Convert a MongoDB document to a JSON-safe dict."""
@@ -32,41 +37,57 @@ def _doc_to_response(doc: dict) -> dict:
 
 
 @router.post("/", response_model=CampaignResponse)
-def create_campaign(req: CampaignCreate):
+async def create_campaign(req: CampaignCreate):
     data = req.model_dump()
-    campaign_id = save_campaign(data)
-    doc = get_campaign(campaign_id)
+    campaign_id = await save_campaign(data)
+    doc = await get_campaign(campaign_id)
     return _doc_to_response(doc)
 
 
 @router.get("/")
-def list_campaigns(user_id: str = None):
-    docs = get_campaigns(user_id)
-    return [_doc_to_response(d) for d in docs]
+async def list_campaigns(user_id: str = None, limit: int = LimitParam, cursor: str = CursorParam,
+                         fields: str = FieldsParam):
+    """
+    List campaigns newest first. Without limit, returns a plain list;
+    with limit, returns {"items": [...], "next_cursor": ...}.
+    """
+    wanted = parse_fields(fields, _FIELDS)
+
+    def to_dict(doc):
+        return select_fields(_doc_to_response(doc), wanted)
+
+    if limit is None:
+        docs = await get_campaigns(user_id, fields=wanted, readonly=True)
+        return [to_dict(d) for d in docs]
+
+    check_cursor(cursor)
+    docs = await get_campaigns(user_id, limit=limit + 1, cursor=cursor,
+                               fields=wanted, readonly=True)
+    return page_response(docs, limit, to_dict)
 
 
 @router.get("/{campaign_id}", response_model=CampaignResponse)
-def read_campaign(campaign_id: str):
-    doc = get_campaign(campaign_id)
+async def read_campaign(campaign_id: str):
+    doc = await get_campaign(campaign_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return _doc_to_response(doc)
 
 
 @router.patch("/{campaign_id}")
-def patch_campaign(campaign_id: str, req: CampaignUpdate):
+async def patch_campaign(campaign_id: str, req: CampaignUpdate):
     updates = {k: v for k, v in req.model_dump().items() if v is not None}
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
-    update_campaign(campaign_id, updates)
-    doc = get_campaign(campaign_id)
+    await update_campaign(campaign_id, updates)
+    doc = await get_campaign(campaign_id)
     return _doc_to_response(doc)
 
 
 @router.delete("/{campaign_id}")
-def remove_campaign(campaign_id: str):
-    doc = get_campaign(campaign_id)
+async def remove_campaign(campaign_id: str):
+    doc = await get_campaign(campaign_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    delete_campaign(campaign_id)
+    await delete_campaign(campaign_id)
     return {"success": True, "message": f"Campaign '{doc.get('name', '')}' deleted."}
@@ -3,18 +3,40 @@ NEXUS — Content Router
 CRUD + AI generation endpoints for campaign content.
 """
 
-import sys, os
+import sys, os, json, asyncio
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
 from backend.models import ContentUpdate, GenerateRequest
-from services.db_service import (
-    get_content, save_content, update_content, delete_campaign_content, get_campaign
+from backend.pagination import LimitParam, CursorParam, check_cursor, page_response
+from backend.projection import FieldsParam, parse_fields, select_fields
+from backend.jobs import BackgroundParam, submit_job
+from services.async_db_service import (
+    get_content, save_content, update_content, update_content_many, delete_campaign_content, get_campaign
 )
-from services.ai_service import generate_content as ai_generate, regenerate_single as ai_regen
+from services.ai_service import (
+    api_ready, generate_content as ai_generate, regenerate_single as ai_regen, stream_content as ai_stream
+)
+from services import job_queue, publish_scheduler
+from services.content_similarity import content_index
+from utils.content_scorer import score_pieces
+from services.single_flight import AsyncSingleFlight
 
 router = APIRouter()
 
+# (campaign_id, missing channel set) -> the generation currently running for it
+_generate_flights = AsyncSingleFlight("content_generate")
+
+# A regenerated body this close to anything the campaign has (or had) is
+# retried, up to this many model calls in all, then saved with a flag.
+REGEN_MAX_ATTEMPTS = max(int(os.getenv("AI_REGEN_MAX_ATTEMPTS", "3")), 1)
+
+_FIELDS = ("campaign_id", "channel", "content_type", "body", "hashtags",
+           "posting_time_suggestion", "ai_score", "score_reasoning", "status",
+           "is_edited", "near_duplicate", "scheduled_at", "published_at", "created_at")
+
 
 def _doc_to_dict(doc: dict) -> dict:
     return {
@@ -29,6 +51,7 @@ def _doc_to_dict(doc: dict) -> dict:
         "score_reasoning": doc.get("score_reasoning", ""),
         "status": doc.get("status", "draft"),
         "is_edited": doc.get("is_edited", False),
+        "near_duplicate": doc.get("near_duplicate", False),
         "scheduled_at": str(doc.get("scheduled_at", "")) if doc.get("scheduled_at") else None,
         "published_at": str(doc.get("published_at", "")) if doc.get("published_at") else None,
         "created_at": str(doc.get("created_at", "")),
@@ -36,53 +59,124 @@ def _doc_to_dict(doc: dict) -> dict:
 
 
 @router.get("/{campaign_id}")
-def list_content(campaign_id: str, channel: str = None):
-    docs = get_content(campaign_id, channel)
-    return [_doc_to_dict(d) for d in docs]
+async def list_content(campaign_id: str, channel: str = None,
+                       limit: int = LimitParam, cursor: str = CursorParam,
+                       fields: str = FieldsParam):
+    wanted = parse_fields(fields, _FIELDS)
+
+    def to_dict(doc):
+        return select_fields(_doc_to_dict(doc), wanted)
+
+    if limit is None:
+        docs = await get_content(campaign_id, channel, fields=wanted, readonly=True)
+        return [to_dict(d) for d in docs]
+
+    check_cursor(cursor)
+    docs = await get_content(campaign_id, channel, limit=limit + 1, cursor=cursor,
+                             fields=wanted, readonly=True)
+    return page_response(docs, limit, to_dict)
 
 
 @router.patch("/{content_id}/update")
-def patch_content(content_id: str, req: ContentUpdate):
+async def patch_content(content_id: str, req: ContentUpdate):
     updates = {k: v for k, v in req.model_dump().items() if v is not None}
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
-    update_content(content_id, updates)
+    if "body" in updates:
+        updates["near_duplicate"] = False
+    await update_content(content_id, updates)
+    publish_scheduler.notify(content_id, updates)
     return {"success": True}
 
 
+@router.post("/{campaign_id}/rescore")
+async def rescore_content(campaign_id: str):
+    """
+    Re-score every stored piece of a campaign with the local scorer and save
+    the scores that changed (e.g. after edits, or pieces scored by the model).
+    """
+    campaign = await get_campaign(campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    docs = await get_content(campaign_id, fields=["channel", "body", "hashtags", "ai_score", "score_reasoning"],
+                             readonly=True)
+    scores = await run_in_threadpool(score_pieces, docs, campaign)
+    changed = {
+        str(doc["_id"]): {"ai_score": score, "score_reasoning": reasoning}
+        for doc, (score, reasoning) in zip(docs, scores)
+        if (doc.get("ai_score"), doc.get("score_reasoning")) != (score, reasoning)
+    }
+    await update_content_many(changed)
+    return {"success": True, "scored": len(docs), "updated": len(changed)}
+
+
 @router.post("/generate")
-def generate_content_endpoint(req: GenerateRequest):
+async def generate_content_endpoint(req: GenerateRequest, background: bool = BackgroundParam):
     """
     Generate AI content for a campaign.
     Only generates for channels that don't already have content,
     preserving any scheduled/published pieces.
     """
-    campaign = get_campaign(req.campaign_id)
+    if background:
+        return await submit_job("content.generate", req.model_dump())
+    return await _generate(**req.model_dump())
+
+
+async def _missing_channels(campaign: dict, campaign_id: str) -> list:
+    """Campaign channels that don't have a content piece yet."""
+    existing = await get_content(campaign_id, fields=["channel"], readonly=True)
+    existing_channels = {doc.get("channel") for doc in existing}
+    return [ch for ch in campaign.get("channels", []) if ch not in existing_channels]
+
+
+async def _generate(campaign_id: str, business_name: str) -> dict:
+    campaign = await get_campaign(campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
     # Check which channels already have content
-    existing = get_content(req.campaign_id)
-    existing_channels = {doc.get("channel") for doc in existing}
-    all_channels = campaign.get("channels", [])
-    missing_channels = [ch for ch in all_channels if ch not in existing_channels]
+    missing_channels = await _missing_channels(campaign, campaign_id)
 
     if not missing_channels:
         # All channels already have content — return existing
-        docs = get_content(req.campaign_id)
+        docs = await get_content(campaign_id, readonly=True)
         return {
             "success": True,
             "message": "All channels already have content. Use Regenerate on individual cards to refresh.",
             "content": [_doc_to_dict(d) for d in docs],
         }
 
+    # Concurrent requests for the same campaign and channels share one
+    # generate-and-save, so the pieces are generated and written once.
+    response, _ = await _generate_flights.do(
+        (campaign_id, frozenset(missing_channels)),
+        lambda: _generate_missing(campaign, campaign_id, business_name),
+    )
+    if response is None:
+        # Joined a streamed generation, which has no response body to share
+        docs = await get_content(campaign_id, readonly=True)
+        return {
+            "success": True,
+            "message": "Content was generated by a concurrent request.",
+            "content": [_doc_to_dict(d) for d in docs],
+        }
+    return response
+
+
+async def _generate_missing(campaign: dict, campaign_id: str, business_name: str) -> dict:
+    # Re-check: a flight that just landed may have filled some channels
+    missing_channels = await _missing_channels(campaign, campaign_id)
+
     # Generate only for missing channels
-    campaign_for_gen = dict(campaign)
-    campaign_for_gen["channels"] = missing_channels
-    content_pieces = ai_generate(campaign_for_gen, business_name=req.business_name)
+    content_pieces = []
+    if missing_channels:
+        campaign_for_gen = dict(campaign)
+        campaign_for_gen["channels"] = missing_channels
+        content_pieces = await run_in_threadpool(ai_generate, campaign_for_gen, business_name=business_name)
 
     if not content_pieces:
-        docs = get_content(req.campaign_id)
+        docs = await get_content(campaign_id, readonly=True)
         return {
             "success": True,
             "message": "No new content generated.",
@@ -90,10 +184,12 @@ def generate_content_endpoint(req: GenerateRequest):
         }
 
     # Save new pieces (existing ones are untouched)
-    saved_ids = save_content(req.campaign_id, content_pieces)
+    saved_ids = await save_content(campaign_id, content_pieces)
+    for content_id, piece in zip(saved_ids, content_pieces):
+        content_index.add(campaign_id, content_id, piece.get("body", ""))
 
     # Return ALL content (existing + new)
-    docs = get_content(req.campaign_id)
+    docs = await get_content(campaign_id, readonly=True)
     return {
         "success": True,
         "message": f"Generated {len(saved_ids)} new content piece(s) for: {', '.join(missing_channels)}.",
@@ -101,17 +197,83 @@ def generate_content_endpoint(req: GenerateRequest):
     }
 
 
+@router.post("/generate/stream")
+async def generate_content_stream_endpoint(req: GenerateRequest):
+    """
+    Streaming variant of /generate, as NDJSON (one JSON event per line).
+    Each new piece is saved and sent as {"type": "piece", "content": {...}}
+    the moment it is generated; the stream ends with
+    {"type": "done", "generated": n, "message": "..."}.
+    """
+    campaign = await get_campaign(req.campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    missing_channels = await _missing_channels(campaign, req.campaign_id)
+    key = (req.campaign_id, frozenset(missing_channels))
+
+    async def events():
+        generated = []
+        if missing_channels:
+            in_flight = _generate_flights.joining(key)
+            if in_flight is not None:
+                # An identical generation is running: wait for it, then send its pieces
+                try:
+                    await asyncio.shield(in_flight)
+                except asyncio.CancelledError:
+                    if not in_flight.cancelled():
+                        raise  # this stream was cancelled, not the flight
+                except Exception:
+                    pass
+                for doc in await get_content(req.campaign_id, readonly=True):
+                    if doc.get("channel") in missing_channels:
+                        generated.append(doc["channel"])
+                        yield json.dumps({"type": "piece", "content": _doc_to_dict(doc)}) + "\n"
+            else:
+                _generate_flights.claim(key)
+                try:
+                    campaign_for_gen = dict(campaign)
+                    campaign_for_gen["channels"] = await _missing_channels(campaign, req.campaign_id)
+                    pieces = ai_stream(campaign_for_gen, business_name=req.business_name)
+                    async for piece in iterate_in_threadpool(pieces):
+                        saved_ids = await save_content(req.campaign_id, [piece])
+                        piece["_id"] = saved_ids[0]
+                        content_index.add(req.campaign_id, saved_ids[0], piece.get("body", ""))
+                        generated.append(piece["channel"])
+                        yield json.dumps({"type": "piece", "content": _doc_to_dict(piece)}) + "\n"
+                finally:
+                    _generate_flights.release(key)
+
+        if not missing_channels:
+            message = "All channels already have content. Use Regenerate on individual cards to refresh."
+        elif not generated:
+            message = "No new content generated."
+        else:
+            message = f"Generated {len(generated)} new content piece(s) for: {', '.join(generated)}."
+        yield json.dumps({"type": "done", "generated": len(generated), "message": message}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.post("/regenerate/{content_id}")
-def regenerate_single_endpoint(content_id: str, req: GenerateRequest):
+async def regenerate_single_endpoint(content_id: str, req: GenerateRequest,
+                                     background: bool = BackgroundParam):
     """
     Regenerate a single content piece by its ID.
     """
-    campaign = get_campaign(req.campaign_id)
+    params = {"content_id": content_id, **req.model_dump()}
+    if background:
+        return await submit_job("content.regenerate", params)
+    return await _regenerate(**params)
+
+
+async def _regenerate(content_id: str, campaign_id: str, business_name: str) -> dict:
+    campaign = await get_campaign(campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
     # Get the existing content piece to know its channel/type
-    existing = get_content(req.campaign_id)
+    existing = await get_content(campaign_id, readonly=True)
     target = None
     for doc in existing:
         if str(doc["_id"]) == content_id:
@@ -121,28 +283,68 @@ def regenerate_single_endpoint(content_id: str, req: GenerateRequest):
     if not target:
         raise HTTPException(status_code=404, detail="Content piece not found")
 
-    # Regenerate using AI
-    new_piece = ai_regen(
-        campaign,
-        channel=target["channel"],
-        content_type=target["content_type"],
-        business_name=req.business_name,
+    # Regenerate using AI, retrying near-copies of current or earlier content
+    new_piece, duplicate, attempts = await run_in_threadpool(
+        _regenerate_distinct, campaign, campaign_id, target, business_name,
     )
 
     # Update the existing document
-    update_content(content_id, {
+    await update_content(content_id, {
         "body": new_piece.get("body", ""),
         "hashtags": new_piece.get("hashtags", []),
         "posting_time_suggestion": new_piece.get("posting_time_suggestion", ""),
         "ai_score": new_piece.get("ai_score", 0),
         "score_reasoning": new_piece.get("score_reasoning", ""),
         "is_edited": False,
+        "near_duplicate": duplicate is not None,
     })
+    content_index.add(campaign_id, content_id, new_piece.get("body", ""))
+
+    result = {"success": True, "message": "Content regenerated.", "attempts": attempts,
+              "near_duplicate": duplicate is not None}
+    if duplicate:
+        result["similarity"] = duplicate["similarity"]
+        result["message"] = (f"Content regenerated, but it is still {duplicate['similarity']:.0%} "
+                             f"similar to earlier content after {attempts} attempt(s).")
+    return result
+
+
+def _regenerate_distinct(campaign: dict, campaign_id: str, target: dict, business_name: str) -> tuple:
+    """
+    (piece, duplicate match or None, attempts): regenerate until the body is
+    not a near-duplicate of the campaign's current or previous content, at
+    most REGEN_MAX_ATTEMPTS times, keeping the least similar attempt.
+    """
+    # The version being replaced stays in the index as a previous version
+    content_index.add(campaign_id, str(target["_id"]), target.get("body", ""))
+
+    # Fallback templates repeat by design: retrying or flagging them is pointless
+    if not api_ready():
+        piece = ai_regen(campaign, channel=target["channel"], content_type=target["content_type"],
+                         business_name=business_name)
+        return piece, None, 1
 
-    return {"success": True, "message": "Content regenerated."}
+    best, best_match, avoid = None, None, ""
+    for attempt in range(1, REGEN_MAX_ATTEMPTS + 1):
+        piece = ai_regen(campaign, channel=target["channel"], content_type=target["content_type"],
+                         business_name=business_name, avoid=avoid)
+        match = content_index.find_duplicate(campaign_id, piece.get("body", ""))
+        if best is None or (best_match and (not match or match["similarity"] < best_match["similarity"])):
+            best, best_match = piece, match
+        if match is None:
+            break
+        print(f"⚠️  Regenerated {target['channel']} piece is {match['similarity']:.0%} similar "
+              f"to existing content (attempt {attempt}/{REGEN_MAX_ATTEMPTS}).")
+        avoid = piece.get("body", "")
+    return best, best_match, attempt
 
 
 @router.delete("/{campaign_id}")
-def delete_content(campaign_id: str):
-    delete_campaign_content(campaign_id)
+async def delete_content(campaign_id: str):
+    await delete_campaign_content(campaign_id)
+    content_index.forget(campaign_id)
     return {"success": True, "message": "All content deleted for campaign."}
+
+
+job_queue.register("content.generate", _generate)
+job_queue.register("content.regenerate", _regenerate)
@@ -1,18 +1,34 @@
 """
 NEXUS — Correspondence Router
 AI reply drafting and FAQ management.
+
+Replies are answered from a saved FAQ when the customer message closely
+matches an FAQ question (services.faq_index); only the rest reach the model.
+POST /triage drafts replies for a whole batch of messages at once.
 """
 
-import sys, os
+import sys, os, csv, io, json, asyncio
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from backend.models import ReplyRequest, SaveFaqRequest
-from services.db_service import save_correspondence, get_correspondence, get_campaign
+from backend.pagination import LimitParam, CursorParam, check_cursor, page_response
+from backend.projection import FieldsParam, parse_fields
+from services.async_db_service import (
+    save_correspondence, save_correspondence_many, get_correspondence, get_campaign,
+)
 from services.ai_service import generate_reply as ai_reply
+from services.faq_index import faq_index
+from utils.intent_classifier import get_classifier
 
 router = APIRouter()
 
+# Bulk triage: largest accepted batch, and replies drafted at once per request
+TRIAGE_MAX_MESSAGES = int(os.getenv("NEXUS_TRIAGE_MAX_MESSAGES", "500"))
+TRIAGE_CONCURRENCY = max(int(os.getenv("NEXUS_TRIAGE_CONCURRENCY", "8")), 1)
+
 
 def _doc_to_dict(doc: dict) -> dict:
     result = {k: v for k, v in doc.items() if k != "_id"}
@@ -21,51 +37,258 @@ def _doc_to_dict(doc: dict) -> dict:
 
 
 @router.get("/{campaign_id}")
-def list_correspondence(campaign_id: str, type: str = None):
-    docs = get_correspondence(campaign_id, type)
-    return [_doc_to_dict(d) for d in docs]
+async def list_correspondence(campaign_id: str, type: str = None,
+                              limit: int = LimitParam, cursor: str = CursorParam,
+                              fields: str = FieldsParam):
+    # Correspondence docs are schemaless, so any field name may be requested;
+    # _doc_to_dict already serializes only what the projection returned.
+    wanted = parse_fields(fields)
+
+    if limit is None:
+        docs = await get_correspondence(campaign_id, type, fields=wanted, readonly=True)
+        return [_doc_to_dict(d) for d in docs]
+
+    check_cursor(cursor)
+    docs = await get_correspondence(campaign_id, type, limit=limit + 1, cursor=cursor,
+                                    fields=wanted, readonly=True)
+    return page_response(docs, limit, _doc_to_dict)
 
 
 @router.post("/reply")
-def draft_reply(req: ReplyRequest):
+async def draft_reply(req: ReplyRequest):
     """Generate an AI reply to a customer message."""
-    campaign = get_campaign(req.campaign_id)
+    campaign = await get_campaign(req.campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
+    await _load_faqs(req.campaign_id)
+    result = await _draft(campaign, req.customer_message, req.business_name, req.brand_tone)
+
+    # Save to correspondence history
+    doc = _reply_doc(req.campaign_id, req.customer_message, result)
+    doc_id = await save_correspondence(doc)
+
+    return {
+        "success": True,
+        "id": doc_id,
+        "reply": result.get("reply", ""),
+        "confidence_score": result.get("confidence_score", 0),
+        "escalate": result.get("escalate", False),
+        "escalation_reason": result.get("escalation_reason", ""),
+        "source": doc["source"],
+    }
+
+
+async def _load_faqs(campaign_id: str):
+    if faq_index.needs_load(campaign_id):
+        faqs = await get_correspondence(campaign_id, "faq", fields=["customer_message", "ai_reply"],
+                                        readonly=True)
+        await run_in_threadpool(faq_index.load, campaign_id, faqs)
+
+
+async def _draft(campaign: dict, customer_message: str, business_name: str, brand_tone: str) -> dict:
+    """The campaign's matching FAQ answer if there is one, otherwise an AI reply."""
+    # Off the event loop: with an embedding model the lookup encodes the message
+    match = await run_in_threadpool(faq_index.match, str(campaign["_id"]), customer_message)
+    if match is not None:
+        # The FAQ answers the question, but a refund or complaint still needs a person
+        intent = get_classifier().classify(customer_message)
+        return {
+            "reply": match["answer"],
+            "confidence_score": match["similarity"],
+            "escalate": intent["escalate"],
+            "escalation_reason": intent["escalation_reason"],
+            "source": "faq",
+            "faq_id": match["faq_id"],
+        }
+
     # Call AI reply service
-    result = ai_reply(
-        customer_message=req.customer_message,
+    return await run_in_threadpool(
+        ai_reply,
+        customer_message=customer_message,
         campaign=campaign,
-        business_name=req.business_name,
-        brand_tone=req.brand_tone,
+        business_name=business_name,
+        brand_tone=brand_tone,
     )
 
-    # Save to correspondence history
+
+def _reply_doc(campaign_id: str, customer_message: str, result: dict) -> dict:
     doc = {
-        "campaign_id": req.campaign_id,
+        "campaign_id": campaign_id,
         "type": "reply",
-        "customer_message": req.customer_message,
+        "customer_message": customer_message,
         "ai_reply": result.get("reply", ""),
         "confidence_score": result.get("confidence_score", 0),
         "escalate": result.get("escalate", False),
         "escalation_reason": result.get("escalation_reason", ""),
         "saved_as_faq": False,
+        "source": result.get("source", "ai"),
     }
-    doc_id = save_correspondence(doc)
+    if result.get("faq_id"):
+        doc["faq_id"] = result["faq_id"]
+    return doc
+
+
+# ─── Bulk triage ────────────────────────────────────────────────────────────────
+
+@router.post("/triage")
+async def triage(request: Request, campaign_id: str = None, business_name: str = "My Business",
+                 brand_tone: str = "Professional", stream: bool = True):
+    """
+    Draft replies for a batch of customer messages.
+
+    The body is one of:
+      - JSON: an array of messages, or {"campaign_id", "business_name",
+        "brand_tone", "messages": [...]}; a message is a string or an object
+        with "customer_message" (or "message") and an optional "ref",
+      - CSV (text/csv): a "customer_message" or "message" column (else the
+        first column), optional "ref" column,
+      - JSONL (application/x-ndjson): one message per line.
+    Non-JSON bodies take campaign_id etc. from the query string.
 
+    Up to NEXUS_TRIAGE_CONCURRENCY replies are drafted at once. By default
+    results stream back as NDJSON in completion order — {"type": "result", ...}
+    per message, then {"type": "done", "order": [...], ...} where order lists
+    the message indexes escalated first. stream=false returns all results in
+    that order instead. History is saved with one bulk insert at the end.
+    """
+    body = await request.body()
+    settings, messages = _parse_triage_body(request.headers.get("content-type", ""), body)
+    campaign_id = settings.get("campaign_id") or campaign_id
+    business_name = settings.get("business_name") or business_name
+    brand_tone = settings.get("brand_tone") or brand_tone
+
+    if not campaign_id:
+        raise HTTPException(status_code=400, detail="campaign_id is required.")
+    if not messages:
+        raise HTTPException(status_code=400, detail="No customer messages found in the request.")
+    if len(messages) > TRIAGE_MAX_MESSAGES:
+        raise HTTPException(status_code=413,
+                            detail=f"Too many messages ({len(messages)}); the limit is {TRIAGE_MAX_MESSAGES}.")
+
+    campaign = await get_campaign(campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    await _load_faqs(campaign_id)
+
+    results = _triage_results(campaign, messages, business_name, brand_tone)
+
+    if not stream:
+        rows = [row async for row in results]
+        saved = await _save_triage(campaign_id, rows)
+        rows.sort(key=_escalated_first)
+        return {"success": True, "results": rows, **_triage_summary(rows, saved)}
+
+    async def events():
+        rows = []
+        async for row in results:
+            rows.append(row)
+            yield json.dumps({"type": "result", **row}) + "\n"
+        saved = await _save_triage(campaign_id, rows)
+        order = [row["index"] for row in sorted(rows, key=_escalated_first)]
+        yield json.dumps({"type": "done", "order": order, **_triage_summary(rows, saved)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+def _parse_triage_body(content_type: str, body: bytes) -> tuple:
+    """(settings dict, [{"customer_message", "ref"}]) from a JSON, CSV or JSONL body."""
+    text = body.decode("utf-8-sig", errors="replace")
+    settings, raw = {}, []
+    try:
+        if "csv" in content_type:
+            rows = list(csv.reader(io.StringIO(text)))
+            header = [h.strip().lower() for h in rows[0]] if rows else []
+            column = next((header.index(name) for name in ("customer_message", "message") if name in header), None)
+            ref = header.index("ref") if "ref" in header else None
+            if column is None:
+                column = 0
+            else:
+                rows = rows[1:]
+            raw = [{"customer_message": row[column], "ref": row[ref] if ref is not None and ref < len(row) else None}
+                   for row in rows if column < len(row)]
+        elif "ndjson" in content_type or "jsonl" in content_type or "jsonlines" in content_type:
+            raw = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            data = json.loads(text or "null")
+            if isinstance(data, dict):
+                settings = {k: data.get(k) for k in ("campaign_id", "business_name", "brand_tone")}
+                data = data.get("messages")
+            raw = data if isinstance(data, list) else []
+    except (ValueError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse the request body: {e}")
+
+    messages = []
+    for item in raw:
+        if isinstance(item, dict):
+            message = item.get("customer_message") or item.get("message") or ""
+            ref = item.get("ref")
+        else:
+            message, ref = item, None
+        message = str(message or "").strip()
+        if message:
+            messages.append({"customer_message": message, "ref": ref})
+    return settings, messages
+
+
+async def _triage_results(campaign: dict, messages: list, business_name: str, brand_tone: str):
+    """Yield one result row per message as its reply is ready, at most TRIAGE_CONCURRENCY at once."""
+    limit = asyncio.Semaphore(TRIAGE_CONCURRENCY)
+
+    async def one(index: int, message: dict) -> dict:
+        async with limit:
+            try:
+                result = await _draft(campaign, message["customer_message"], business_name, brand_tone)
+            except Exception as e:
+                print(f"⚠️  Triage reply {index} failed: {e}")
+                result = {"reply": "", "confidence_score": 0, "escalate": True,
+                          "escalation_reason": "No reply could be drafted — needs human review."}
+        return {
+            "index": index,
+            "ref": message["ref"],
+            "customer_message": message["customer_message"],
+            "reply": result.get("reply", ""),
+            "confidence_score": result.get("confidence_score", 0),
+            "escalate": result.get("escalate", False),
+            "escalation_reason": result.get("escalation_reason", ""),
+            "source": result.get("source", "ai"),
+            "faq_id": result.get("faq_id"),
+        }
+
+    tasks = [asyncio.create_task(one(i, m)) for i, m in enumerate(messages)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away mid-stream: don't keep drafting for nobody
+        for task in tasks:
+            task.cancel()
+
+
+async def _save_triage(campaign_id: str, rows: list) -> int:
+    docs = [_reply_doc(campaign_id, row["customer_message"], row) for row in rows if row["reply"]]
+    try:
+        return len(await save_correspondence_many(docs))
+    except Exception as e:
+        print(f"⚠️  Could not save triage history: {e}")
+        return 0
+
+
+def _escalated_first(row: dict) -> tuple:
+    return not row["escalate"], row["index"]
+
+
+def _triage_summary(rows: list, saved: int) -> dict:
     return {
-        "success": True,
-        "id": doc_id,
-        "reply": result.get("reply", ""),
-        "confidence_score": result.get("confidence_score", 0),
-        "escalate": result.get("escalate", False),
-        "escalation_reason": result.get("escalation_reason", ""),
+        "total": len(rows),
+        "escalated": sum(1 for row in rows if row["escalate"]),
+        "faq_answers": sum(1 for row in rows if row["source"] == "faq"),
+        "saved": saved,
     }
 
 
 @router.post("/faq")
-def save_faq(req: SaveFaqRequest):
+async def save_faq(req: SaveFaqRequest):
     doc = {
         "campaign_id": req.campaign_id,
         "type": "faq",
@@ -75,5 +298,6 @@ def save_faq(req: SaveFaqRequest):
         "escalate": False,
         "saved_as_faq": True,
     }
-    faq_id = save_correspondence(doc)
+    faq_id = await save_correspondence(doc)
+    await run_in_threadpool(faq_index.add, req.campaign_id, faq_id, req.question, req.answer)
     return {"success": True, "id": faq_id}
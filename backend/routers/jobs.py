@@ -0,0 +1,47 @@
+"""
+NEXUS — Jobs Router
+Status and results of background jobs.
+"""
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from fastapi import APIRouter, HTTPException, Query
+from services.async_db_service import get_job
+from services import job_queue
+
+router = APIRouter()
+
+MAX_WAIT_SECONDS = 30
+
+
+def _doc_to_dict(doc: dict) -> dict:
+    def stamp(value):
+        return str(value) if value else None
+
+    return {
+        "id": str(doc["_id"]),
+        "kind": doc.get("kind", ""),
+        "status": doc.get("status", "queued"),
+        "result": doc.get("result"),
+        "error": doc.get("error"),
+        "created_at": stamp(doc.get("created_at")),
+        "started_at": stamp(doc.get("started_at")),
+        "finished_at": stamp(doc.get("finished_at")),
+    }
+
+
+@router.get("/status")
+def queue_status():
+    return job_queue.status()
+
+
+@router.get("/{job_id}")
+async def read_job(job_id: str,
+                   wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS,
+                                       description="Long-poll: seconds to wait for the job to finish.")):
+    await job_queue.wait(job_id, wait)
+    doc = await get_job(job_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _doc_to_dict(doc)
@@ -0,0 +1,53 @@
+"""
+NEXUS — Metrics Router
+Runtime counters for the backend's caches, request coalescing, model calls
+and model token usage.
+"""
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from fastapi import APIRouter
+from services import ai_service, db_service, single_flight
+from services.content_similarity import content_index
+from services.faq_index import faq_index
+
+router = APIRouter()
+
+
+@router.get("/cache")
+def cache_metrics():
+    return db_service.cache_stats()
+
+
+@router.get("/ai-cache")
+def ai_cache_metrics():
+    return ai_service.cache_stats()
+
+
+@router.get("/single-flight")
+def single_flight_metrics():
+    return single_flight.stats()
+
+
+@router.get("/model")
+def model_metrics():
+    return ai_service.pipeline_stats()
+
+
+@router.get("/ai-usage")
+def ai_usage_metrics(campaign_id: str = None, user_id: str = None):
+    """Tokens, latency, estimated cost and outcomes of model calls, per campaign and user."""
+    return ai_service.usage_stats(campaign_id=campaign_id, user_id=user_id)
+
+
+@router.get("/faq")
+def faq_metrics():
+    """FAQ index hit rate and lookup latency; every hit is a model call avoided."""
+    return faq_index.stats()
+
+
+@router.get("/duplicates")
+def duplicate_metrics():
+    """Near-duplicate checks on regenerated content and LSH candidates compared per check."""
+    return content_index.stats()
@@ -0,0 +1,17 @@
+"""
+NEXUS — Scheduler Router
+Status of the background auto-publish scheduler.
+"""
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from fastapi import APIRouter
+from services import publish_scheduler
+
+router = APIRouter()
+
+
+@router.get("/status")
+def scheduler_status():
+    return publish_scheduler.status()
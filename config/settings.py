@@ -46,6 +46,9 @@ CAMPAIGN_STATUSES = ["draft", "active", "completed", "paused"]
 # ─── Content Statuses ───────────────────────────────────────────────────────────
 CONTENT_STATUSES = ["draft", "scheduled", "published"]
 
+# ─── List Pagination ────────────────────────────────────────────────────────────
+LIST_PAGE_SIZE = 20  # items fetched per "Load more"
+
 # ─── Duration Options ───────────────────────────────────────────────────────────
 DURATION_OPTIONS = [1, 2, 3, 4, 6, 8, 12]  # weeks
 
@@ -1,26 +1,51 @@
 """
 NEXUS — AI Service
-Handles all Gemini AI interactions: content generation, scoring, insights, replies.
+Handles all Gemini AI interactions: content generation, insights, replies.
+Content pieces are scored locally by utils.content_scorer.
 Phase 3 implements the Content Generator agent.
 """
 
 import os
+import copy
+import hashlib
 import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
+from services.cache import DiskCache, LRUCache
+from services.resilience import CallPipeline, CircuitBreaker, CircuitOpenError, is_retryable
+from services.single_flight import SingleFlight
+from services.usage import UsageTracker
+from utils.analytics_summary import format_summary, summarize_analytics
+from utils.content_scorer import apply_scores
+from utils.intent_classifier import get_classifier
+from utils.json_stream import JSONArrayStream
+
 load_dotenv()
 
 # ─── Gemini Client ──────────────────────────────────────────────────────────────
 
+# Created on first use (or by warm_up()): importing google.genai is the bulk
+# of this module's import cost, and many importers never make an AI call.
 _client = None
 _api_available = False
+_client_checked = False
+_client_lock = threading.Lock()
 
 
 def _init_client():
-    """Initialize the Google GenAI client if API key is set."""
+    """Initialize the Google GenAI client if API key is set. Use _get_client()."""
     global _client, _api_available
 
+    # AI_BASE_URL points the client at another endpoint, e.g. the local fake
+    # server in utils/fake_llm.py, which needs no real key.
+    base_url = os.getenv("AI_BASE_URL", "")
     api_key = os.getenv("GEMINI_API_KEY", "")
+    if base_url and (not api_key or api_key.startswith("<")):
+        api_key = "local"
     if not api_key or api_key.startswith("<"):
         print("⚠️  GEMINI_API_KEY not configured — AI features will use fallback content.")
         _api_available = False
@@ -28,21 +53,228 @@ def _init_client():
 
     try:
         import google.genai
-        _client = google.genai.Client(api_key=api_key)
+        # HTTP-level timeout so attempts abandoned by the call pipeline also end
+        timeout_ms = int(float(os.getenv("AI_TIMEOUT_SECONDS", "30")) * 1000)
+        _client = google.genai.Client(
+            api_key=api_key,
+            http_options=google.genai.types.HttpOptions(timeout=timeout_ms, base_url=base_url or None),
+        )
         _api_available = True
-        print("✅ Google Gemini API client initialized.")
+        print(f"✅ Google Gemini API client initialized{f' ({base_url})' if base_url else ''}.")
     except Exception as e:
         print(f"⚠️  Gemini API init failed ({e}) — using fallback content.")
         _api_available = False
 
 
-_init_client()
+def _get_client():
+    """The Gemini client (None without a key), created once on first use."""
+    global _client_checked
+    if not _client_checked:
+        with _client_lock:
+            if not _client_checked:
+                _init_client()
+                _client_checked = True
+    return _client
+
+
+def _api_ready() -> bool:
+    _get_client()
+    return _api_available
+
+
+def api_ready() -> bool:
+    """True if calls go to Gemini, False if they get the fallback templates."""
+    return _api_ready()
+
+
+def warm_up() -> bool:
+    """Create the client now instead of on the first AI call. True if the API is usable."""
+    return _api_ready()
 
 
 # ─── Config ─────────────────────────────────────────────────────────────────────
 
 AI_MODEL = os.getenv("AI_MODEL", "gemini-2.5-flash")
 
+# generate_content sends one request per channel, at most AI_MAX_CONCURRENCY
+# in flight across the process. AI_PARALLEL_CHANNELS=0 restores the single
+# all-channels prompt.
+AI_PARALLEL_CHANNELS = os.getenv("AI_PARALLEL_CHANNELS", "1") != "0"
+AI_MAX_CONCURRENCY = max(int(os.getenv("AI_MAX_CONCURRENCY", "5")), 1)
+
+# generate_insights sends a pre-aggregated summary table; "json" sends the raw
+# per-channel metrics instead.
+AI_INSIGHTS_FORMAT = os.getenv("AI_INSIGHTS_FORMAT", "compact")
+
+# ai_score / score_reasoning come from utils.content_scorer and the content
+# prompts don't ask the model for them. AI_LOCAL_SCORING=0 restores the
+# model's self-assessment (fallback pieces are always scored locally).
+AI_LOCAL_SCORING = os.getenv("AI_LOCAL_SCORING", "1") != "0"
+
+_channel_pool = ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY, thread_name_prefix="nexus-ai")
+
+
+# ─── Call Pipeline ──────────────────────────────────────────────────────────────
+
+# Every Gemini request goes through _pipeline: per-attempt timeout, overall
+# deadline, jittered retries on transient errors, and a circuit breaker that
+# sends calls straight to the fallback templates while Gemini keeps failing.
+# generate_reply also hedges: a second request after AI_HEDGE_DELAY_SECONDS
+# (0 disables), first answer wins.
+_pipeline = CallPipeline(
+    timeout=float(os.getenv("AI_TIMEOUT_SECONDS", "30")),
+    deadline=float(os.getenv("AI_DEADLINE_SECONDS", "60")),
+    retries=int(os.getenv("AI_MAX_RETRIES", "2")),
+    base_delay=float(os.getenv("AI_RETRY_BASE_SECONDS", "0.5")),
+    hedge_delay=float(os.getenv("AI_HEDGE_DELAY_SECONDS", "2")),
+    breaker=CircuitBreaker(
+        threshold=int(os.getenv("AI_BREAKER_THRESHOLD", "5")),
+        reset_seconds=float(os.getenv("AI_BREAKER_RESET_SECONDS", "30")),
+    ),
+)
+
+
+def pipeline_stats() -> dict:
+    """Timeout/retry/breaker/hedge counters for Gemini calls."""
+    return _pipeline.stats()
+
+
+# ─── Usage Accounting ───────────────────────────────────────────────────────────
+
+# Every model call (and cache hit) is recorded with its token counts, latency,
+# cache status and outcome, attributed to the campaign and its owner.
+_usage = UsageTracker()
+
+
+def _usage_tags(kind: str, campaign: dict) -> dict:
+    return {
+        "kind": kind,
+        "campaign_id": str(campaign.get("_id") or campaign.get("id") or ""),
+        "user_id": str(campaign.get("user_id") or ""),
+    }
+
+
+def _record_usage(tags: dict, prompt: str, output: str = "", usage=None,
+                  latency: float = 0.0, cache: str = "miss", outcome: str = "success"):
+    if tags:
+        _usage.record(model=AI_MODEL, prompt=prompt, output=output, usage=usage,
+                      latency=latency, cache=cache, outcome=outcome, **tags)
+
+
+def _record_fallback(tags: dict, prompt: str, result, use_cache: bool = True):
+    """Record a call answered by the fallback templates (no API); returns result."""
+    _record_usage(tags, prompt, json.dumps(result, default=str), cache=_cache_status(use_cache),
+                  outcome="fallback")
+    return result
+
+
+def usage_stats(campaign_id: str = None, user_id: str = None) -> dict:
+    """Token, latency, cost and outcome totals for model calls."""
+    return _usage.stats(campaign_id=campaign_id, user_id=user_id)
+
+
+# ─── Response Cache ─────────────────────────────────────────────────────────────
+
+# Parsed Gemini responses keyed on sha256(model, prompt): an in-process LRU in
+# front of an on-disk tier (AI_CACHE_PATH, empty = memory only) so identical
+# prompts — re-running insights on unchanged analytics, re-drafting a reply to
+# the same message — skip the API, across restarts too. AI_CACHE=0 disables it.
+AI_CACHE_ENABLED = os.getenv("AI_CACHE", "1") != "0"
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL_SECONDS", "86400"))
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", "nexus_ai_cache.db")
+
+_response_cache = LRUCache(int(os.getenv("AI_CACHE_SIZE", "512")), AI_CACHE_TTL, name="ai_responses")
+_disk_cache = None
+_disk_checked = False
+_cache_lock = threading.Lock()
+_cache_metrics = {
+    "memory_hits": 0,
+    "disk_hits": 0,
+    "misses": 0,
+    "bypassed": 0,
+    "saved_seconds": 0.0,   # original latency of every call served from cache
+}
+
+
+# Concurrent identical generate/insights/reply calls share one model call.
+_flights = SingleFlight("ai_calls")
+
+
+def _flight_key(kind: str, campaign: dict, prompt: str, channels=None) -> tuple:
+    """(kind, campaign id, channel set, prompt hash): identical work, identical key."""
+    campaign_id = str(campaign.get("_id") or campaign.get("id") or "")
+    return kind, campaign_id, frozenset(channels or ()), _cache_key(prompt)
+
+
+def _get_disk_cache():
+    """Open the on-disk tier on first use."""
+    global _disk_cache, _disk_checked
+    with _cache_lock:
+        if not _disk_checked:
+            _disk_checked = True
+            if AI_CACHE_PATH:
+                try:
+                    _disk_cache = DiskCache(AI_CACHE_PATH, AI_CACHE_TTL,
+                                            maxsize=int(os.getenv("AI_CACHE_DISK_SIZE", "5000")))
+                except Exception as e:
+                    print(f"⚠️  AI response cache at {AI_CACHE_PATH} unavailable ({e}) — memory only.")
+        return _disk_cache
+
+
+def _cache_key(prompt: str) -> str:
+    return hashlib.sha256(f"{AI_MODEL}\0{prompt}".encode()).hexdigest()
+
+
+def _count(metric: str, amount=1):
+    with _cache_lock:
+        _cache_metrics[metric] += amount
+
+
+def _cache_lookup(key: str):
+    """Cached response (a private copy), or None on a miss."""
+    entry = _response_cache.get(key)
+    tier = "memory_hits"
+    if entry is None:
+        disk = _get_disk_cache()
+        entry = disk.get(key) if disk is not None else None
+        if entry is None:
+            _count("misses")
+            return None
+        _response_cache.set(key, entry)
+        tier = "disk_hits"
+    _count(tier)
+    _count("saved_seconds", entry["latency"])
+    return copy.deepcopy(entry["value"])
+
+
+def _cache_store(key: str, value, latency: float):
+    entry = {"value": copy.deepcopy(value), "latency": latency}
+    _response_cache.set(key, entry)
+    disk = _get_disk_cache()
+    if disk is not None:
+        try:
+            disk.set(key, entry)
+        except Exception as e:
+            print(f"⚠️  Could not write AI response cache: {e}")
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for the AI response cache."""
+    with _cache_lock:
+        metrics = dict(_cache_metrics)
+    hits = metrics["memory_hits"] + metrics["disk_hits"]
+    lookups = hits + metrics["misses"]
+    disk = _disk_cache
+    return {
+        "enabled": AI_CACHE_ENABLED,
+        "model": AI_MODEL,
+        **metrics,
+        "saved_seconds": round(metrics["saved_seconds"], 3),
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "memory": _response_cache.stats(),
+        "disk_entries": len(disk) if disk is not None else 0,
+    }
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  CONTENT GENERATOR (Agent 1)
@@ -86,6 +318,33 @@ Example structure:
 ]"""
 
 
+CHANNEL_PROMPT = """You are an expert marketing strategist and copywriter.
+
+A business called "{business_name}" is running a marketing campaign.
+
+Campaign Details:
+- Objective: {objective}
+- Target Audience: {audience}
+- Brand Tone: {tone}
+- Duration: {duration_weeks} weeks
+- Channels in this campaign: {channels}
+
+Generate one piece of platform-specific marketing content for the "{channel}" channel.
+Content type: {content_type}
+
+Return ONLY a valid JSON object (not an array). No explanation. No markdown. No preamble.
+
+{{
+  "channel": "{channel}",
+  "content_type": "{content_type}",
+  "body": "...",
+  "hashtags": ["#example"],
+  "posting_time_suggestion": "Tuesday 7PM",
+  "ai_score": 88,
+  "score_reasoning": "Strong hook and clear CTA with relevant hashtags."
+}}"""
+
+
 SINGLE_REGEN_PROMPT = """You are an expert marketing strategist and copywriter.
 
 A business called "{business_name}" is running a marketing campaign.
@@ -112,6 +371,34 @@ Return ONLY a valid JSON object (not an array). No explanation. No markdown. No
 }}"""
 
 
+# Appended to SINGLE_REGEN_PROMPT when a regeneration came back too close to
+# existing content and is being retried.
+REGEN_AVOID_PROMPT = """
+
+Your previous attempt was too similar to content this campaign already has:
+\"\"\"{avoid}\"\"\"
+Write something substantially different: a new hook, angle, structure and wording."""
+
+
+def _strip_scoring(prompt: str) -> str:
+    """The prompt without the ai_score / score_reasoning fields (instructions and example)."""
+    prompt = re.sub(r"^- (ai_score|score_reasoning):.*\n", "", prompt, flags=re.MULTILINE)
+    return re.sub(r',\n\s*"ai_score": \d+,\n\s*"score_reasoning": "[^"]*"', "", prompt)
+
+
+if AI_LOCAL_SCORING:
+    CONTENT_PROMPT = _strip_scoring(CONTENT_PROMPT)
+    CHANNEL_PROMPT = _strip_scoring(CHANNEL_PROMPT)
+    SINGLE_REGEN_PROMPT = _strip_scoring(SINGLE_REGEN_PROMPT)
+
+
+def _scored(pieces: list, campaign: dict) -> list:
+    """Model-generated pieces with local scores (unless AI_LOCAL_SCORING=0)."""
+    if AI_LOCAL_SCORING:
+        apply_scores(pieces, campaign)
+    return pieces
+
+
 def generate_content(campaign: dict, business_name: str = "My Business") -> list:
     """
     Generate marketing content for all channels in a campaign.
@@ -121,26 +408,120 @@ def generate_content(campaign: dict, business_name: str = "My Business") -> list
     if not channels:
         return []
 
-    prompt = CONTENT_PROMPT.format(
+    prompt = _content_prompt(campaign, business_name)
+
+    if not _api_ready():
+        return _record_fallback(_usage_tags("content", campaign), prompt, _fallback_content(campaign),
+                                use_cache=False)
+
+    def call():
+        if AI_PARALLEL_CHANNELS:
+            pieces = {piece["channel"]: piece for piece in iter_channel_content(campaign, business_name)}
+            return [pieces[ch] for ch in channels]
+        # Creative output: never served from the response cache, or generating
+        # again after deleting content would return the same pieces verbatim
+        pieces = _call_gemini_json_array(prompt, fallback_fn=lambda: _fallback_content(campaign),
+                                         use_cache=False, tags=_usage_tags("content", campaign))
+        return _scored(pieces, campaign)
+
+    result, _ = _flights.do(_flight_key("content", campaign, prompt, channels), call)
+    return result
+
+
+def stream_content(campaign: dict, business_name: str = "My Business"):
+    """
+    Yield content pieces one at a time, as soon as each is ready.
+    With AI_PARALLEL_CHANNELS this is iter_channel_content; otherwise the
+    all-channels prompt is streamed and each piece is parsed the moment its
+    JSON object closes. Channels the model skipped or garbled get fallback
+    pieces at the end.
+    """
+    channels = campaign.get("channels", [])
+    if not channels:
+        return
+    if not _api_ready():
+        yield from _record_fallback(_usage_tags("content", campaign), _content_prompt(campaign, business_name),
+                                    _fallback_content(campaign), use_cache=False)
+        return
+    if AI_PARALLEL_CHANNELS:
+        yield from iter_channel_content(campaign, business_name)
+        return
+
+    remaining = list(channels)
+    pieces = _stream_gemini_json_array(_content_prompt(campaign, business_name),
+                                       use_cache=False, tags=_usage_tags("content", campaign))
+    for piece in pieces:
+        channel = piece.get("channel")
+        if channel in remaining and piece.get("body"):
+            remaining.remove(channel)
+            yield _scored([piece], campaign)[0]
+    if remaining:
+        yield from _fallback_content({**campaign, "channels": remaining})
+
+
+def _content_prompt(campaign: dict, business_name: str) -> str:
+    return CONTENT_PROMPT.format(
         business_name=business_name,
         objective=campaign.get("objective", ""),
         audience=campaign.get("audience", ""),
         tone=campaign.get("tone", ""),
         duration_weeks=campaign.get("duration_weeks", 1),
-        channels=", ".join(channels),
+        channels=", ".join(campaign.get("channels", [])),
     )
 
-    if not _api_available:
-        return _fallback_content(campaign)
 
-    return _call_gemini_json_array(prompt, fallback_fn=lambda: _fallback_content(campaign))
+def iter_channel_content(campaign: dict, business_name: str = "My Business"):
+    """
+    Generate one piece per channel concurrently, yielding each as soon as it
+    is ready (completion order, not channel order). A channel whose request
+    fails or returns unusable JSON yields its fallback piece instead.
+    """
+    channels = campaign.get("channels", [])
+    if not _api_ready():
+        yield from _record_fallback(_usage_tags("content", campaign), _content_prompt(campaign, business_name),
+                                    _fallback_content(campaign), use_cache=False)
+        return
+
+    futures = [
+        _channel_pool.submit(_generate_channel, campaign, ch, business_name)
+        for ch in channels
+    ]
+    for future in as_completed(futures):
+        yield future.result()
+
+
+def _generate_channel(campaign: dict, channel: str, business_name: str) -> dict:
+    """One Gemini request for a single channel, falling back for that channel only."""
+    template = _CHANNEL_TEMPLATES.get(channel, _CHANNEL_TEMPLATES["facebook"])
+    prompt = CHANNEL_PROMPT.format(
+        business_name=business_name,
+        objective=campaign.get("objective", ""),
+        audience=campaign.get("audience", ""),
+        tone=campaign.get("tone", ""),
+        duration_weeks=campaign.get("duration_weeks", 1),
+        channels=", ".join(campaign.get("channels", [])),
+        channel=channel,
+        content_type=template["content_type"],
+    )
+
+    def fallback():
+        return _fallback_content({**campaign, "channels": [channel]})[0]
+
+    piece = _call_gemini_json_object(prompt, fallback_fn=fallback, use_cache=False,
+                                     tags=_usage_tags("channel", campaign))
+    if not isinstance(piece, dict) or not piece.get("body"):
+        print(f"⚠️  Gemini returned no usable content for {channel} — using fallback.")
+        return fallback()
+    piece["channel"] = channel
+    return _scored([piece], campaign)[0]
 
 
 def regenerate_single(campaign: dict, channel: str, content_type: str,
-                      business_name: str = "My Business") -> dict:
+                      business_name: str = "My Business", avoid: str = "") -> dict:
     """
     Regenerate a single content piece for one channel.
-    Returns a single content piece dict.
+    Returns a single content piece dict. avoid is a near-duplicate body from
+    an earlier attempt that the new piece must steer away from.
     """
     prompt = SINGLE_REGEN_PROMPT.format(
         business_name=business_name,
@@ -151,64 +532,154 @@ def regenerate_single(campaign: dict, channel: str, content_type: str,
         channel=channel,
         content_type=content_type,
     )
+    if avoid:
+        prompt += REGEN_AVOID_PROMPT.format(avoid=avoid)
 
-    if not _api_available:
-        return _fallback_single(channel, content_type)
+    if not _api_ready():
+        return _record_fallback(_usage_tags("regenerate", campaign), prompt,
+                                _fallback_single(channel, content_type, campaign), use_cache=False)
 
-    return _call_gemini_json_object(prompt, fallback_fn=lambda: _fallback_single(channel, content_type))
+    # Always a fresh call: the user asked for a different piece.
+    piece = _call_gemini_json_object(prompt, fallback_fn=lambda: _fallback_single(channel, content_type, campaign),
+                                     use_cache=False, tags=_usage_tags("regenerate", campaign))
+    if isinstance(piece, dict) and piece.get("body"):
+        piece.setdefault("channel", channel)
+        _scored([piece], campaign)
+    return piece
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  GEMINI API HELPERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def _call_gemini_json_array(prompt: str, fallback_fn=None) -> list:
+def _call_gemini_json_array(prompt: str, fallback_fn=None, use_cache: bool = True,
+                            hedge: bool = False, tags: dict = None) -> list:
     """Call Gemini and parse JSON array response."""
-    import google.genai.types as types
-    try:
-        response = _client.models.generate_content(
-            model=AI_MODEL,
-            contents=prompt,
-        )
-        text = response.text.strip()
+    return _call_gemini_json(prompt, [], fallback_fn, use_cache, hedge, tags)
 
-        # Strip potential markdown fencing
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-            if text.endswith("```"):
-                text = text[:-3].strip()
 
-        return json.loads(text)
-    except json.JSONDecodeError as e:
-        print(f"⚠️  Gemini returned invalid JSON: {e}")
-        return fallback_fn() if fallback_fn else []
-    except Exception as e:
-        print(f"⚠️  Gemini API error: {e}")
-        return fallback_fn() if fallback_fn else []
+def _call_gemini_json_object(prompt: str, fallback_fn=None, use_cache: bool = True,
+                             hedge: bool = False, tags: dict = None) -> dict:
+    """Call Gemini and parse JSON object response."""
+    return _call_gemini_json(prompt, {}, fallback_fn, use_cache, hedge, tags)
 
 
-def _call_gemini_json_object(prompt: str, fallback_fn=None) -> dict:
-    """Call Gemini and parse JSON object response."""
-    import google.genai.types as types
+def _cache_status(use_cache: bool) -> str:
+    if not AI_CACHE_ENABLED:
+        return "off"
+    return "miss" if use_cache else "bypass"
+
+
+def _stream_gemini_json_array(prompt: str, use_cache: bool = True, tags: dict = None):
+    """
+    Stream a Gemini response and yield each element of its JSON array as soon
+    as it is complete. Yields nothing more on API errors; the caller fills gaps.
+    A cleanly parsed array is cached like _call_gemini_json.
+    """
+    key = None
+    if AI_CACHE_ENABLED and use_cache:
+        key = _cache_key(prompt)
+        cached = _cache_lookup(key)
+        if cached is not None:
+            _record_usage(tags, prompt, json.dumps(cached), cache="hit")
+            yield from cached
+            return
+
+    if not _pipeline.breaker.allow():
+        print("⚠️  Gemini circuit breaker open — using fallback content.")
+        _record_usage(tags, prompt, cache=_cache_status(use_cache), outcome="circuit_open")
+        return
+
+    start = time.perf_counter()
+    parser = JSONArrayStream()
+    items = []
+    text, usage = [], None
+    healthy = True
+    outcome = "success"
     try:
-        response = _client.models.generate_content(
-            model=AI_MODEL,
-            contents=prompt,
+        for chunk in _get_client().models.generate_content_stream(model=AI_MODEL, contents=prompt):
+            text.append(chunk.text or "")
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            for item in parser.feed(chunk.text or ""):
+                items.append(copy.deepcopy(item))
+                yield item
+    except Exception as e:
+        print(f"⚠️  Gemini streaming error: {e}")
+        healthy = not is_retryable(e)
+        outcome = "api_error"
+        return
+    finally:
+        # Streams aren't retried, but they still feed the breaker
+        if healthy:
+            _pipeline.breaker.record_success()
+        else:
+            _pipeline.breaker.record_failure()
+        if outcome == "success" and (parser.errors or not parser.finished):
+            outcome = "invalid_json"
+        _record_usage(tags, prompt, "".join(text), usage, time.perf_counter() - start,
+                      _cache_status(use_cache), outcome)
+
+    if key and items and parser.finished and not parser.errors:
+        _cache_store(key, items, time.perf_counter() - start)
+
+
+def _call_gemini_json(prompt: str, empty, fallback_fn=None, use_cache: bool = True,
+                      hedge: bool = False, tags: dict = None):
+    """
+    Call Gemini through the call pipeline and parse its JSON response, serving
+    repeats of the same prompt from the response cache. use_cache=False forces
+    a fresh call; hedge=True races a second request if the first is slow.
+    Fallback results are never cached. tags attributes the call in usage_stats().
+    """
+    key = None
+    if AI_CACHE_ENABLED:
+        if use_cache:
+            key = _cache_key(prompt)
+            cached = _cache_lookup(key)
+            if cached is not None:
+                _record_usage(tags, prompt, json.dumps(cached), cache="hit")
+                return cached
+        else:
+            _count("bypassed")
+
+    start = time.perf_counter()
+    text, usage = "", None
+
+    def record(outcome: str):
+        _record_usage(tags, prompt, text, usage, time.perf_counter() - start,
+                      _cache_status(use_cache), outcome)
+
+    try:
+        response = _pipeline.call(
+            lambda: _get_client().models.generate_content(model=AI_MODEL, contents=prompt),
+            hedge=hedge,
         )
-        text = response.text.strip()
+        usage = getattr(response, "usage_metadata", None)
+        text = (response.text or "").strip()
 
+        # Strip potential markdown fencing
         if text.startswith("```"):
             text = text.split("\n", 1)[1] if "\n" in text else text[3:]
             if text.endswith("```"):
                 text = text[:-3].strip()
 
-        return json.loads(text)
+        result = json.loads(text)
     except json.JSONDecodeError as e:
         print(f"⚠️  Gemini returned invalid JSON: {e}")
-        return fallback_fn() if fallback_fn else {}
+        record("invalid_json")
+        return fallback_fn() if fallback_fn else empty
+    except CircuitOpenError:
+        record("circuit_open")
+        return fallback_fn() if fallback_fn else empty
     except Exception as e:
         print(f"⚠️  Gemini API error: {e}")
-        return fallback_fn() if fallback_fn else {}
+        record("api_error")
+        return fallback_fn() if fallback_fn else empty
+
+    record("success")
+    if key and result:
+        _cache_store(key, result, time.perf_counter() - start)
+    return result
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -220,41 +691,31 @@ _CHANNEL_TEMPLATES = {
         "content_type": "caption",
         "body": "✨ Something exciting is coming your way! Our new campaign is live and we can't wait for you to see what's in store. Stay tuned for more! 🔥\n\nTap the link in bio to learn more 👆",
         "hashtags": ["#NewLaunch", "#Marketing", "#StayTuned", "#Excited", "#ComingSoon"],
-        "posting_time_suggestion": "Wednesday 6PM",
-        "ai_score": 78,
-        "score_reasoning": "Solid engagement hook with clear CTA, but could be more specific to the campaign."
+        "posting_time_suggestion": "Wednesday 6PM"
     },
     "facebook": {
         "content_type": "post",
         "body": "Big things are happening! 🎉\n\nWe're thrilled to announce our latest campaign. Whether you're a long-time fan or just discovering us, there's something for everyone.\n\n👉 Check it out now and let us know what you think in the comments!",
         "hashtags": ["#Announcement", "#Community"],
-        "posting_time_suggestion": "Thursday 1PM",
-        "ai_score": 75,
-        "score_reasoning": "Good community tone, encourages engagement. Could benefit from more specific details."
+        "posting_time_suggestion": "Thursday 1PM"
     },
     "tiktok": {
         "content_type": "script",
         "body": "[HOOK - 0:00] \"Wait until you see this...\"\n[BODY - 0:03] Show the product/service with trending audio\n[CTA - 0:12] \"Follow for more and comment your thoughts!\"\n\nUse trending sound 🔊 | Keep it under 15 seconds",
         "hashtags": ["#ForYou", "#Trending", "#SmallBusiness", "#Viral"],
-        "posting_time_suggestion": "Friday 8PM",
-        "ai_score": 72,
-        "score_reasoning": "Good TikTok format with hook-body-CTA structure. Needs specific content."
+        "posting_time_suggestion": "Friday 8PM"
     },
     "email": {
         "content_type": "email",
         "body": "Subject: You're Invited! Something Special Inside 🎁\n\nHi there,\n\nWe've been working on something special and couldn't wait to share it with you.\n\nAs a valued member of our community, you're getting first access to our latest campaign.\n\n[CTA BUTTON: Learn More →]\n\nDon't miss out — this is one you'll want to see.\n\nWarm regards,\nThe Team",
         "hashtags": [],
-        "posting_time_suggestion": "Tuesday 10AM",
-        "ai_score": 80,
-        "score_reasoning": "Professional email structure with clear CTA. Subject line drives opens."
+        "posting_time_suggestion": "Tuesday 10AM"
     },
     "sms": {
         "content_type": "sms",
         "body": "Hey! 🎉 Something exciting just dropped. Check it out before everyone else: [LINK]. Reply STOP to opt out.",
         "hashtags": [],
-        "posting_time_suggestion": "Monday 11AM",
-        "ai_score": 70,
-        "score_reasoning": "Concise and action-oriented. Includes required opt-out. Could be more specific."
+        "posting_time_suggestion": "Monday 11AM"
     },
 }
 
@@ -267,16 +728,16 @@ def _fallback_content(campaign: dict) -> list:
         template = _CHANNEL_TEMPLATES.get(ch, _CHANNEL_TEMPLATES["facebook"]).copy()
         template["channel"] = ch
         results.append(template)
-    return results
+    return apply_scores(results, campaign)
 
 
-def _fallback_single(channel: str, content_type: str) -> dict:
+def _fallback_single(channel: str, content_type: str, campaign: dict = None) -> dict:
     """Generate a single fallback piece."""
     template = _CHANNEL_TEMPLATES.get(channel, _CHANNEL_TEMPLATES["facebook"]).copy()
     template["channel"] = channel
     template["content_type"] = content_type
     template["body"] = template["body"] + "\n\n[Regenerated — fallback content]"
-    return template
+    return apply_scores([template], campaign)[0]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -288,7 +749,7 @@ INSIGHTS_PROMPT = """You are a senior marketing analytics strategist.
 A business called "{business_name}" ran a campaign with objective: "{objective}".
 
 Here is the cross-channel performance data:
-{analytics_json}
+{analytics_table}
 
 Analyse this data and produce exactly 4 strategic insights. Each insight should answer one of:
 1. Which content type or channel performs best and why?
@@ -316,13 +777,31 @@ def generate_insights(analytics_data: dict, campaign: dict,
     prompt = INSIGHTS_PROMPT.format(
         business_name=business_name,
         objective=campaign.get("objective", ""),
-        analytics_json=json.dumps(analytics_data.get("channels", {}), indent=2),
+        analytics_table=_insights_data(analytics_data),
     )
 
-    if not _api_available:
-        return _fallback_insights(analytics_data)
+    if not _api_ready():
+        return _record_fallback(_usage_tags("insights", campaign), prompt, _fallback_insights(analytics_data))
+
+    result, _ = _flights.do(
+        _flight_key("insights", campaign, prompt),
+        lambda: _call_gemini_json_array(prompt, fallback_fn=lambda: _fallback_insights(analytics_data),
+                                        tags=_usage_tags("insights", campaign)),
+    )
+    return result
 
-    return _call_gemini_json_array(prompt, fallback_fn=lambda: _fallback_insights(analytics_data))
+
+def _insights_data(analytics_data: dict, fmt: str = None) -> str:
+    """
+    The analytics block of INSIGHTS_PROMPT. "compact" (default) is the
+    pre-computed summary table from utils.analytics_summary; "json" is the raw
+    per-channel dict, pretty-printed (AI_INSIGHTS_FORMAT=json).
+    """
+    if (fmt or AI_INSIGHTS_FORMAT) == "json":
+        return json.dumps(analytics_data.get("channels", {}), indent=2)
+    return ("Per channel; rates in %, int/1k = likes+shares+comments per 1,000 reach, "
+            "eng_vs_avg = engagement rate minus the cross-channel average.\n"
+            + format_summary(summarize_analytics(analytics_data)))
 
 
 def _fallback_insights(analytics_data: dict) -> list:
@@ -423,70 +902,26 @@ def generate_reply(customer_message: str, campaign: dict,
         customer_message=customer_message,
     )
 
-    if not _api_available:
-        return _fallback_reply(customer_message, brand_tone)
+    if not _api_ready():
+        return _record_fallback(_usage_tags("reply", campaign), prompt, _fallback_reply(customer_message, brand_tone))
 
-    return _call_gemini_json_object(prompt, fallback_fn=lambda: _fallback_reply(customer_message, brand_tone))
+    result, _ = _flights.do(
+        _flight_key("reply", campaign, prompt),
+        # Replies are latency-sensitive: hedge a slow first request
+        lambda: _call_gemini_json_object(prompt, fallback_fn=lambda: _fallback_reply(customer_message, brand_tone),
+                                         hedge=True, tags=_usage_tags("reply", campaign)),
+    )
+    return result
 
 
 def _fallback_reply(customer_message: str, brand_tone: str = "Professional") -> dict:
     """Generate a demo reply when Gemini API is unavailable."""
-    msg_lower = customer_message.lower()
-
-    # Simple keyword-based reply generation
-    if any(w in msg_lower for w in ["price", "cost", "pricing", "how much"]):
-        reply = (
-            f"Thank you for your interest in our pricing! We'd love to help you find the perfect plan.\n\n"
-            f"Our pricing varies based on your specific needs. I'd recommend scheduling a quick call "
-            f"with our team so we can understand your requirements and provide a tailored quote.\n\n"
-            f"Would you like me to set that up for you?"
-        )
-        confidence = 0.82
-    elif any(w in msg_lower for w in ["complaint", "issue", "problem", "broken", "not working", "disappointed"]):
-        reply = (
-            f"I'm truly sorry to hear about this issue. Your experience matters to us, and I want to make this right.\n\n"
-            f"Could you provide me with your order number or account details so I can look into this immediately? "
-            f"In the meantime, I've flagged this for priority handling.\n\n"
-            f"We'll get this resolved for you as quickly as possible."
-        )
-        confidence = 0.65
-    elif any(w in msg_lower for w in ["refund", "cancel", "money back"]):
-        reply = (
-            f"I understand your concern and I'm sorry for any inconvenience. "
-            f"I'd like to help resolve this for you.\n\n"
-            f"To process your request, I'll need to review your account details. "
-            f"Could you share your order number? I'll escalate this to ensure a swift resolution.\n\n"
-            f"Thank you for your patience."
-        )
-        confidence = 0.45
-        return {
-            "reply": reply,
-            "confidence_score": confidence,
-            "escalate": True,
-            "escalation_reason": "Refund/cancellation requests require human approval."
-        }
-    elif any(w in msg_lower for w in ["thank", "great", "awesome", "love", "amazing"]):
-        reply = (
-            f"Thank you so much for your kind words! It means the world to us. 😊\n\n"
-            f"We're always striving to deliver the best experience. If there's anything else "
-            f"we can help with, don't hesitate to reach out!\n\n"
-            f"Have a wonderful day!"
-        )
-        confidence = 0.95
-    else:
-        reply = (
-            f"Thank you for reaching out! I appreciate your message.\n\n"
-            f"I'd like to make sure I address your query properly. "
-            f"Could you provide a bit more detail about what you're looking for? "
-            f"That way, I can connect you with the right resources or provide a detailed answer.\n\n"
-            f"Looking forward to helping you!"
-        )
-        confidence = 0.72
-
-    escalate = confidence < 0.6
+    classifier = get_classifier()
+    result = classifier.classify(customer_message)
     return {
-        "reply": reply,
-        "confidence_score": confidence,
-        "escalate": escalate,
-        "escalation_reason": "Low confidence score — recommend human review." if escalate else ""
+        "reply": classifier.reply(result),
+        "confidence_score": result["confidence"],
+        "escalate": result["escalate"],
+        "escalation_reason": result["escalation_reason"],
+        "intent": result["intent"],
     }
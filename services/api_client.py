@@ -4,9 +4,13 @@ Streamlit frontend calls this module to interact with the FastAPI backend.
 All HTTP requests to the backend go through here.
 """
 
+import json
 import os
+import time
 import requests
 
+from config.settings import LIST_PAGE_SIZE
+
 # ── Backend URL ──────────────────────────────────────────────────────────────
 # Automatically use the deployed backend unless running locally with an override
 API_BASE = os.getenv("NEXUS_API_URL", "https://one-stop-ai-marketing-system.onrender.com/api")
@@ -32,6 +36,49 @@ def _handle(resp: requests.Response) -> dict:
         return {"success": False, "message": str(e)}
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  BACKGROUND JOBS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+JOB_TIMEOUT_SECONDS = 600
+_JOB_POLL_SECONDS = 25   # long-poll window, kept under typical proxy timeouts
+
+
+def get_job(job_id: str, wait: float = 0) -> dict:
+    resp = _session.get(_url(f"/jobs/{job_id}"), params={"wait": wait} if wait else {})
+    return _handle(resp)
+
+
+def _run_job(resp: requests.Response) -> dict:
+    """
+    Follow a ?background=true submission to completion with long-polling and
+    return the job's result — the same body the blocking endpoint would give.
+    """
+    submitted = _handle(resp)
+    job_id = submitted.get("job_id")
+    if not job_id:
+        return submitted
+
+    deadline = time.monotonic() + JOB_TIMEOUT_SECONDS
+    delay = 0.5
+    while time.monotonic() < deadline:
+        polled = time.monotonic()
+        job = get_job(job_id, wait=_JOB_POLL_SECONDS)
+        status = job.get("status")
+        if status == "succeeded":
+            return job.get("result") or {"success": True}
+        if status == "failed":
+            return {"success": False, "message": job.get("error") or "Job failed."}
+        if status is None:
+            return {"success": False, "message": job.get("detail") or job.get("message", "Job lookup failed.")}
+        # The server answered well before the wait window without the job
+        # finishing (it couldn't long-poll it): back off instead of spinning
+        if time.monotonic() - polled < _JOB_POLL_SECONDS / 2:
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, 5.0)
+    return {"success": False, "message": "Timed out waiting for the background job."}
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  AUTH
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -59,8 +106,21 @@ def create_campaign(data: dict) -> dict:
     return _handle(resp)
 
 
-def list_campaigns(user_id: str = None) -> list:
+def list_campaigns(user_id: str = None, fields: list = None) -> list:
     params = {"user_id": user_id} if user_id else {}
+    if fields:
+        params["fields"] = ",".join(fields)
+    resp = _session.get(_url("/campaigns/"), params=params)
+    return _handle(resp)
+
+
+def list_campaigns_page(user_id: str = None, limit: int = LIST_PAGE_SIZE, cursor: str = None) -> dict:
+    """One page of campaigns: {"items": [...], "next_cursor": str | None}."""
+    params = {"limit": limit}
+    if user_id:
+        params["user_id"] = user_id
+    if cursor:
+        params["cursor"] = cursor
     resp = _session.get(_url("/campaigns/"), params=params)
     return _handle(resp)
 
@@ -84,8 +144,23 @@ def delete_campaign(campaign_id: str) -> dict:
 #  CONTENT
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def list_content(campaign_id: str, channel: str = None) -> list:
+def list_content(campaign_id: str, channel: str = None, fields: list = None) -> list:
+    """Content for a campaign; pass fields to fetch slim docs (e.g. for counters)."""
     params = {"channel": channel} if channel else {}
+    if fields:
+        params["fields"] = ",".join(fields)
+    resp = _session.get(_url(f"/content/{campaign_id}"), params=params)
+    return _handle(resp)
+
+
+def list_content_page(campaign_id: str, channel: str = None,
+                      limit: int = LIST_PAGE_SIZE, cursor: str = None) -> dict:
+    """One page of content: {"items": [...], "next_cursor": str | None}."""
+    params = {"limit": limit}
+    if channel:
+        params["channel"] = channel
+    if cursor:
+        params["cursor"] = cursor
     resp = _session.get(_url(f"/content/{campaign_id}"), params=params)
     return _handle(resp)
 
@@ -96,16 +171,42 @@ def update_content(content_id: str, updates: dict) -> dict:
 
 
 def generate_content(campaign_id: str, business_name: str = "My Business") -> dict:
-    resp = _session.post(_url("/content/generate"), json={
+    resp = _session.post(_url("/content/generate"), params={"background": "true"}, json={
         "campaign_id": campaign_id, "business_name": business_name,
     })
-    return _handle(resp)
+    return _run_job(resp)
+
+
+def generate_content_stream(campaign_id: str, business_name: str = "My Business"):
+    """
+    Yield generation events as the backend streams them:
+    {"type": "piece", "content": {...}} per new piece, then {"type": "done", ...}.
+    Errors are yielded as a final {"type": "error", "message": ...} event.
+    """
+    try:
+        with _session.post(_url("/content/generate/stream"), json={
+            "campaign_id": campaign_id, "business_name": business_name,
+        }, stream=True) as resp:
+            if not resp.ok:
+                body = _handle(resp)
+                yield {"type": "error", "message": body.get("detail") or body.get("message", "")}
+                return
+            for line in resp.iter_lines(decode_unicode=True):
+                if line:
+                    yield json.loads(line)
+    except Exception as e:
+        yield {"type": "error", "message": str(e)}
 
 
 def regenerate_content(content_id: str, campaign_id: str, business_name: str = "My Business") -> dict:
-    resp = _session.post(_url(f"/content/regenerate/{content_id}"), json={
+    resp = _session.post(_url(f"/content/regenerate/{content_id}"), params={"background": "true"}, json={
         "campaign_id": campaign_id, "business_name": business_name,
     })
+    return _run_job(resp)
+
+
+def rescore_content(campaign_id: str) -> dict:
+    resp = _session.post(_url(f"/content/{campaign_id}/rescore"))
     return _handle(resp)
 
 
@@ -114,6 +215,16 @@ def delete_content(campaign_id: str) -> dict:
     return _handle(resp)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  SCHEDULER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def get_scheduler_status() -> dict:
+    """Auto-publish scheduler state: pending, next_due_at, published_total, ..."""
+    resp = _session.get(_url("/scheduler/status"))
+    return _handle(resp)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  ANALYTICS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -129,20 +240,34 @@ def seed_analytics(campaign_id: str) -> dict:
 
 
 def get_insights(campaign_id: str, business_name: str = "", objective: str = "") -> dict:
-    resp = _session.post(_url("/analytics/insights"), json={
+    resp = _session.post(_url("/analytics/insights"), params={"background": "true"}, json={
         "campaign_id": campaign_id,
         "business_name": business_name,
         "campaign_objective": objective,
     })
-    return _handle(resp)
+    return _run_job(resp)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  CORRESPONDENCE
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def list_correspondence(campaign_id: str, type_filter: str = None) -> list:
+def list_correspondence(campaign_id: str, type_filter: str = None, fields: list = None) -> list:
     params = {"type": type_filter} if type_filter else {}
+    if fields:
+        params["fields"] = ",".join(fields)
+    resp = _session.get(_url(f"/correspondence/{campaign_id}"), params=params)
+    return _handle(resp)
+
+
+def list_correspondence_page(campaign_id: str, type_filter: str = None,
+                             limit: int = LIST_PAGE_SIZE, cursor: str = None) -> dict:
+    """One page of correspondence: {"items": [...], "next_cursor": str | None}."""
+    params = {"limit": limit}
+    if type_filter:
+        params["type"] = type_filter
+    if cursor:
+        params["cursor"] = cursor
     resp = _session.get(_url(f"/correspondence/{campaign_id}"), params=params)
     return _handle(resp)
 
@@ -167,3 +292,39 @@ def save_faq(campaign_id: str, question: str, answer: str) -> dict:
         "answer": answer,
     })
     return _handle(resp)
+
+
+def triage_replies(campaign_id: str, messages: list = None, upload: bytes = None,
+                   upload_name: str = "", business_name: str = "", brand_tone: str = ""):
+    """
+    Draft replies for many customer messages, either a list of strings or an
+    uploaded CSV / JSONL / JSON file. Yields the backend's events:
+    {"type": "result", ...} per message as it completes, then
+    {"type": "done", "order": [...], ...}; errors end with {"type": "error", ...}.
+    """
+    params = {"campaign_id": campaign_id}
+    if business_name:
+        params["business_name"] = business_name
+    if brand_tone:
+        params["brand_tone"] = brand_tone
+
+    if upload is not None:
+        name = upload_name.lower()
+        content_type = ("text/csv" if name.endswith(".csv")
+                        else "application/x-ndjson" if name.endswith((".jsonl", ".ndjson"))
+                        else "application/json")
+        request = {"data": upload, "headers": {"Content-Type": content_type}}
+    else:
+        request = {"json": list(messages or [])}
+
+    try:
+        with _session.post(_url("/correspondence/triage"), params=params, stream=True, **request) as resp:
+            if not resp.ok:
+                body = _handle(resp)
+                yield {"type": "error", "message": body.get("detail") or body.get("message", "")}
+                return
+            for line in resp.iter_lines(decode_unicode=True):
+                if line:
+                    yield json.loads(line)
+    except Exception as e:
+        yield {"type": "error", "message": str(e)}
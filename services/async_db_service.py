@@ -0,0 +1,447 @@
+"""
+NEXUS — Async Database Service
+Awaitable mirror of db_service for the FastAPI routers.
+
+- MongoDB: native async queries through Motor, so concurrent requests overlap
+  their Atlas round trips on the event loop instead of each holding a
+  threadpool worker.
+- In-memory: calls straight into db_service (no I/O, nothing to await on).
+- SQLite, or Mongo without Motor installed: the blocking db_service call runs
+  in a worker thread.
+
+The backend is whatever db_service selected, so both layers always share the
+same data — and the same campaign/user cache.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+from services import db_service
+
+# ─── Connection ─────────────────────────────────────────────────────────────────
+
+_motor_client = None
+_motor_db = None
+_motor_checked = False
+
+
+def _get_motor_db():
+    """Lazily create the Motor client when db_service is on MongoDB."""
+    global _motor_client, _motor_db, _motor_checked
+
+    if _motor_checked:
+        return _motor_db
+    if not db_service.is_initialized():
+        # Not connected yet: let _sync connect from a worker thread rather
+        # than blocking the event loop on the first query
+        return None
+    _motor_checked = True
+
+    if db_service.backend() != "mongo":
+        return None
+
+    try:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        import certifi
+
+        _motor_client = AsyncIOMotorClient(
+            os.getenv("MONGODB_URI", ""),
+            serverSelectionTimeoutMS=5000,
+            tlsCAFile=certifi.where(),
+        )
+        _motor_db = _motor_client.get_default_database("nexus")
+    except Exception as e:
+        print(f"⚠️  Motor unavailable ({e}) — async DB calls will use a thread pool.")
+        _motor_db = None
+    return _motor_db
+
+
+async def _sync(fn, *args, **kwargs):
+    """Run a db_service function without blocking the event loop."""
+    if db_service.is_initialized() and db_service.backend() == "memory":
+        return fn(*args, **kwargs)
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+async def warm_up() -> str:
+    """Connect db_service (off the event loop) and the Motor client. Returns the backend name."""
+    backend = await asyncio.to_thread(db_service.warm_up)
+    _get_motor_db()
+    return backend
+
+
+def _oid(doc_id: str):
+    from bson import ObjectId
+    return ObjectId(doc_id)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  USERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def create_user(email: str, hashed_password: str, name: str) -> str:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.create_user, email, hashed_password, name)
+
+    result = await db.users.insert_one({
+        "email": email,
+        "password": hashed_password,
+        "name": name,
+        "auth_provider": "local",
+        "created_at": db_service._now(),
+    })
+    return str(result.inserted_id)
+
+
+async def get_user_by_email(email: str):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.get_user_by_email, email)
+
+    cached = db_service.cache_get(db_service._user_cache, f"email:{email}")
+    if cached is not None:
+        return cached
+    return db_service.cache_put_user(await db.users.find_one({"email": email}))
+
+
+async def get_user_by_id(user_id: str):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.get_user_by_id, user_id)
+
+    cached = db_service.cache_get(db_service._user_cache, f"id:{user_id}")
+    if cached is not None:
+        return cached
+    return db_service.cache_put_user(await db.users.find_one({"_id": _oid(user_id)}))
+
+
+async def create_or_get_google_user(email: str, name: str) -> dict:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.create_or_get_google_user, email, name)
+
+    user = await get_user_by_email(email)
+    if user:
+        return user
+
+    doc = {
+        "email": email,
+        "password": None,
+        "name": name,
+        "auth_provider": "google",
+        "created_at": db_service._now(),
+    }
+    result = await db.users.insert_one(doc)
+    doc["_id"] = result.inserted_id
+    return doc
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  CAMPAIGNS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def save_campaign(data: dict) -> str:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.save_campaign, data)
+
+    data["created_at"] = db_service._now()
+    data["updated_at"] = db_service._now()
+    data.setdefault("status", "active")
+    result = await db.campaigns.insert_one(data)
+    return str(result.inserted_id)
+
+
+async def get_campaigns(user_id: str = None, limit: int = None, cursor: str = None,
+                        fields: list = None, readonly: bool = False) -> list:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.get_campaigns, user_id, limit, cursor, fields, readonly)
+
+    query = {"user_id": user_id} if user_id else {}
+    found = db.campaigns.find(
+        db_service.after_cursor(query, cursor), db_service._projection(fields),
+    ).sort(db_service.NEWEST_FIRST)
+    return await (found.limit(limit) if limit else found).to_list(None)
+
+
+async def get_campaign(campaign_id: str) -> dict:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.get_campaign, campaign_id)
+
+    cached = db_service.cache_get(db_service._campaign_cache, campaign_id)
+    if cached is not None:
+        return cached
+    doc = await db.campaigns.find_one({"_id": _oid(campaign_id)})
+    return db_service.cache_put(db_service._campaign_cache, campaign_id, doc)
+
+
+async def update_campaign(campaign_id: str, updates: dict):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.update_campaign, campaign_id, updates)
+
+    updates["updated_at"] = db_service._now()
+    await db.campaigns.update_one({"_id": _oid(campaign_id)}, {"$set": updates})
+    db_service._campaign_cache.invalidate(campaign_id)
+
+
+async def delete_campaign(campaign_id: str):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.delete_campaign, campaign_id)
+
+    await db.campaigns.delete_one({"_id": _oid(campaign_id)})
+    db_service._campaign_cache.invalidate(campaign_id)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  CONTENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def save_content(campaign_id: str, content_list: list) -> list:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.save_content, campaign_id, content_list)
+
+    now = db_service._now()
+    for item in content_list:
+        item["campaign_id"] = campaign_id
+        item["created_at"] = now
+        item["updated_at"] = now
+        item.setdefault("status", "draft")
+        item.setdefault("is_edited", False)
+    result = await db.content.insert_many(content_list)
+    return [str(i) for i in result.inserted_ids]
+
+
+async def get_content(campaign_id: str, channel: str = None, limit: int = None,
+                      cursor: str = None, fields: list = None, readonly: bool = False) -> list:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.get_content, campaign_id, channel,
+                           limit, cursor, fields, readonly)
+
+    query = {"campaign_id": campaign_id}
+    if channel:
+        query["channel"] = channel
+    found = db.content.find(
+        db_service.after_cursor(query, cursor), db_service._projection(fields),
+    ).sort(db_service.NEWEST_FIRST)
+    return await (found.limit(limit) if limit else found).to_list(None)
+
+
+async def update_content(content_id: str, updates: dict):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.update_content, content_id, updates)
+
+    updates["updated_at"] = db_service._now()
+    await db.content.update_one({"_id": _oid(content_id)}, {"$set": updates})
+
+
+async def update_content_many(updates: dict) -> int:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.update_content_many, updates)
+    if not updates:
+        return 0
+
+    from pymongo import UpdateOne
+    now = db_service._now()
+    result = await db.content.bulk_write([
+        UpdateOne({"_id": _oid(content_id)}, {"$set": {**fields, "updated_at": now}})
+        for content_id, fields in updates.items()
+    ], ordered=False)
+    return result.modified_count
+
+
+async def delete_campaign_content(campaign_id: str):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.delete_campaign_content, campaign_id)
+
+    await db.content.delete_many({"campaign_id": campaign_id})
+
+
+async def auto_publish_overdue() -> int:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.auto_publish_overdue)
+
+    now = datetime.now()
+    result = await db.content.update_many(
+        {"status": "scheduled", "scheduled_at": {"$lte": now.isoformat()}},
+        {"$set": {
+            "status": "published",
+            "published_at": now.isoformat(),
+            "updated_at": db_service._now(),
+        }},
+    )
+    return result.modified_count if result else 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  SCHEDULES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def save_schedule(data: dict) -> str:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.save_schedule, data)
+
+    data["created_at"] = db_service._now()
+    data.setdefault("status", "scheduled")
+    data.setdefault("published_at", None)
+    result = await db.schedules.insert_one(data)
+    return str(result.inserted_id)
+
+
+async def get_schedules(campaign_id: str) -> list:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.get_schedules, campaign_id)
+
+    return await db.schedules.find({"campaign_id": campaign_id}).sort("scheduled_at", 1).to_list(None)
+
+
+async def update_schedule(schedule_id: str, updates: dict):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.update_schedule, schedule_id, updates)
+
+    await db.schedules.update_one({"_id": _oid(schedule_id)}, {"$set": updates})
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  ANALYTICS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def save_analytics(data: dict) -> str:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.save_analytics, data)
+
+    data["created_at"] = db_service._now()
+    await db.analytics.replace_one({"campaign_id": data["campaign_id"]}, data, upsert=True)
+    return data["campaign_id"]
+
+
+async def get_analytics(campaign_id: str):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.get_analytics, campaign_id)
+
+    return await db.analytics.find_one({"campaign_id": campaign_id})
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  CORRESPONDENCE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def save_correspondence(data: dict) -> str:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.save_correspondence, data)
+
+    data["created_at"] = db_service._now()
+    result = await db.correspondence.insert_one(data)
+    return str(result.inserted_id)
+
+
+async def save_correspondence_many(docs: list) -> list:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.save_correspondence_many, docs)
+    if not docs:
+        return []
+
+    now = db_service._now()
+    for doc in docs:
+        doc["created_at"] = now
+    result = await db.correspondence.insert_many(docs)
+    return [str(i) for i in result.inserted_ids]
+
+
+async def get_correspondence(campaign_id: str, type_filter: str = None, limit: int = None,
+                             cursor: str = None, fields: list = None, readonly: bool = False) -> list:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.get_correspondence, campaign_id, type_filter,
+                           limit, cursor, fields, readonly)
+
+    query = {"campaign_id": campaign_id}
+    if type_filter:
+        query["type"] = type_filter
+    found = db.correspondence.find(
+        db_service.after_cursor(query, cursor), db_service._projection(fields),
+    ).sort(db_service.NEWEST_FIRST)
+    return await (found.limit(limit) if limit else found).to_list(None)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  JOBS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def save_job(data: dict) -> str:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.save_job, data)
+
+    data["created_at"] = db_service._now()
+    data.setdefault("status", "queued")
+    result = await db.jobs.insert_one(data)
+    return str(result.inserted_id)
+
+
+async def get_job(job_id: str):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.get_job, job_id)
+
+    return await db.jobs.find_one({"_id": _oid(job_id)})
+
+
+async def find_pending_job(dedupe_key: str, live_since: float):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.find_pending_job, dedupe_key, live_since)
+
+    doc = await db.jobs.find_one(db_service.pending_job_query(dedupe_key, live_since), {"_id": 1})
+    return str(doc["_id"]) if doc else None
+
+
+async def update_job(job_id: str, updates: dict):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.update_job, job_id, updates)
+
+    await db.jobs.update_one({"_id": _oid(job_id)}, {"$set": updates})
+
+
+async def touch_jobs(job_ids: list, heartbeat_at: float):
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.touch_jobs, job_ids, heartbeat_at)
+    if not job_ids:
+        return
+
+    await db.jobs.update_many(
+        {"_id": {"$in": [_oid(j) for j in job_ids]}},
+        {"$set": {"heartbeat_at": heartbeat_at}},
+    )
+
+
+async def fail_unfinished_jobs(reason: str, stale_before: float) -> int:
+    db = _get_motor_db()
+    if db is None:
+        return await _sync(db_service.fail_unfinished_jobs, reason, stale_before)
+
+    result = await db.jobs.update_many(
+        db_service.stale_jobs_query(stale_before),
+        {"$set": {"status": "failed", "error": reason, "finished_at": db_service._now()}},
+    )
+    return result.modified_count if result else 0
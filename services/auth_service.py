@@ -41,7 +41,7 @@ def logout():
     keys_to_clear = [
         "authenticated", "user_id", "user_name", "user_email",
         "active_campaign", "editing_campaign", "generated_content",
-        "last_reply", "current_page",
+        "last_reply", "current_page", "campaign_pages", "reply_history",
     ]
     for key in keys_to_clear:
         if key in st.session_state:
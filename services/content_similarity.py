@@ -0,0 +1,184 @@
+"""
+NEXUS — Content Similarity Index
+Near-duplicate detection over each campaign's content bodies, so a
+regenerated piece that is a near-copy of something the campaign already has
+(or had) is caught before it is saved.
+
+Bodies are compared by the Jaccard similarity of their character 5-gram
+shingles (lower-cased, punctuation and whitespace collapsed), estimated from
+128-value MinHash signatures. Candidates are found by LSH banding: each
+signature is cut into 32 bands of 4 and only bodies sharing a band bucket
+with the query are compared, so a lookup costs the number of close matches,
+not the size of the campaign's history.
+
+Each campaign's index is built on first use from db_service.get_content and
+keeps every body it has seen, including versions regeneration has since
+overwritten. Loaded campaigns are re-read after
+AI_DUPLICATE_INDEX_TTL_SECONDS so content written by other workers is
+picked up.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from services import db_service
+
+DUPLICATE_THRESHOLD = float(os.getenv("AI_DUPLICATE_THRESHOLD", "0.6"))
+_INDEX_TTL = float(os.getenv("AI_DUPLICATE_INDEX_TTL_SECONDS", "300"))
+_MAX_CAMPAIGNS = int(os.getenv("AI_DUPLICATE_INDEX_CAMPAIGNS", "1000"))
+_MAX_BODIES = int(os.getenv("AI_DUPLICATE_INDEX_BODIES", "5000"))   # per campaign, oldest dropped
+
+_SHINGLE = 5
+_PERMUTATIONS = 128
+_BANDS = 32
+_ROWS = _PERMUTATIONS // _BANDS
+
+# Multiply-shift hashing, h(x) = (a·x + b mod 2^64) >> 32 with random odd a,
+# over the 32-bit CRC of each shingle (uint64 arithmetic wraps mod 2^64)
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(0, 1 << 63, size=_PERMUTATIONS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_B = _rng.integers(0, 1 << 63, size=_PERMUTATIONS, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def signature(text: str):
+    """MinHash signature of text's shingles, or None for text with no words."""
+    normalized = " ".join(_TOKEN.findall((text or "").lower()))
+    if not normalized:
+        return None
+    shingles = {normalized[i:i + _SHINGLE] for i in range(max(len(normalized) - _SHINGLE + 1, 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((np.outer(hashes, _A) + _B) >> _SHIFT).min(axis=0)
+
+
+def _bands(sig) -> list:
+    return [(band, sig[band * _ROWS:(band + 1) * _ROWS].tobytes()) for band in range(_BANDS)]
+
+
+# ─── Per-campaign index ─────────────────────────────────────────────────────────
+
+class _CampaignIndex:
+    def __init__(self):
+        self.bodies = OrderedDict()   # (content_id, body digest) -> signature, oldest first
+        self.buckets = {}             # (band, band bytes) -> set of body keys
+        self.loaded_at = None         # None until read from the database
+
+    def add(self, content_id: str, body: str):
+        key = (content_id, hashlib.sha1((body or "").encode()).hexdigest())
+        if key in self.bodies:
+            return
+        sig = signature(body)
+        if sig is None:
+            return
+        self.bodies[key] = sig
+        for bucket in _bands(sig):
+            self.buckets.setdefault(bucket, set()).add(key)
+        while len(self.bodies) > _MAX_BODIES:
+            self._remove(next(iter(self.bodies)))
+
+    def _remove(self, key):
+        sig = self.bodies.pop(key)
+        for bucket in _bands(sig):
+            keys = self.buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.buckets[bucket]
+
+    def nearest(self, sig) -> tuple:
+        """(content_id, estimated similarity, candidates compared) of the closest body."""
+        candidates = set()
+        for bucket in _bands(sig):
+            candidates.update(self.buckets.get(bucket, ()))
+        if not candidates:
+            return None, 0.0, 0
+        keys = list(candidates)
+        similarity = (np.stack([self.bodies[k] for k in keys]) == sig).mean(axis=1)
+        best = int(similarity.argmax())
+        return keys[best][0], float(similarity[best]), len(keys)
+
+
+class ContentSimilarityIndex:
+    def __init__(self, max_campaigns: int = _MAX_CAMPAIGNS):
+        self.max_campaigns = max_campaigns
+        self._campaigns = OrderedDict()   # campaign_id -> _CampaignIndex, LRU order
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "duplicates": 0, "candidates": 0, "loads": 0}
+
+    def _index(self, campaign_id: str) -> _CampaignIndex:
+        index = self._campaigns.get(campaign_id)
+        if index is None:
+            index = self._campaigns[campaign_id] = _CampaignIndex()
+            while len(self._campaigns) > self.max_campaigns:
+                self._campaigns.popitem(last=False)
+        self._campaigns.move_to_end(campaign_id)
+        return index
+
+    def _ensure_loaded(self, campaign_id: str):
+        with self._lock:
+            index = self._campaigns.get(campaign_id)
+            if index is not None and index.loaded_at is not None \
+                    and time.monotonic() - index.loaded_at <= _INDEX_TTL:
+                return
+        docs = db_service.get_content(campaign_id, fields=["body"], readonly=True)
+        with self._lock:
+            index = self._index(campaign_id)
+            for doc in docs:
+                index.add(str(doc["_id"]), doc.get("body", ""))
+            index.loaded_at = time.monotonic()
+            self._stats["loads"] += 1
+
+    def add(self, campaign_id: str, content_id: str, body: str):
+        """Remember a body for the campaign (new pieces, and versions about to be replaced)."""
+        with self._lock:
+            self._index(campaign_id).add(str(content_id), body)
+
+    def forget(self, campaign_id: str):
+        with self._lock:
+            self._campaigns.pop(campaign_id, None)
+
+    def find_duplicate(self, campaign_id: str, body: str, threshold: float = None):
+        """
+        The campaign's closest current or previous body to body, as
+        {"content_id", "similarity"}, or None if none reaches the threshold.
+        """
+        threshold = DUPLICATE_THRESHOLD if threshold is None else threshold
+        sig = signature(body)
+        self._ensure_loaded(campaign_id)
+        with self._lock:
+            self._stats["lookups"] += 1
+            if sig is None:
+                return None
+            content_id, similarity, compared = self._index(campaign_id).nearest(sig)
+            self._stats["candidates"] += compared
+            if content_id is None or similarity < threshold:
+                return None
+            self._stats["duplicates"] += 1
+            return {"content_id": content_id, "similarity": round(similarity, 4)}
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            campaigns = len(self._campaigns)
+            bodies = sum(len(index.bodies) for index in self._campaigns.values())
+        lookups = stats["lookups"]
+        return {
+            **stats,
+            "duplicate_rate": round(stats["duplicates"] / lookups, 4) if lookups else 0.0,
+            "avg_candidates": round(stats["candidates"] / lookups, 2) if lookups else 0.0,
+            "campaigns_indexed": campaigns,
+            "bodies_indexed": bodies,
+            "threshold": DUPLICATE_THRESHOLD,
+        }
+
+
+content_index = ContentSimilarityIndex()
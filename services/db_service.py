@@ -1,14 +1,30 @@
 """
 NEXUS — Database Service
 All MongoDB operations go through this module.
-Falls back to in-memory storage if MONGODB_URI is not configured.
+Set NEXUS_DB_BACKEND=sqlite to use the embedded on-disk store instead
+(path from NEXUS_SQLITE_PATH). Falls back to in-memory storage if
+MONGODB_URI is not configured. The connection is made on first use (or by
+warm_up()), not at import, so importing this module never waits on the network.
+
+On MongoDB, the indexes each query needs are created on connect
+(NEXUS_SKIP_INDEXES=1 disables this) and NEXUS_DB_AUDIT=1 prints any query
+whose plan still falls back to a COLLSCAN. get_campaign and the user lookups
+are served from a short-lived LRU cache (see "read-through cache" below).
 """
 
+import base64
+import copy
+import json
 import os
+import threading
 import uuid
+from contextlib import contextmanager
+from types import MappingProxyType
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
+from services.cache import LRUCache
+
 load_dotenv()
 
 # ─── Connection ─────────────────────────────────────────────────────────────────
@@ -16,26 +32,221 @@ load_dotenv()
 _client = None
 _db = None
 _use_memory = False
+_backend = None  # "mongo", "sqlite" or "memory"
+_initialized = False
+_init_lock = threading.Lock()
 
-# In-memory store (used when MongoDB is not available)
+# In-memory store (used when MongoDB is not available).
+# Each collection maps _id -> document (insertion-ordered), so the dict itself
+# acts as the primary-key index.
 _memory_store = {
-    "users": [],
-    "campaigns": [],
-    "content": [],
-    "analytics": [],
-    "schedules": [],
-    "correspondence": [],
+    "users": {},
+    "campaigns": {},
+    "content": {},
+    "analytics": {},
+    "schedules": {},
+    "correspondence": {},
+    "jobs": {},
+}
+
+# Secondary indexes: collection -> field -> value -> {_id: document}
+_INDEXED_FIELDS = ("campaign_id", "user_id", "email", "channel", "type", "status")
+_memory_index = {
+    name: {field: {} for field in _INDEXED_FIELDS}
+    for name in _memory_store
 }
 
 
+class _RWLock:
+    """
+    Many concurrent readers or one writer, with writers preferred so a steady
+    stream of reads cannot starve them. The writing thread may re-enter
+    (read or write), which lets multi-step writes hold the lock throughout.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._depth = 0
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._depth += 1
+            else:
+                while self._writer is not None or self._waiting_writers:
+                    self._cond.wait()
+                self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                if self._writer == me:
+                    self._depth -= 1
+                else:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._depth += 1
+            else:
+                self._waiting_writers += 1
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+                self._waiting_writers -= 1
+                self._writer = me
+                self._depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._depth -= 1
+                if not self._depth:
+                    self._writer = None
+                    self._cond.notify_all()
+
+
+# One lock per collection guards both the store and its indexes.
+_memory_locks = {name: _RWLock() for name in _memory_store}
+
+
+# ─── MongoDB indexes ────────────────────────────────────────────────────────────
+
+# One compound index per query shape used below: equality fields first, then
+# the sort key, so both the filter and the sort are served from the index.
+_MONGO_INDEXES = {
+    "users": [
+        ([("email", 1)], {"unique": True}),
+    ],
+    "campaigns": [
+        ([("user_id", 1), ("created_at", -1), ("_id", -1)], {}),
+        ([("created_at", -1), ("_id", -1)], {}),
+    ],
+    "content": [
+        ([("campaign_id", 1), ("created_at", -1), ("_id", -1)], {}),
+        ([("campaign_id", 1), ("channel", 1), ("created_at", -1), ("_id", -1)], {}),
+        ([("status", 1), ("scheduled_at", 1)], {}),
+    ],
+    "schedules": [
+        ([("campaign_id", 1), ("scheduled_at", 1)], {}),
+    ],
+    "analytics": [
+        ([("campaign_id", 1)], {}),
+    ],
+    "correspondence": [
+        ([("campaign_id", 1), ("created_at", -1), ("_id", -1)], {}),
+        ([("campaign_id", 1), ("type", 1), ("created_at", -1), ("_id", -1)], {}),
+    ],
+    "jobs": [
+        ([("status", 1), ("created_at", -1)], {}),
+        ([("dedupe_key", 1), ("status", 1)], {}),
+    ],
+}
+
+# (label, collection, filter, sort) for every read/update issued by this module.
+_QUERY_SHAPES = [
+    ("get_user_by_email", "users", {"email": "audit@example.com"}, None),
+    ("get_campaigns(user_id)", "campaigns", {"user_id": "audit"}, [("created_at", -1), ("_id", -1)]),
+    ("get_campaigns()", "campaigns", {}, [("created_at", -1), ("_id", -1)]),
+    ("get_content", "content", {"campaign_id": "audit"}, [("created_at", -1), ("_id", -1)]),
+    ("get_content(channel)", "content",
+     {"campaign_id": "audit", "channel": "sms"}, [("created_at", -1), ("_id", -1)]),
+    ("auto_publish_overdue", "content",
+     {"status": "scheduled", "scheduled_at": {"$lte": "9999-12-31T00:00:00"}}, None),
+    ("get_schedules", "schedules", {"campaign_id": "audit"}, [("scheduled_at", 1)]),
+    ("get_analytics", "analytics", {"campaign_id": "audit"}, None),
+    ("get_correspondence", "correspondence",
+     {"campaign_id": "audit"}, [("created_at", -1), ("_id", -1)]),
+    ("get_correspondence(type)", "correspondence",
+     {"campaign_id": "audit", "type": "faq"}, [("created_at", -1), ("_id", -1)]),
+    ("fail_unfinished_jobs", "jobs", {"status": {"$in": ["queued", "running"]}}, None),
+    ("find_pending_job", "jobs", {"dedupe_key": "audit", "status": {"$in": ["queued", "running"]}}, None),
+]
+
+
+def ensure_indexes(db=None):
+    """Create the compound indexes for every query shape. Idempotent."""
+    db = db if db is not None else _db
+    for collection, indexes in _MONGO_INDEXES.items():
+        for keys, options in indexes:
+            try:
+                db[collection].create_index(keys, **options)
+            except Exception as e:
+                print(f"⚠️  Could not create index {collection}{keys}: {e}")
+
+
+def _plan_stages(plan) -> list:
+    """Flatten every 'stage' name found in an explain() plan tree."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+def audit_query_plans(db=None) -> list:
+    """
+    Run explain() on each query shape and report the winning plan's stages.
+    Returns a list of dicts; entries with collscan=True are missing an index.
+    """
+    db = db if db is not None else _db
+    report = []
+    for label, collection, query, sort in _QUERY_SHAPES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        try:
+            plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        except Exception as e:
+            print(f"⚠️  explain() failed for {label}: {e}")
+            continue
+        stages = _plan_stages(plan)
+        report.append({
+            "query": label,
+            "collection": collection,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+        })
+        if "COLLSCAN" in stages:
+            print(f"⚠️  {label} on '{collection}' still does a COLLSCAN ({' → '.join(stages)})")
+    return report
+
+
 def _init_db():
-    """Initialise database connection or fall back to in-memory."""
-    global _client, _db, _use_memory
+    """Initialise database connection or fall back to in-memory. Use _ensure_db()."""
+    global _client, _db, _use_memory, _backend
+
+    if os.getenv("NEXUS_DB_BACKEND", "").lower() == "sqlite":
+        try:
+            from services import sqlite_store
+            path = os.getenv("NEXUS_SQLITE_PATH", "nexus.db")
+            _db = sqlite_store.connect(path)
+            _use_memory = False
+            _backend = "sqlite"
+            print(f"✅ Using embedded SQLite storage ({path}).")
+            return
+        except Exception as e:
+            print(f"⚠️  SQLite init failed ({e}) — trying MongoDB.")
 
     uri = os.getenv("MONGODB_URI", "")
     if not uri or uri.startswith("mongodb+srv://<"):
         print("⚠️  MONGODB_URI not configured — using in-memory storage.")
         _use_memory = True
+        _backend = "memory"
         return
 
     try:
@@ -50,18 +261,53 @@ def _init_db():
         _client.admin.command("ping")
         _db = _client.get_default_database("nexus")
         _use_memory = False
+        _backend = "mongo"
         print("✅ Connected to MongoDB Atlas.")
+        if os.getenv("NEXUS_SKIP_INDEXES", "") != "1":
+            ensure_indexes(_db)
+        if os.getenv("NEXUS_DB_AUDIT", "") == "1":
+            audit_query_plans(_db)
     except Exception as e:
         print(f"⚠️  MongoDB connection failed ({e}) — using in-memory storage.")
         _use_memory = True
+        _backend = "memory"
+
+
+def _ensure_db():
+    """Connect on first use; concurrent first callers wait for the one connecting."""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if not _initialized:
+            _init_db()
+            _initialized = True
+
+
+def _in_memory() -> bool:
+    _ensure_db()
+    return _use_memory
 
 
-_init_db()
+def warm_up() -> str:
+    """Connect now instead of on the first query. Returns the backend name."""
+    _ensure_db()
+    return _backend
+
+
+def backend() -> str:
+    """The active backend: mongo, sqlite or memory (connecting first if needed)."""
+    _ensure_db()
+    return _backend
+
+
+def is_initialized() -> bool:
+    return _initialized
 
 
 def get_db():
     """Return the nexus database handle."""
-    if _use_memory:
+    if _in_memory():
         return None
     return _db
 
@@ -76,42 +322,224 @@ def _generate_id():
     return str(uuid.uuid4())
 
 
+# ─── Helper: keyset pagination ─────────────────────────────────────────────────
+
+# Listings are ordered newest first; _id breaks ties between docs saved in
+# the same batch, so (created_at, _id) is a stable, unique position.
+NEWEST_FIRST = [("created_at", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: dict) -> str:
+    """Opaque cursor pointing just past doc in NEWEST_FIRST order."""
+    created = doc.get("created_at")
+    payload = {
+        "t": created.isoformat() if isinstance(created, datetime) else str(created or ""),
+        "id": str(doc["_id"]),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Return (created_at, id) from a cursor. Raises ValueError if malformed."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created, doc_id = payload["t"], payload["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    try:
+        created = datetime.fromisoformat(created)
+    except ValueError:
+        pass
+    return created, doc_id
+
+
+def after_cursor(query: dict, cursor: str = None) -> dict:
+    """Extend a Mongo query to only match docs after the cursor."""
+    if not cursor:
+        return query
+    from bson import ObjectId
+    created, doc_id = decode_cursor(cursor)
+    oid = ObjectId(doc_id) if ObjectId.is_valid(doc_id) else doc_id
+    return {**query, "$or": [
+        {"created_at": {"$lt": created}},
+        {"created_at": created, "_id": {"$lt": oid}},
+    ]}
+
+
+def _projection(fields: list = None):
+    """Mongo projection for fields; created_at is always kept for sorting and cursors."""
+    if not fields:
+        return None
+    return {f: 1 for f in (*fields, "created_at")}
+
+
+def _mem_page(results: list, limit: int = None, cursor: str = None) -> list:
+    """Sort in-memory results NEWEST_FIRST and slice out one page."""
+    def position(doc):
+        return (doc.get("created_at", ""), str(doc["_id"]))
+
+    results = sorted(results, key=position, reverse=True)
+    if cursor:
+        start = decode_cursor(cursor)
+        results = [doc for doc in results if position(doc) < start]
+    return results[:limit] if limit else results
+
+
+# ─── Helper: read-through cache ────────────────────────────────────────────────
+
+# Campaign and user documents are read on nearly every request but rarely
+# written, so on MongoDB/SQLite single-document lookups are served from a
+# bounded LRU for up to NEXUS_CACHE_TTL_SECONDS. Writes through this module
+# invalidate their entry; the TTL bounds staleness from other processes.
+# NEXUS_CACHE_SIZE=0 disables it. The in-memory store is not cached.
+_CACHE_SIZE = int(os.getenv("NEXUS_CACHE_SIZE", "1024"))
+_CACHE_TTL = float(os.getenv("NEXUS_CACHE_TTL_SECONDS", "30"))
+
+_campaign_cache = LRUCache(_CACHE_SIZE, _CACHE_TTL, name="campaigns")
+_user_cache = LRUCache(_CACHE_SIZE, _CACHE_TTL, name="users")
+
+
+def _cache_enabled() -> bool:
+    return _CACHE_SIZE > 0 and not _in_memory()
+
+
+def cache_get(cache: LRUCache, key: str):
+    """Cached document (a private copy), or None on a miss."""
+    if not _cache_enabled():
+        return None
+    doc = cache.get(key)
+    return copy.deepcopy(doc) if doc is not None else None
+
+
+def cache_put(cache: LRUCache, key: str, doc):
+    """Remember doc under key (misses are not cached). Returns doc."""
+    if doc is not None and _cache_enabled():
+        cache.set(key, copy.deepcopy(doc))
+    return doc
+
+
+def cache_put_user(user):
+    """Cache a user document under both its id and email."""
+    if user is not None:
+        cache_put(_user_cache, f"id:{user['_id']}", user)
+        cache_put(_user_cache, f"email:{user.get('email')}", user)
+    return user
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for the document caches."""
+    return {
+        "enabled": _cache_enabled(),
+        "campaigns": _campaign_cache.stats(),
+        "users": _user_cache.stats(),
+    }
+
+
 # ─── In-memory CRUD helpers ────────────────────────────────────────────────────
 
-def _mem_find(collection: str, query: dict) -> list:
-    """Simple in-memory find with basic field matching."""
-    results = []
-    for doc in _memory_store[collection]:
-        match = all(doc.get(k) == v for k, v in query.items())
-        if match:
-            results.append(doc.copy())
-    return results
+def _index_add(collection: str, doc: dict):
+    for field, buckets in _memory_index[collection].items():
+        try:
+            buckets.setdefault(doc.get(field), {})[doc["_id"]] = doc
+        except TypeError:
+            continue  # unhashable value — not indexable, reachable via scans
+
+
+def _index_remove(collection: str, doc: dict, fields=None):
+    for field in fields or _INDEXED_FIELDS:
+        buckets = _memory_index[collection][field]
+        try:
+            bucket = buckets.get(doc.get(field))
+        except TypeError:
+            continue
+        if bucket is None:
+            continue
+        bucket.pop(doc["_id"], None)
+        if not bucket:
+            del buckets[doc.get(field)]
+
+
+def _mem_candidates(collection: str, query: dict):
+    """Return the smallest set of stored docs that could satisfy the query."""
+    store = _memory_store[collection]
+    if "_id" in query:
+        doc = store.get(query["_id"])
+        return [doc] if doc is not None else []
+
+    best = None
+    for field in _INDEXED_FIELDS:
+        if field not in query:
+            continue
+        try:
+            bucket = _memory_index[collection][field].get(query[field], {})
+        except TypeError:
+            continue
+        if best is None or len(bucket) < len(best):
+            best = bucket
+            if not best:
+                break
+    return (best if best is not None else store).values()
+
+
+def _mem_match(collection: str, query: dict) -> list:
+    """Return the stored (uncopied) docs matching every field in the query."""
+    return [
+        doc for doc in _mem_candidates(collection, query)
+        if all(doc.get(k) == v for k, v in query.items())
+    ]
+
+
+def _mem_find(collection: str, query: dict, fields: list = None, readonly: bool = False) -> list:
+    """
+    In-memory find with basic field matching, served from the indexes.
+    With fields, each result holds only those keys (plus _id and created_at).
+    With readonly, results are read-only views of the stored docs instead of
+    copies — for callers that only serialize them. Updates replace stored
+    docs rather than mutating them, so a view never changes under its reader.
+    """
+    with _memory_locks[collection].read():
+        if fields:
+            keep = (*fields, "_id", "created_at")
+            return [{k: doc[k] for k in keep if k in doc} for doc in _mem_match(collection, query)]
+        if readonly:
+            return [MappingProxyType(doc) for doc in _mem_match(collection, query)]
+        return [doc.copy() for doc in _mem_match(collection, query)]
 
 
 def _mem_find_one(collection: str, query: dict):
-    results = _mem_find(collection, query)
-    return results[0] if results else None
+    with _memory_locks[collection].read():
+        results = _mem_match(collection, query)
+        return results[0].copy() if results else None
 
 
 def _mem_insert(collection: str, doc: dict) -> str:
     doc_id = _generate_id()
     doc["_id"] = doc_id
-    _memory_store[collection].append(doc)
+    with _memory_locks[collection].write():
+        _memory_store[collection][doc_id] = doc
+        _index_add(collection, doc)
     return doc_id
 
 
 def _mem_update(collection: str, doc_id: str, updates: dict):
-    for doc in _memory_store[collection]:
-        if doc["_id"] == doc_id:
-            doc.update(updates)
+    # Copy-on-write: the stored dict is replaced, never mutated, so readonly
+    # views handed out by _mem_find stay consistent after the lock is released
+    with _memory_locks[collection].write():
+        doc = _memory_store[collection].get(doc_id)
+        if doc is None:
             return
+        _index_remove(collection, doc)
+        doc = {**doc, **updates}
+        _memory_store[collection][doc_id] = doc
+        _index_add(collection, doc)
 
 
 def _mem_delete_many(collection: str, query: dict):
-    _memory_store[collection] = [
-        doc for doc in _memory_store[collection]
-        if not all(doc.get(k) == v for k, v in query.items())
-    ]
+    with _memory_locks[collection].write():
+        store = _memory_store[collection]
+        for doc in _mem_match(collection, query):
+            _index_remove(collection, doc)
+            store.pop(doc["_id"], None)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -119,7 +547,10 @@ def _mem_delete_many(collection: str, query: dict):
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def create_user(email: str, hashed_password: str, name: str) -> str:
-    """Insert a new user and return its string id."""
+    """
+    Insert a new user and return its string id. Raises pymongo's
+    DuplicateKeyError if the email is taken (unique index on every backend).
+    """
     doc = {
         "email": email,
         "password": hashed_password,
@@ -127,8 +558,12 @@ def create_user(email: str, hashed_password: str, name: str) -> str:
         "auth_provider": "local",
         "created_at": _now(),
     }
-    if _use_memory:
-        return _mem_insert("users", doc)
+    if _in_memory():
+        from pymongo.errors import DuplicateKeyError
+        with _memory_locks["users"].write():
+            if _mem_match("users", {"email": email}):
+                raise DuplicateKeyError(f"users: duplicate email {email!r}")
+            return _mem_insert("users", doc)
 
     from bson import ObjectId
     result = get_db().users.insert_one(doc)
@@ -137,27 +572,29 @@ def create_user(email: str, hashed_password: str, name: str) -> str:
 
 def get_user_by_email(email: str):
     """Return user document or None."""
-    if _use_memory:
+    if _in_memory():
         return _mem_find_one("users", {"email": email})
 
-    return get_db().users.find_one({"email": email})
+    cached = cache_get(_user_cache, f"email:{email}")
+    if cached is not None:
+        return cached
+    return cache_put_user(get_db().users.find_one({"email": email}))
 
 
 def get_user_by_id(user_id: str):
     """Return user document by id string."""
-    if _use_memory:
+    if _in_memory():
         return _mem_find_one("users", {"_id": user_id})
 
+    cached = cache_get(_user_cache, f"id:{user_id}")
+    if cached is not None:
+        return cached
     from bson import ObjectId
-    return get_db().users.find_one({"_id": ObjectId(user_id)})
+    return cache_put_user(get_db().users.find_one({"_id": ObjectId(user_id)}))
 
 
 def create_or_get_google_user(email: str, name: str) -> dict:
     """Upsert a Google SSO user. Returns the user document."""
-    user = get_user_by_email(email)
-    if user:
-        return user
-
     doc = {
         "email": email,
         "password": None,
@@ -165,12 +602,24 @@ def create_or_get_google_user(email: str, name: str) -> dict:
         "auth_provider": "google",
         "created_at": _now(),
     }
-    if _use_memory:
-        _mem_insert("users", doc)
-        return doc
+    if _in_memory():
+        # Check-then-insert under one write lock so two logins can't both insert
+        with _memory_locks["users"].write():
+            user = get_user_by_email(email)
+            if user:
+                return user
+            _mem_insert("users", doc)
+            return doc
+
+    user = get_user_by_email(email)
+    if user:
+        return user
 
-    db = get_db()
-    result = db.users.insert_one(doc)
+    from pymongo.errors import DuplicateKeyError
+    try:
+        result = get_db().users.insert_one(doc)
+    except DuplicateKeyError:
+        return get_user_by_email(email)  # a concurrent login inserted it first
     doc["_id"] = result.inserted_id
     return doc
 
@@ -185,40 +634,53 @@ def save_campaign(data: dict) -> str:
     data["updated_at"] = _now()
     data.setdefault("status", "active")
 
-    if _use_memory:
+    if _in_memory():
         return _mem_insert("campaigns", data)
 
     result = get_db().campaigns.insert_one(data)
     return str(result.inserted_id)
 
 
-def get_campaigns(user_id: str = None) -> list:
-    """Return all campaigns, optionally filtered by user_id, newest first."""
-    if _use_memory:
+def get_campaigns(user_id: str = None, limit: int = None, cursor: str = None,
+                  fields: list = None, readonly: bool = False) -> list:
+    """
+    Return campaigns, optionally filtered by user_id, newest first.
+    Pass limit (and the cursor from encode_cursor of the last doc) to page,
+    and fields to fetch slim documents with only those keys. readonly=True
+    skips the per-doc copy in memory mode; the results must not be mutated.
+    """
+    if _in_memory():
         query = {"user_id": user_id} if user_id else {}
-        results = _mem_find("campaigns", query) if user_id else list(_memory_store["campaigns"])
+        results = _mem_find("campaigns", query, fields, readonly)
+        if limit or cursor:
+            return _mem_page(results, limit, cursor)
         return sorted(results, key=lambda x: x.get("created_at", ""), reverse=True)
 
     query = {}
     if user_id:
         query["user_id"] = user_id
-    return list(get_db().campaigns.find(query).sort("created_at", -1))
+    found = get_db().campaigns.find(after_cursor(query, cursor), _projection(fields)).sort(NEWEST_FIRST)
+    return list(found.limit(limit) if limit else found)
 
 
 def get_campaign(campaign_id: str) -> dict:
     """Return a single campaign by id."""
-    if _use_memory:
+    if _in_memory():
         return _mem_find_one("campaigns", {"_id": campaign_id})
 
+    cached = cache_get(_campaign_cache, campaign_id)
+    if cached is not None:
+        return cached
     from bson import ObjectId
-    return get_db().campaigns.find_one({"_id": ObjectId(campaign_id)})
+    doc = get_db().campaigns.find_one({"_id": ObjectId(campaign_id)})
+    return cache_put(_campaign_cache, campaign_id, doc)
 
 
 def update_campaign(campaign_id: str, updates: dict):
     """Partial update a campaign."""
     updates["updated_at"] = _now()
 
-    if _use_memory:
+    if _in_memory():
         _mem_update("campaigns", campaign_id, updates)
         return
 
@@ -227,16 +689,18 @@ def update_campaign(campaign_id: str, updates: dict):
         {"_id": ObjectId(campaign_id)},
         {"$set": updates}
     )
+    _campaign_cache.invalidate(campaign_id)
 
 
 def delete_campaign(campaign_id: str):
     """Delete a campaign by id."""
-    if _use_memory:
+    if _in_memory():
         _mem_delete_many("campaigns", {"_id": campaign_id})
         return
 
     from bson import ObjectId
     get_db().campaigns.delete_one({"_id": ObjectId(campaign_id)})
+    _campaign_cache.invalidate(campaign_id)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -254,7 +718,7 @@ def save_content(campaign_id: str, content_list: list) -> list:
         item.setdefault("status", "draft")
         item.setdefault("is_edited", False)
 
-    if _use_memory:
+    if _in_memory():
         for item in content_list:
             ids.append(_mem_insert("content", item))
         return ids
@@ -263,26 +727,30 @@ def save_content(campaign_id: str, content_list: list) -> list:
     return [str(i) for i in result.inserted_ids]
 
 
-def get_content(campaign_id: str, channel: str = None) -> list:
+def get_content(campaign_id: str, channel: str = None, limit: int = None,
+                cursor: str = None, fields: list = None, readonly: bool = False) -> list:
     """Return content pieces for a campaign, optionally filtered by channel."""
-    if _use_memory:
+    if _in_memory():
         query = {"campaign_id": campaign_id}
         if channel:
             query["channel"] = channel
-        results = _mem_find("content", query)
+        results = _mem_find("content", query, fields, readonly)
+        if limit or cursor:
+            return _mem_page(results, limit, cursor)
         return sorted(results, key=lambda x: x.get("created_at", ""), reverse=True)
 
     query = {"campaign_id": campaign_id}
     if channel:
         query["channel"] = channel
-    return list(get_db().content.find(query).sort("created_at", -1))
+    found = get_db().content.find(after_cursor(query, cursor), _projection(fields)).sort(NEWEST_FIRST)
+    return list(found.limit(limit) if limit else found)
 
 
 def update_content(content_id: str, updates: dict):
     """Partial update a content piece."""
     updates["updated_at"] = _now()
 
-    if _use_memory:
+    if _in_memory():
         _mem_update("content", content_id, updates)
         return
 
@@ -293,9 +761,37 @@ def update_content(content_id: str, updates: dict):
     )
 
 
+def update_content_many(updates: dict) -> int:
+    """Partial-update many content pieces ({content_id: fields}) in one bulk write."""
+    if not updates:
+        return 0
+    now = _now()
+
+    if _in_memory():
+        with _memory_locks["content"].write():
+            for content_id, fields in updates.items():
+                _mem_update("content", content_id, {**fields, "updated_at": now})
+        return len(updates)
+
+    from bson import ObjectId
+    collection = get_db().content
+    if _backend == "sqlite":
+        # The embedded store has no bulk_write; it's local, so per-doc is cheap
+        for content_id, fields in updates.items():
+            collection.update_one({"_id": ObjectId(content_id)}, {"$set": {**fields, "updated_at": now}})
+        return len(updates)
+
+    from pymongo import UpdateOne
+    result = collection.bulk_write([
+        UpdateOne({"_id": ObjectId(content_id)}, {"$set": {**fields, "updated_at": now}})
+        for content_id, fields in updates.items()
+    ], ordered=False)
+    return result.modified_count
+
+
 def delete_campaign_content(campaign_id: str):
     """Delete all content for a campaign (used before regeneration)."""
-    if _use_memory:
+    if _in_memory():
         _mem_delete_many("content", {"campaign_id": campaign_id})
         return
 
@@ -305,32 +801,36 @@ def delete_campaign_content(campaign_id: str):
 def auto_publish_overdue():
     """
     Find all content with status 'scheduled' whose scheduled_at is in the past,
-    and flip them to 'published'. Called on every page load.
+    and flip them to 'published'. A full sweep — the API's publish_scheduler
+    normally handles this on time without scanning.
     Returns the count of auto-published items.
     """
     from datetime import datetime
     now = datetime.now()
     count = 0
 
-    if _use_memory:
-        # Iterate directly over the original list to modify in-place
-        for doc in _memory_store.get("content", []):
-            if doc.get("status") != "scheduled":
-                continue
-            sched_str = doc.get("scheduled_at", "")
-            if not sched_str:
-                continue
-            try:
-                sched_dt = datetime.fromisoformat(str(sched_str))
-                if sched_dt <= now:
-                    doc["status"] = "published"
-                    doc["published_at"] = now.isoformat()
-                    doc["updated_at"] = _now()
-                    count += 1
-                    print(f"✅ Auto-published: {doc.get('channel')} (was scheduled for {sched_str})")
-            except (ValueError, TypeError) as e:
-                print(f"⚠️ Auto-publish parse error for '{sched_str}': {e}")
-                continue
+    if _in_memory():
+        # Only scheduled docs are visited, via the status index. The write lock
+        # is held for the whole sweep so no update lands between check and flip.
+        with _memory_locks["content"].write():
+            scheduled = list(_memory_index["content"]["status"].get("scheduled", {}).values())
+            for doc in scheduled:
+                sched_str = doc.get("scheduled_at", "")
+                if not sched_str:
+                    continue
+                try:
+                    sched_dt = datetime.fromisoformat(str(sched_str))
+                    if sched_dt <= now:
+                        _mem_update("content", doc["_id"], {
+                            "status": "published",
+                            "published_at": now.isoformat(),
+                            "updated_at": _now(),
+                        })
+                        count += 1
+                        print(f"✅ Auto-published: {doc.get('channel')} (was scheduled for {sched_str})")
+                except (ValueError, TypeError) as e:
+                    print(f"⚠️ Auto-publish parse error for '{sched_str}': {e}")
+                    continue
         return count
 
     # MongoDB path
@@ -346,6 +846,48 @@ def auto_publish_overdue():
     return count
 
 
+def get_scheduled_content() -> list:
+    """Return {_id, scheduled_at} for every content piece waiting to publish."""
+    if _in_memory():
+        with _memory_locks["content"].read():
+            bucket = _memory_index["content"]["status"].get("scheduled", {})
+            return [{"_id": d["_id"], "scheduled_at": d.get("scheduled_at")} for d in bucket.values()]
+
+    return list(get_db().content.find({"status": "scheduled"}, {"scheduled_at": 1}))
+
+
+def publish_content(content_ids: list) -> int:
+    """
+    Flip the given pieces from 'scheduled' to 'published' in one bulk write.
+    Pieces that are no longer scheduled are left alone. Returns the count.
+    """
+    if not content_ids:
+        return 0
+    now = datetime.now()
+    updates = {
+        "status": "published",
+        "published_at": now.isoformat(),
+        "updated_at": _now(),
+    }
+
+    if _in_memory():
+        count = 0
+        with _memory_locks["content"].write():
+            for content_id in content_ids:
+                doc = _memory_store["content"].get(content_id)
+                if doc and doc.get("status") == "scheduled":
+                    _mem_update("content", content_id, updates)
+                    count += 1
+        return count
+
+    from bson import ObjectId
+    result = get_db().content.update_many(
+        {"_id": {"$in": [ObjectId(c) for c in content_ids]}, "status": "scheduled"},
+        {"$set": updates},
+    )
+    return result.modified_count if result else 0
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  SCHEDULES
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -356,7 +898,7 @@ def save_schedule(data: dict) -> str:
     data.setdefault("status", "scheduled")
     data.setdefault("published_at", None)
 
-    if _use_memory:
+    if _in_memory():
         return _mem_insert("schedules", data)
 
     result = get_db().schedules.insert_one(data)
@@ -365,7 +907,7 @@ def save_schedule(data: dict) -> str:
 
 def get_schedules(campaign_id: str) -> list:
     """Get all schedules for a campaign, ordered by date."""
-    if _use_memory:
+    if _in_memory():
         results = _mem_find("schedules", {"campaign_id": campaign_id})
         return sorted(results, key=lambda x: x.get("scheduled_at", ""))
 
@@ -377,7 +919,7 @@ def get_schedules(campaign_id: str) -> list:
 
 def update_schedule(schedule_id: str, updates: dict):
     """Partial update a schedule."""
-    if _use_memory:
+    if _in_memory():
         _mem_update("schedules", schedule_id, updates)
         return
 
@@ -396,10 +938,11 @@ def save_analytics(data: dict) -> str:
     """Insert or replace analytics for a campaign."""
     data["created_at"] = _now()
 
-    if _use_memory:
-        # Remove existing analytics for the campaign
-        _mem_delete_many("analytics", {"campaign_id": data["campaign_id"]})
-        _mem_insert("analytics", data)
+    if _in_memory():
+        # Replace existing analytics for the campaign atomically
+        with _memory_locks["analytics"].write():
+            _mem_delete_many("analytics", {"campaign_id": data["campaign_id"]})
+            _mem_insert("analytics", data)
         return data["campaign_id"]
 
     get_db().analytics.replace_one(
@@ -412,7 +955,7 @@ def save_analytics(data: dict) -> str:
 
 def get_analytics(campaign_id: str):
     """Return analytics document for a campaign or None."""
-    if _use_memory:
+    if _in_memory():
         return _mem_find_one("analytics", {"campaign_id": campaign_id})
 
     return get_db().analytics.find_one({"campaign_id": campaign_id})
@@ -426,23 +969,143 @@ def save_correspondence(data: dict) -> str:
     """Save a correspondence entry (reply or FAQ)."""
     data["created_at"] = _now()
 
-    if _use_memory:
+    if _in_memory():
         return _mem_insert("correspondence", data)
 
     result = get_db().correspondence.insert_one(data)
     return str(result.inserted_id)
 
 
-def get_correspondence(campaign_id: str, type_filter: str = None) -> list:
-    """Get correspondence history for a campaign."""
-    if _use_memory:
+def save_correspondence_many(docs: list) -> list:
+    """Bulk-insert correspondence entries. Returns inserted id strings."""
+    if not docs:
+        return []
+    now = _now()
+    for doc in docs:
+        doc["created_at"] = now
+
+    if _in_memory():
+        return [_mem_insert("correspondence", doc) for doc in docs]
+
+    result = get_db().correspondence.insert_many(docs)
+    return [str(i) for i in result.inserted_ids]
+
+
+def get_correspondence(campaign_id: str, type_filter: str = None, limit: int = None,
+                       cursor: str = None, fields: list = None, readonly: bool = False) -> list:
+    """Get correspondence history for a campaign, newest first."""
+    if _in_memory():
         query = {"campaign_id": campaign_id}
         if type_filter:
             query["type"] = type_filter
-        results = _mem_find("correspondence", query)
+        results = _mem_find("correspondence", query, fields, readonly)
+        if limit or cursor:
+            return _mem_page(results, limit, cursor)
         return sorted(results, key=lambda x: x.get("created_at", ""), reverse=True)
 
     query = {"campaign_id": campaign_id}
     if type_filter:
         query["type"] = type_filter
-    return list(get_db().correspondence.find(query).sort("created_at", -1))
+    found = get_db().correspondence.find(after_cursor(query, cursor), _projection(fields)).sort(NEWEST_FIRST)
+    return list(found.limit(limit) if limit else found)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  JOBS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def save_job(data: dict) -> str:
+    """Insert a background job record. Returns its id string."""
+    data["created_at"] = _now()
+    data.setdefault("status", "queued")
+
+    if _in_memory():
+        return _mem_insert("jobs", data)
+
+    result = get_db().jobs.insert_one(data)
+    return str(result.inserted_id)
+
+
+def get_job(job_id: str):
+    """Return a job record or None."""
+    if _in_memory():
+        return _mem_find_one("jobs", {"_id": job_id})
+
+    from bson import ObjectId
+    return get_db().jobs.find_one({"_id": ObjectId(job_id)})
+
+
+def pending_job_query(dedupe_key: str, live_since: float) -> dict:
+    """Queued/running jobs with this dedupe key whose owner sent a heartbeat since live_since."""
+    return {
+        "dedupe_key": dedupe_key,
+        "status": {"$in": ["queued", "running"]},
+        "heartbeat_at": {"$gte": live_since},
+    }
+
+
+def find_pending_job(dedupe_key: str, live_since: float):
+    """Id of a live queued/running job with this dedupe key (any worker), or None."""
+    if _in_memory():
+        with _memory_locks["jobs"].read():
+            for status in ("queued", "running"):
+                for doc in _mem_match("jobs", {"status": status, "dedupe_key": dedupe_key}):
+                    if (doc.get("heartbeat_at") or 0) >= live_since:
+                        return doc["_id"]
+        return None
+
+    doc = get_db().jobs.find_one(pending_job_query(dedupe_key, live_since), {"_id": 1})
+    return str(doc["_id"]) if doc else None
+
+
+def update_job(job_id: str, updates: dict):
+    """Partial update a job record."""
+    if _in_memory():
+        _mem_update("jobs", job_id, updates)
+        return
+
+    from bson import ObjectId
+    get_db().jobs.update_one({"_id": ObjectId(job_id)}, {"$set": updates})
+
+
+def touch_jobs(job_ids: list, heartbeat_at: float):
+    """Record a heartbeat (epoch seconds) on jobs the calling worker still owns."""
+    if not job_ids:
+        return
+    if _in_memory():
+        for job_id in job_ids:
+            _mem_update("jobs", job_id, {"heartbeat_at": heartbeat_at})
+        return
+
+    from bson import ObjectId
+    get_db().jobs.update_many(
+        {"_id": {"$in": [ObjectId(j) for j in job_ids]}},
+        {"$set": {"heartbeat_at": heartbeat_at}},
+    )
+
+
+def stale_jobs_query(stale_before: float) -> dict:
+    """Queued/running jobs whose owner hasn't sent a heartbeat since stale_before."""
+    return {
+        "status": {"$in": ["queued", "running"]},
+        "$or": [{"heartbeat_at": {"$lt": stale_before}}, {"heartbeat_at": None}],
+    }
+
+
+def fail_unfinished_jobs(reason: str, stale_before: float) -> int:
+    """
+    Mark queued/running jobs whose owning worker has stopped sending heartbeats
+    (none since stale_before) as failed. Returns the count.
+    """
+    updates = {"status": "failed", "error": reason, "finished_at": _now()}
+
+    if _in_memory():
+        with _memory_locks["jobs"].write():
+            stale = [d for d in _mem_match("jobs", {}) if d.get("status") in ("queued", "running")
+                     and (d.get("heartbeat_at") or 0) < stale_before]
+            for doc in stale:
+                _mem_update("jobs", doc["_id"], updates)
+        return len(stale)
+
+    result = get_db().jobs.update_many(stale_jobs_query(stale_before), {"$set": updates})
+    return result.modified_count if result else 0
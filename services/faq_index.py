@@ -0,0 +1,229 @@
+"""
+NEXUS — FAQ Retrieval Index
+Per-campaign index over saved FAQs (correspondence docs with type "faq") so a
+customer message that an FAQ already answers gets that answer without a model
+call.
+
+Matching is TF-IDF cosine similarity between the message and each FAQ
+question (lower-cased word tokens, stop words dropped, plurals folded). If
+AI_FAQ_EMBEDDING_MODEL names a sentence-transformers model and the package is
+installed, embedding cosine similarity is used instead.
+
+Indexes are built lazily per campaign from the database on first lookup, and
+updated in place by add() when an FAQ is saved. Each process keeps its own
+indexes; a loaded campaign is re-read after AI_FAQ_INDEX_TTL_SECONDS so FAQs
+saved through other workers are picked up.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+
+FAQ_MATCH_THRESHOLD = float(os.getenv("AI_FAQ_MATCH_THRESHOLD", "0.75"))
+FAQ_EMBEDDING_MODEL = os.getenv("AI_FAQ_EMBEDDING_MODEL", "")
+FAQ_EMBEDDING_THRESHOLD = float(os.getenv("AI_FAQ_EMBEDDING_THRESHOLD", "0.85"))
+_INDEX_TTL = float(os.getenv("AI_FAQ_INDEX_TTL_SECONDS", "300"))
+_MAX_CAMPAIGNS = int(os.getenv("AI_FAQ_INDEX_CAMPAIGNS", "1000"))
+
+_STOP_WORDS = frozenset("""
+a an the and or but if of to in on at for with from by about as into is are was were be been
+being am do does did have has had i me my we our you your it its this that these those there
+here what which who whom can could would should will shall may might must please hi hello hey
+thanks thank so just any some
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def tokenize(text: str) -> list:
+    tokens = []
+    for word in _TOKEN.findall((text or "").lower()):
+        word = word.split("'")[0]
+        if word in _STOP_WORDS or len(word) < 2:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+# ─── Optional embeddings ────────────────────────────────────────────────────────
+
+_embedder = None
+_embedder_checked = False
+_embedder_lock = threading.Lock()
+
+
+def _get_embedder():
+    """The sentence-transformers model, if configured and installed."""
+    global _embedder, _embedder_checked
+    with _embedder_lock:
+        if not _embedder_checked:
+            _embedder_checked = True
+            if FAQ_EMBEDDING_MODEL:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    _embedder = SentenceTransformer(FAQ_EMBEDDING_MODEL)
+                    print(f"✅ FAQ index using embeddings from {FAQ_EMBEDDING_MODEL}.")
+                except Exception as e:
+                    print(f"⚠️  FAQ embedding model unavailable ({e}) — using TF-IDF.")
+        return _embedder
+
+
+def _embed(text: str):
+    """text's normalized embedding, or None without an embedding model."""
+    embedder = _get_embedder()
+    return embedder.encode(text, normalize_embeddings=True) if embedder is not None else None
+
+
+# ─── Per-campaign index ─────────────────────────────────────────────────────────
+
+class _CampaignIndex:
+    def __init__(self):
+        self.docs = {}           # faq_id -> {"question", "answer", "tf", "vector"}
+        self.postings = {}       # term -> set of faq_ids
+        self.loaded_at = None    # None until read from the database
+        self._norms = {}         # faq_id -> TF-IDF vector norm, reset when idf changes
+
+    def add(self, faq_id: str, question: str, answer: str, vector=None):
+        if faq_id in self.docs:
+            return
+        tf = Counter(tokenize(question))
+        self.docs[faq_id] = {
+            "question": question,
+            "answer": answer,
+            "tf": tf,
+            "vector": vector,
+        }
+        for term in tf:
+            self.postings.setdefault(term, set()).add(faq_id)
+        self._norms.clear()
+
+    def _idf(self, term: str) -> float:
+        # Smoothed so a term in every FAQ still carries weight (one-FAQ campaigns)
+        return math.log((1 + len(self.docs)) / (1 + len(self.postings.get(term, ())))) + 1
+
+    def _norm(self, faq_id: str) -> float:
+        norm = self._norms.get(faq_id)
+        if norm is None:
+            tf = self.docs[faq_id]["tf"]
+            norm = self._norms[faq_id] = math.sqrt(sum((n * self._idf(t)) ** 2 for t, n in tf.items()))
+        return norm
+
+    def best(self, message: str, query=None) -> tuple:
+        """
+        (faq_id, similarity) of the closest FAQ question, or (None, 0.0).
+        query is message's embedding; without one TF-IDF is used.
+        """
+        if not self.docs:
+            return None, 0.0
+
+        if query is not None:
+            scores = {fid: float(query @ doc["vector"]) for fid, doc in self.docs.items()
+                      if doc["vector"] is not None}
+        else:
+            q_weights = {t: n * self._idf(t) for t, n in Counter(tokenize(message)).items()}
+            q_norm = math.sqrt(sum(w * w for w in q_weights.values()))
+            if not q_norm:
+                return None, 0.0
+            dots = Counter()
+            for term, weight in q_weights.items():
+                for fid in self.postings.get(term, ()):
+                    dots[fid] += weight * self.docs[fid]["tf"][term] * self._idf(term)
+            scores = {fid: dot / (q_norm * self._norm(fid)) for fid, dot in dots.items()}
+
+        if not scores:
+            return None, 0.0
+        faq_id = max(scores, key=scores.get)
+        return faq_id, scores[faq_id]
+
+
+# Embeddings (model load included) are computed before taking FAQIndex._lock,
+# so a slow encode() never blocks lookups for other campaigns.
+
+class FAQIndex:
+    def __init__(self, max_campaigns: int = _MAX_CAMPAIGNS):
+        self.max_campaigns = max_campaigns
+        self._campaigns = OrderedDict()   # campaign_id -> _CampaignIndex, LRU order
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "hits": 0, "misses": 0, "loads": 0, "lookup_seconds": 0.0}
+
+    def _index(self, campaign_id: str) -> _CampaignIndex:
+        index = self._campaigns.get(campaign_id)
+        if index is None:
+            index = self._campaigns[campaign_id] = _CampaignIndex()
+            while len(self._campaigns) > self.max_campaigns:
+                self._campaigns.popitem(last=False)
+        self._campaigns.move_to_end(campaign_id)
+        return index
+
+    def needs_load(self, campaign_id: str) -> bool:
+        with self._lock:
+            index = self._campaigns.get(campaign_id)
+            return index is None or index.loaded_at is None or time.monotonic() - index.loaded_at > _INDEX_TTL
+
+    def load(self, campaign_id: str, faqs: list):
+        """Merge the campaign's FAQ docs (from the database) into its index."""
+        vectors = [_embed(doc.get("customer_message", "")) for doc in faqs]
+        with self._lock:
+            index = self._index(campaign_id)
+            for doc, vector in zip(faqs, vectors):
+                index.add(str(doc["_id"]), doc.get("customer_message", ""), doc.get("ai_reply", ""), vector)
+            index.loaded_at = time.monotonic()
+            self._stats["loads"] += 1
+
+    def add(self, campaign_id: str, faq_id: str, question: str, answer: str):
+        """Index a newly saved FAQ."""
+        vector = _embed(question)
+        with self._lock:
+            self._index(campaign_id).add(str(faq_id), question, answer, vector)
+
+    def match(self, campaign_id: str, message: str, threshold: float = None):
+        """
+        The FAQ answering message, as {"faq_id", "question", "answer",
+        "similarity"}, or None if no question is similar enough.
+        """
+        start = time.perf_counter()
+        query = _embed(message)
+        if threshold is None:
+            threshold = FAQ_EMBEDDING_THRESHOLD if query is not None else FAQ_MATCH_THRESHOLD
+        with self._lock:
+            index = self._index(campaign_id)
+            faq_id, similarity = index.best(message, query)
+            hit = faq_id is not None and similarity >= threshold
+            self._stats["lookups"] += 1
+            self._stats["hits" if hit else "misses"] += 1
+            self._stats["lookup_seconds"] += time.perf_counter() - start
+            if not hit:
+                return None
+            doc = index.docs[faq_id]
+            return {
+                "faq_id": faq_id,
+                "question": doc["question"],
+                "answer": doc["answer"],
+                "similarity": round(similarity, 4),
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            campaigns = len(self._campaigns)
+            faqs = sum(len(index.docs) for index in self._campaigns.values())
+        lookups = stats["lookups"]
+        seconds = stats.pop("lookup_seconds")
+        return {
+            **stats,
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "avg_lookup_ms": round(1000 * seconds / lookups, 3) if lookups else 0.0,
+            "model_calls_avoided": stats["hits"],
+            "campaigns_indexed": campaigns,
+            "faqs_indexed": faqs,
+            "method": "embedding" if _embedder is not None else "tfidf",
+            "threshold": FAQ_EMBEDDING_THRESHOLD if _embedder is not None else FAQ_MATCH_THRESHOLD,
+        }
+
+
+faq_index = FAQIndex()
@@ -0,0 +1,234 @@
+"""
+NEXUS — Background Job Queue
+Runs slow AI work (content generation, regeneration, insights) outside the
+HTTP request that asked for it.
+
+submit() persists a job record through db_service and returns its id at once;
+NEXUS_JOB_WORKERS asyncio workers in the API process run queued jobs and
+record their status, result or error on the same record, which clients poll
+(or long-poll with wait()) through /api/jobs/{job_id}. Submitting a job
+identical to one that is still queued or running (same kind and params) in
+any worker process returns the existing job instead of queuing another: the
+record carries a hash of kind and params as its dedupe_key, and concurrent
+identical submits within one process share a single lookup.
+
+Each job records the worker process that owns it, and that worker refreshes
+a heartbeat on its unfinished jobs every NEXUS_JOB_HEARTBEAT_SECONDS. Jobs
+whose heartbeat is older than NEXUS_JOB_STALE_SECONDS — their worker died or
+was restarted — are marked failed, on start() and on every beat, so they
+never look pending forever; jobs of other live workers are left alone.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import time
+import uuid
+
+from services import async_db_service, db_service
+
+_WORKERS = max(int(os.getenv("NEXUS_JOB_WORKERS", "4")), 1)
+_HEARTBEAT_SECONDS = float(os.getenv("NEXUS_JOB_HEARTBEAT_SECONDS", "15"))
+_STALE_SECONDS = max(float(os.getenv("NEXUS_JOB_STALE_SECONDS", "60")), 2 * _HEARTBEAT_SECONDS)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_handlers = {}      # kind -> async fn(**params) -> dict
+_queue = None
+_workers = []
+_heartbeat = None
+_pending = {}       # dedupe key -> Future resolving to the job id (queued or running)
+_finished = {}      # job_id -> asyncio.Event, set when the job completes
+_stats = {
+    "submitted": 0,
+    "deduplicated": 0,
+    "succeeded": 0,
+    "failed": 0,
+}
+
+
+def register(kind: str, handler):
+    """Register the coroutine function that runs jobs of this kind."""
+    _handlers[kind] = handler
+
+
+def _dedupe_key(kind: str, params: dict) -> str:
+    canonical = f"{kind}:{json.dumps(params, sort_keys=True, default=str)}"
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+# ─── Public API ─────────────────────────────────────────────────────────────────
+
+async def submit(kind: str, params: dict) -> tuple:
+    """
+    Queue a job. Returns (job_id, deduplicated); deduplicated is True when an
+    identical job was already pending and its id is returned instead.
+    """
+    if kind not in _handlers:
+        raise KeyError(f"Unknown job kind: {kind}")
+    if _queue is None:
+        raise RuntimeError("Job queue is not running.")
+
+    key = _dedupe_key(kind, params)
+    existing = _pending.get(key)
+    if existing is not None:
+        _stats["deduplicated"] += 1
+        return await asyncio.shield(existing), True
+
+    # Reserve the key before the first await so concurrent submits coalesce
+    reserved = asyncio.get_running_loop().create_future()
+    _pending[key] = reserved
+    try:
+        # Queued or running on another worker: share that job
+        shared = await async_db_service.find_pending_job(key, time.time() - _STALE_SECONDS)
+        job_id = shared or await async_db_service.save_job({
+            "kind": kind,
+            "params": params,
+            "dedupe_key": key,
+            "owner": WORKER_ID,
+            "heartbeat_at": time.time(),
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "started_at": None,
+            "finished_at": None,
+        })
+    except Exception as e:
+        _pending.pop(key, None)
+        reserved.set_exception(e)
+        reserved.exception()  # mark retrieved; the caller gets the raise below
+        raise
+
+    reserved.set_result(job_id)
+    if shared:
+        _pending.pop(key, None)
+        _stats["deduplicated"] += 1
+        return job_id, True
+
+    _finished[job_id] = asyncio.Event()
+    _stats["submitted"] += 1
+    await _queue.put((job_id, kind, params, key))
+    return job_id, False
+
+
+async def wait(job_id: str, timeout: float):
+    """Block up to timeout seconds for a job to finish."""
+    if timeout <= 0:
+        return
+    event = _finished.get(job_id)
+    if event is not None:
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return
+
+    # Run by another worker process (or already done): poll its record
+    deadline = time.monotonic() + timeout
+    delay = 0.25
+    while True:
+        doc = await async_db_service.get_job(job_id)
+        if not doc or doc.get("status") not in ("queued", "running"):
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, 2.0)
+
+
+def status() -> dict:
+    return {
+        "running": bool(_workers),
+        "workers": _WORKERS,
+        "worker_id": WORKER_ID,
+        "queued": _queue.qsize() if _queue else 0,
+        "pending": len(_pending),
+        **_stats,
+    }
+
+
+async def start():
+    """Start the worker tasks on the running event loop (idempotent)."""
+    global _queue, _heartbeat
+    if _workers:
+        return
+    await _fail_stale()
+    _queue = asyncio.Queue()
+    for n in range(_WORKERS):
+        _workers.append(asyncio.create_task(_worker(), name=f"nexus-job-worker-{n}"))
+    _heartbeat = asyncio.create_task(_beat(), name="nexus-job-heartbeat")
+
+
+async def stop():
+    global _queue, _heartbeat
+    tasks = _workers + ([_heartbeat] if _heartbeat else [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _workers.clear()
+    _heartbeat = None
+    _queue = None
+
+
+# ─── Heartbeat ──────────────────────────────────────────────────────────────────
+
+async def _fail_stale():
+    stale = await async_db_service.fail_unfinished_jobs(
+        "Interrupted: the worker running it stopped.", time.time() - _STALE_SECONDS,
+    )
+    if stale:
+        print(f"⚠️  Marked {stale} unfinished background job(s) of stopped workers as failed.")
+
+
+async def _beat():
+    """Keep this worker's unfinished jobs alive and fail those of dead workers."""
+    while True:
+        await asyncio.sleep(_HEARTBEAT_SECONDS)
+        try:
+            await async_db_service.touch_jobs(list(_finished), time.time())
+            await _fail_stale()
+        except Exception as e:
+            print(f"⚠️  Job heartbeat failed: {e}")
+
+
+# ─── Worker ─────────────────────────────────────────────────────────────────────
+
+async def _worker():
+    while True:
+        job_id, kind, params, key = await _queue.get()
+        try:
+            await _run(job_id, kind, params)
+        except Exception as e:
+            print(f"⚠️  Job worker error on {job_id}: {e}")
+        finally:
+            _pending.pop(key, None)
+            event = _finished.pop(job_id, None)
+            if event:
+                event.set()
+            _queue.task_done()
+
+
+async def _run(job_id: str, kind: str, params: dict):
+    await async_db_service.update_job(job_id, {
+        "status": "running",
+        "started_at": db_service._now(),
+        "heartbeat_at": time.time(),
+    })
+    try:
+        result = await _handlers[kind](**params)
+        updates = {"status": "succeeded", "result": result}
+        _stats["succeeded"] += 1
+    except Exception as e:
+        error = getattr(e, "detail", None) or str(e) or type(e).__name__
+        print(f"⚠️  Job {job_id} ({kind}) failed: {error}")
+        updates = {"status": "failed", "error": str(error)}
+        _stats["failed"] += 1
+
+    updates["finished_at"] = db_service._now()
+    try:
+        await async_db_service.update_job(job_id, updates)
+    except Exception as e:
+        print(f"⚠️  Could not record result of job {job_id}: {e}")
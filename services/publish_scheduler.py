@@ -0,0 +1,167 @@
+"""
+NEXUS — Publish Scheduler
+Runs inside the FastAPI process and flips scheduled content to 'published'
+when its scheduled_at time arrives.
+
+Pending posts sit in a min-heap keyed by scheduled_at, so the worker thread
+sleeps until exactly the next due post (or until a new schedule arrives),
+then publishes everything that is due in one bulk write. The heap is rebuilt
+from the database on start and every NEXUS_SCHEDULER_RESYNC_SECONDS to pick
+up changes made by other API workers.
+"""
+
+import heapq
+import os
+import threading
+from datetime import datetime
+
+from services import db_service
+
+_RESYNC_SECONDS = float(os.getenv("NEXUS_SCHEDULER_RESYNC_SECONDS", "300"))
+
+_lock = threading.Condition()
+_heap = []          # (due datetime, content_id)
+_due = {}           # content_id -> due datetime (authoritative; stale heap entries are skipped)
+_thread = None
+_running = False
+_stats = {
+    "published_total": 0,
+    "last_run_at": None,
+    "last_published": 0,
+    "last_resync_at": None,
+}
+
+
+def _parse_due(value):
+    """scheduled_at as a naive local datetime (matching auto_publish_overdue)."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value))
+    except (ValueError, TypeError):
+        print(f"⚠️ Scheduler could not parse scheduled_at '{value}'")
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def _push(content_id: str, due: datetime):
+    _due[content_id] = due
+    heapq.heappush(_heap, (due, content_id))
+
+
+# ─── Public API ─────────────────────────────────────────────────────────────────
+
+def notify(content_id: str, updates: dict):
+    """
+    Tell the scheduler a content piece changed. Call after update_content.
+    A 'scheduled' piece is (re)queued; any other status drops it.
+    """
+    status = updates.get("status")
+    if status is None and "scheduled_at" not in updates:
+        return
+
+    with _lock:
+        if status == "scheduled" or (status is None and content_id in _due):
+            due = _parse_due(updates.get("scheduled_at")) or _due.get(content_id)
+            if due is None:
+                return
+            _push(content_id, due)
+        else:
+            _due.pop(content_id, None)
+        _lock.notify()
+
+
+def resync():
+    """Rebuild the heap from every piece currently scheduled in the database."""
+    pending = db_service.get_scheduled_content()
+    with _lock:
+        _heap.clear()
+        _due.clear()
+        for doc in pending:
+            due = _parse_due(doc.get("scheduled_at"))
+            if due is not None:
+                _push(str(doc["_id"]), due)
+        _stats["last_resync_at"] = datetime.now().isoformat()
+        _lock.notify()
+
+
+def status() -> dict:
+    with _lock:
+        next_due = min(_due.values()) if _due else None
+        return {
+            "running": _running,
+            "pending": len(_due),
+            "next_due_at": next_due.isoformat() if next_due else None,
+            **_stats,
+        }
+
+
+def start():
+    """Start the worker thread (idempotent)."""
+    global _thread, _running
+    if _thread and _thread.is_alive():
+        return
+    _running = True
+    resync()
+    _thread = threading.Thread(target=_run, name="nexus-publish-scheduler", daemon=True)
+    _thread.start()
+
+
+def stop():
+    global _running
+    with _lock:
+        _running = False
+        _lock.notify()
+    if _thread:
+        _thread.join(timeout=5)
+
+
+# ─── Worker ─────────────────────────────────────────────────────────────────────
+
+def _pop_due(now: datetime) -> list:
+    """Pop every heap entry due by now, skipping stale (rescheduled/cancelled) ones."""
+    ids = []
+    while _heap and _heap[0][0] <= now:
+        due, content_id = heapq.heappop(_heap)
+        if _due.get(content_id) == due:
+            del _due[content_id]
+            ids.append(content_id)
+    return ids
+
+
+def _run():
+    last_resync = datetime.now()
+    while True:
+        with _lock:
+            if not _running:
+                return
+            now = datetime.now()
+            ids = _pop_due(now)
+            if not ids:
+                timeout = _RESYNC_SECONDS - (now - last_resync).total_seconds()
+                if _heap:
+                    timeout = min(timeout, (_heap[0][0] - now).total_seconds())
+                if timeout > 0:
+                    _lock.wait(timeout)
+                    continue
+
+        if ids:
+            try:
+                count = db_service.publish_content(ids)
+            except Exception as e:
+                print(f"⚠️ Scheduler publish failed ({e}) — will retry on next resync.")
+                continue
+            with _lock:
+                _stats["published_total"] += count
+                _stats["last_published"] = count
+                _stats["last_run_at"] = datetime.now().isoformat()
+            if count:
+                print(f"✅ Auto-published {count} scheduled post(s).")
+        else:
+            try:
+                resync()
+            except Exception as e:
+                print(f"⚠️ Scheduler resync failed ({e}).")
+            last_resync = datetime.now()
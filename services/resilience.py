@@ -0,0 +1,197 @@
+"""
+NEXUS — Resilient Call Pipeline
+Wraps blocking upstream calls (Gemini) with:
+
+- a per-attempt timeout and an overall deadline per call,
+- bounded retries with exponential backoff and full jitter, for transient
+  errors only (timeouts, connection failures, HTTP 408/429/5xx),
+- a circuit breaker: after `threshold` consecutive failed calls it opens and
+  calls fail immediately with CircuitOpenError (callers use their fallback);
+  after `reset_seconds` one half-open probe is let through, and its outcome
+  closes or re-opens the breaker,
+- optional hedging: if the first attempt hasn't answered within hedge_delay,
+  a duplicate request is sent and whichever answers first wins.
+
+Attempts run on a dedicated thread pool so the caller can stop waiting at the
+deadline; an abandoned attempt finishes (or times out at the HTTP layer) in
+the background and its result is discarded.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+try:
+    import httpx
+    _TRANSIENT = (TimeoutError, ConnectionError, httpx.TransportError)
+except ImportError:
+    _TRANSIENT = (TimeoutError, ConnectionError)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the breaker is open."""
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, _TRANSIENT):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return isinstance(code, int) and (code in (408, 429) or code >= 500)
+
+
+# ─── Circuit breaker ────────────────────────────────────────────────────────────
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 5, reset_seconds: float = 30):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"       # closed | open | half_open
+        self.failures = 0           # consecutive failed calls
+        self.opened_at = None
+        self.times_opened = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """May a call go upstream now? In half-open state only one probe may."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                print("✅ Model circuit breaker closed — upstream recovered.")
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.threshold):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+                print(f"⚠️  Model circuit breaker open after {self.failures} failure(s) — "
+                      f"using fallbacks for {self.reset_seconds:g}s.")
+            self._probing = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.times_opened,
+            }
+
+
+# ─── Pipeline ───────────────────────────────────────────────────────────────────
+
+class CallPipeline:
+    def __init__(self, timeout: float = 30, deadline: float = 60, retries: int = 2,
+                 base_delay: float = 0.5, max_delay: float = 8, hedge_delay: float = 0,
+                 breaker: CircuitBreaker = None, workers: int = 16):
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_delay = hedge_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nexus-model")
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "short_circuited": 0,
+            "hedges_sent": 0,
+            "hedge_wins": 0,
+        }
+
+    def _count(self, metric: str):
+        with self._lock:
+            self._stats[metric] += 1
+
+    def call(self, fn, hedge: bool = False):
+        """
+        Run fn() through the pipeline and return its result. Raises
+        CircuitOpenError if the breaker is open, otherwise the last error once
+        retries or the deadline are exhausted.
+        """
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            raise CircuitOpenError("Model circuit breaker is open.")
+
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            try:
+                result = self._attempt(fn, min(self.timeout, deadline - time.monotonic()), hedge)
+            except Exception as e:
+                attempt += 1
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+                retryable = is_retryable(e)
+                if retryable and attempt <= self.retries and time.monotonic() + delay < deadline:
+                    self._count("retries")
+                    time.sleep(delay)
+                    continue
+                self._count("failed")
+                if retryable:
+                    self.breaker.record_failure()
+                else:
+                    # Upstream answered (e.g. a 400); it is reachable, so don't trip
+                    self.breaker.record_success()
+                raise
+            self._count("succeeded")
+            self.breaker.record_success()
+            return result
+
+    def _attempt(self, fn, timeout: float, hedge: bool):
+        """One attempt (two racing requests when hedged), bounded by timeout."""
+        end = time.monotonic() + max(timeout, 0)
+        futures = [self._pool.submit(fn)]
+        if hedge and 0 < self.hedge_delay < timeout:
+            done, _ = wait(futures, timeout=self.hedge_delay)
+            if not done:
+                self._count("hedges_sent")
+                futures.append(self._pool.submit(fn))
+
+        pending, errors = set(futures), []
+        while pending:
+            done, pending = wait(pending, timeout=max(end - time.monotonic(), 0),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                self._count("timeouts")
+                raise TimeoutError(f"Model call timed out after {timeout:.1f}s")
+            for future in done:
+                if future.exception() is None:
+                    if len(futures) > 1 and future is futures[1]:
+                        self._count("hedge_wins")
+                    return future.result()
+                errors.append(future.exception())
+        raise errors[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            **stats,
+            "breaker": self.breaker.stats(),
+            "timeout_seconds": self.timeout,
+            "deadline_seconds": self.deadline,
+            "max_retries": self.retries,
+            "hedge_delay_seconds": self.hedge_delay,
+        }
@@ -0,0 +1,137 @@
+"""
+NEXUS — Single-Flight Request Coalescing
+Concurrent calls with the same key share one execution: the first caller
+(the leader) runs the work, everyone who arrives while it is in flight waits
+for it and receives a copy of the same result (or the same exception).
+Nothing is cached once the flight lands — the next call runs afresh.
+
+SingleFlight is for blocking code running on threads; AsyncSingleFlight is
+for coroutines on one event loop.
+"""
+
+import asyncio
+import copy
+import threading
+
+_groups = {}  # name -> group, for stats()
+
+
+class _Stats:
+    def __init__(self, name: str):
+        self.name = name
+        self.leaders = 0
+        self.shared = 0
+        _groups[name] = self
+
+    def stats(self) -> dict:
+        calls = self.leaders + self.shared
+        return {
+            "calls": calls,
+            "executions": self.leaders,
+            "shared": self.shared,
+            "share_rate": round(self.shared / calls, 4) if calls else 0.0,
+            "in_flight": len(self._calls),
+        }
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(_Stats):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn) -> tuple:
+        """Run fn() once per key at a time. Returns (result, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        try:
+            result = fn()
+            # Snapshot before the leader's caller can mutate it
+            call.result = copy.deepcopy(result)
+            return result, False
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+class AsyncSingleFlight(_Stats):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._calls = {}
+
+    async def do(self, key, fn) -> tuple:
+        """Await fn() once per key at a time. Returns (result, shared)."""
+        existing = self.joining(key)
+        if existing is not None:
+            try:
+                return copy.deepcopy(await asyncio.shield(existing)), True
+            except asyncio.CancelledError:
+                if not existing.cancelled():
+                    raise  # this caller was cancelled, not the flight
+            # The leader was cancelled (client gone, timeout, shutdown): run it ourselves
+            return await self.do(key, fn)
+
+        self.claim(key)
+        try:
+            result = await fn()
+        except BaseException as e:
+            # Includes CancelledError, so a cancelled leader never strands its followers
+            self.release(key, error=e)
+            raise
+        self.release(key, result)
+        return result, False
+
+    def joining(self, key):
+        """The in-flight future for key (counted as a shared call), or None."""
+        existing = self._calls.get(key)
+        if existing is not None:
+            self.shared += 1
+        return existing
+
+    def claim(self, key) -> asyncio.Future:
+        """Become the leader for key; pair with release(). Use when do() doesn't fit (e.g. streams)."""
+        flight = asyncio.get_running_loop().create_future()
+        self._calls[key] = flight
+        self.leaders += 1
+        return flight
+
+    def release(self, key, result=None, error: BaseException = None):
+        flight = self._calls.pop(key, None)
+        if flight is None or flight.done():
+            return
+        if isinstance(error, asyncio.CancelledError):
+            flight.cancel()
+        elif error is not None:
+            flight.set_exception(error)
+            flight.exception()  # followers re-raise it; don't warn if there are none
+        else:
+            flight.set_result(copy.deepcopy(result))
+
+
+def stats() -> dict:
+    """Counters for every single-flight group in the process."""
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,390 @@
+"""
+NEXUS — Embedded SQLite Store
+Disk-backed document store used by db_service when NEXUS_DB_BACKEND=sqlite.
+
+It mimics the small slice of the pymongo API that db_service relies on
+(insert_one / insert_many / find / find_one / update_one / update_many /
+replace_one / delete_one / delete_many), so the MongoDB code paths run on it
+unchanged. Documents are stored as JSON, with the fields we filter and sort on
+copied into real, indexed columns. Writes that break a unique index raise
+pymongo's DuplicateKeyError, as they would against MongoDB.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+# Fields promoted to their own indexed columns. Any other field is still
+# queryable through json_extract(), just without an index.
+_COLUMNS = (
+    "campaign_id", "user_id", "email", "channel", "type", "status",
+    "created_at", "scheduled_at",
+)
+
+_INDEXES = {
+    "users": [],
+    "campaigns": [("user_id", "created_at", "_id")],
+    "content": [("campaign_id", "created_at", "_id"),
+                ("campaign_id", "channel", "created_at", "_id"),
+                ("status", "scheduled_at")],
+    "analytics": [("campaign_id",)],
+    "schedules": [("campaign_id", "scheduled_at")],
+    "correspondence": [("campaign_id", "created_at", "_id"),
+                       ("campaign_id", "type", "created_at", "_id")],
+    "jobs": [("status", "created_at"), ("dedupe_key", "status")],
+}
+_UNIQUE_INDEXES = {
+    "users": [("email",)],
+}
+
+_OPERATORS = {"$lt": "<", "$lte": "<=", "$gt": ">", "$gte": ">=", "$ne": "!="}
+_UPDATE_OPERATORS = ("$set",)
+
+
+# ─── Encoding ───────────────────────────────────────────────────────────────────
+
+def _encode_default(value):
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_hook(obj: dict):
+    if len(obj) == 1 and "$date" in obj:
+        return datetime.fromisoformat(obj["$date"])
+    return obj
+
+
+def _column_value(value):
+    """Sortable scalar for an indexed column."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, default=_encode_default)
+
+
+def _field_sql(field: str) -> str:
+    if field == "_id" or field in _COLUMNS:
+        return f'"{field}"'
+    return f"json_extract(doc, '$.{field}')"
+
+
+def _apply_projection(doc: dict, projection) -> dict:
+    if not projection:
+        return doc
+    include = {k for k, v in projection.items() if v and k != "_id"}
+    if include:
+        out = {k: doc[k] for k in include if k in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            out["_id"] = doc["_id"]
+        return out
+    return {k: v for k, v in doc.items() if projection.get(k, 1)}
+
+
+# ─── Results (mirror pymongo.results) ───────────────────────────────────────────
+
+class InsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class InsertManyResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+
+class UpdateResult:
+    def __init__(self, matched_count, modified_count, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+# ─── Cursor ─────────────────────────────────────────────────────────────────────
+
+class Cursor:
+    """Lazy query; SQL runs when the cursor is iterated."""
+
+    def __init__(self, collection, query: dict, projection=None):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = []
+        self._limit = 0
+
+    def sort(self, key, direction=1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        self._sort.extend(keys)
+        return self
+
+    def limit(self, n: int):
+        self._limit = n
+        return self
+
+    def __iter__(self):
+        where, params = self._collection._where(self._query)
+        sql = f'SELECT "_id", doc FROM "{self._collection.name}"{where}'
+        if self._sort:
+            sql += " ORDER BY " + ", ".join(
+                f"{_field_sql(k)} {'DESC' if d < 0 else 'ASC'}" for k, d in self._sort
+            )
+        if self._limit:
+            sql += f" LIMIT {int(self._limit)}"
+        rows = self._collection._conn().execute(sql, params).fetchall()
+        for row in rows:
+            yield _apply_projection(self._collection._decode(row), self._projection)
+
+
+# ─── Collection ─────────────────────────────────────────────────────────────────
+
+class Collection:
+    def __init__(self, database, name: str):
+        self._database = database
+        self.name = name
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._database._conn()
+
+    # -- helpers --
+
+    @staticmethod
+    def _decode(row) -> dict:
+        doc = json.loads(row[1], object_hook=_decode_hook)
+        doc["_id"] = ObjectId(row[0])
+        return doc
+
+    @staticmethod
+    def _row(doc_id, doc: dict) -> tuple:
+        body = {k: v for k, v in doc.items() if k != "_id"}
+        return (
+            str(doc_id),
+            *(_column_value(doc.get(c)) for c in _COLUMNS),
+            json.dumps(body, default=_encode_default),
+        )
+
+    def _where(self, query: dict):
+        clauses, params = self._conditions(query or {})
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
+
+    def _conditions(self, query: dict):
+        clauses, params = [], []
+        for field, cond in query.items():
+            if field == "$or":
+                branches = []
+                for sub in cond:
+                    sub_clauses, sub_params = self._conditions(sub)
+                    branches.append("(" + (" AND ".join(sub_clauses) or "1") + ")")
+                    params.extend(sub_params)
+                clauses.append("(" + " OR ".join(branches) + ")")
+                continue
+            column = _field_sql(field)
+            if isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+                for op, value in cond.items():
+                    if op == "$in":
+                        marks = ", ".join("?" for _ in value)
+                        clauses.append(f"{column} IN ({marks})")
+                        params.extend(_column_value(v) for v in value)
+                    elif op in _OPERATORS:
+                        clauses.append(f"{column} {_OPERATORS[op]} ?")
+                        params.append(_column_value(value))
+                    else:
+                        raise ValueError(f"Unsupported query operator: {op}")
+            elif cond is None:
+                clauses.append(f"{column} IS NULL")
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(_column_value(cond))
+        return clauses, params
+
+    def _insert_sql(self, upsert: bool = False) -> str:
+        cols = ", ".join(f'"{c}"' for c in ("_id",) + _COLUMNS + ("doc",))
+        marks = ", ".join("?" for _ in range(len(_COLUMNS) + 2))
+        sql = f'INSERT INTO "{self.name}" ({cols}) VALUES ({marks})'
+        if upsert:
+            # Not INSERT OR REPLACE: that silently deletes any other row a
+            # unique index conflicts with instead of failing the write
+            sql += ' ON CONFLICT("_id") DO UPDATE SET ' + ", ".join(
+                f'"{c}" = excluded."{c}"' for c in _COLUMNS + ("doc",))
+        return sql
+
+    @contextmanager
+    def _transaction(self):
+        """Serialised write transaction; unique index violations raise DuplicateKeyError."""
+        conn = self._conn()
+        try:
+            with self._database._write_lock, conn:
+                yield conn
+        except sqlite3.IntegrityError as e:
+            raise DuplicateKeyError(f"{self.name}: {e}") from e
+
+    def _write_many(self, sql: str, rows: list):
+        with self._transaction() as conn:
+            conn.executemany(sql, rows)
+
+    # -- reads --
+
+    def find(self, query: dict = None, projection=None) -> Cursor:
+        return Cursor(self, query or {}, projection)
+
+    def find_one(self, query: dict = None, projection=None):
+        for doc in Cursor(self, query or {}, projection).limit(1):
+            return doc
+        return None
+
+    def count_documents(self, query: dict) -> int:
+        where, params = self._where(query)
+        sql = f'SELECT COUNT(*) FROM "{self.name}"{where}'
+        return self._conn().execute(sql, params).fetchone()[0]
+
+    # -- writes --
+
+    def insert_one(self, doc: dict) -> InsertOneResult:
+        doc.setdefault("_id", ObjectId())
+        self._write_many(self._insert_sql(), [self._row(doc["_id"], doc)])
+        return InsertOneResult(doc["_id"])
+
+    def insert_many(self, docs: list) -> InsertManyResult:
+        """Insert every doc in a single transaction."""
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+        self._write_many(self._insert_sql(), [self._row(d["_id"], d) for d in docs])
+        return InsertManyResult([d["_id"] for d in docs])
+
+    def _update(self, query: dict, update: dict, limit: int = 0) -> UpdateResult:
+        unsupported = [op for op in update if op not in _UPDATE_OPERATORS]
+        if unsupported:
+            raise ValueError(f"Unsupported update operator: {', '.join(unsupported)}")
+        changes = update.get("$set", {})
+        # Read and write in one transaction under the write lock, so concurrent
+        # updates of the same document can't overwrite each other's fields.
+        with self._transaction() as conn:
+            where, params = self._where(query)
+            sql = f'SELECT "_id", doc FROM "{self.name}"{where}'
+            if limit:
+                sql += f" LIMIT {int(limit)}"
+            docs = [self._decode(row) for row in conn.execute(sql, params).fetchall()]
+            for doc in docs:
+                doc.update(changes)
+            conn.executemany(self._insert_sql(upsert=True),
+                             [self._row(d["_id"], d) for d in docs])
+        return UpdateResult(len(docs), len(docs))
+
+    def update_one(self, query: dict, update: dict) -> UpdateResult:
+        return self._update(query, update, limit=1)
+
+    def update_many(self, query: dict, update: dict) -> UpdateResult:
+        """Batched read-modify-write in a single transaction."""
+        return self._update(query, update)
+
+    def replace_one(self, query: dict, doc: dict, upsert: bool = False) -> UpdateResult:
+        existing = self.find_one(query, {"_id": 1})
+        if existing is None and not upsert:
+            return UpdateResult(0, 0)
+        doc_id = existing["_id"] if existing else doc.get("_id", ObjectId())
+        self._write_many(self._insert_sql(upsert=True), [self._row(doc_id, doc)])
+        if existing:
+            return UpdateResult(1, 1)
+        return UpdateResult(0, 0, upserted_id=doc_id)
+
+    def _delete(self, query: dict, limit: int = 0) -> DeleteResult:
+        where, params = self._where(query)
+        sql = f'DELETE FROM "{self.name}"'
+        if limit:
+            sql += f' WHERE "_id" IN (SELECT "_id" FROM "{self.name}"{where} LIMIT {int(limit)})'
+        else:
+            sql += where
+        with self._transaction() as conn:
+            cur = conn.execute(sql, params)
+        return DeleteResult(cur.rowcount)
+
+    def delete_one(self, query: dict) -> DeleteResult:
+        return self._delete(query, limit=1)
+
+    def delete_many(self, query: dict) -> DeleteResult:
+        return self._delete(query)
+
+
+# ─── Database ───────────────────────────────────────────────────────────────────
+
+class Database:
+    """
+    One SQLite file in WAL mode. Each thread gets its own connection so readers
+    never block each other; writes are serialised through a process-wide lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._collections = {name: Collection(self, name) for name in _INDEXES}
+        self._create_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Statement cache keeps the generated SQL prepared per connection.
+            conn = sqlite3.connect(self.path, check_same_thread=False,
+                                   timeout=10, cached_statements=512)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._conn()
+        columns = ", ".join(f'"{c}"' for c in _COLUMNS)
+        with conn:
+            for name, indexes in _INDEXES.items():
+                conn.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" '
+                    f'("_id" TEXT PRIMARY KEY, {columns}, doc TEXT NOT NULL)'
+                )
+                for fields in indexes:
+                    # Fields without a column are indexed by their json_extract() expression
+                    cols = ", ".join(_field_sql(f) for f in fields)
+                    conn.execute(
+                        f'CREATE INDEX IF NOT EXISTS "ix_{name}_{"_".join(fields)}" '
+                        f'ON "{name}" ({cols})'
+                    )
+        for name, indexes in _UNIQUE_INDEXES.items():
+            for fields in indexes:
+                cols = ", ".join(_field_sql(f) for f in fields)
+                try:
+                    with conn:
+                        conn.execute(
+                            f'CREATE UNIQUE INDEX IF NOT EXISTS "ux_{name}_{"_".join(fields)}" '
+                            f'ON "{name}" ({cols})'
+                        )
+                except sqlite3.IntegrityError as e:
+                    print(f"⚠️  Could not create unique index {name}{fields} "
+                          f"(existing duplicates?): {e}")
+
+    def __getattr__(self, name: str) -> Collection:
+        collections = self.__dict__.get("_collections", {})
+        if name in collections:
+            return collections[name]
+        raise AttributeError(name)
+
+    def __getitem__(self, name: str) -> Collection:
+        return self._collections[name]
+
+
+def connect(path: str) -> Database:
+    """Open (or create) the SQLite database at path."""
+    return Database(path)
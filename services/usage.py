@@ -0,0 +1,143 @@
+"""
+NEXUS — AI Usage Accounting
+Records one entry per model call: kind (content, channel, regenerate,
+insights, reply), model, prompt/output tokens, latency, cache status and
+outcome, and keeps running totals per kind, campaign and user along with an
+estimated cost.
+
+Token counts come from the response's usage metadata; when a response has
+none (cache hits, failed calls, streams cut short) they are estimated locally
+at ~4 characters per token and the entry is marked estimated.
+
+Calls answered by the fallback templates because no API is configured are
+recorded too, with outcome "fallback" and estimated tokens.
+
+Costs use AI_PRICE_INPUT_PER_MTOK / AI_PRICE_OUTPUT_PER_MTOK (USD per million
+tokens; defaults are gemini-2.5-flash list prices). Cache hits and fallbacks
+cost nothing.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+PRICE_INPUT_PER_MTOK = float(os.getenv("AI_PRICE_INPUT_PER_MTOK", "0.30"))
+PRICE_OUTPUT_PER_MTOK = float(os.getenv("AI_PRICE_OUTPUT_PER_MTOK", "2.50"))
+_RECENT_SIZE = int(os.getenv("AI_USAGE_RECENT", "200"))
+
+OUTCOMES = ("success", "fallback", "invalid_json", "api_error", "circuit_open")
+
+
+def estimate_tokens(text: str) -> int:
+    return max(len(text or "") // 4, 1) if text else 0
+
+
+def _new_bucket() -> dict:
+    return {
+        "calls": 0,
+        "prompt_tokens": 0,
+        "output_tokens": 0,
+        "latency_seconds": 0.0,
+        "cost_usd": 0.0,
+        "cache_hits": 0,
+        "fallbacks": 0,
+        **{outcome: 0 for outcome in OUTCOMES},
+    }
+
+
+def _summarize(bucket: dict) -> dict:
+    calls = bucket["calls"]
+    return {
+        **bucket,
+        "latency_seconds": round(bucket["latency_seconds"], 3),
+        "avg_latency_seconds": round(bucket["latency_seconds"] / calls, 3) if calls else 0.0,
+        "cost_usd": round(bucket["cost_usd"], 6),
+    }
+
+
+class UsageTracker:
+    def __init__(self, recent: int = _RECENT_SIZE):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=recent)
+        self._totals = _new_bucket()
+        self._by_kind = {}
+        self._by_campaign = {}
+        self._by_user = {}
+
+    def record(self, kind: str, model: str, prompt: str, output: str = "",
+               usage=None, latency: float = 0.0, cache: str = "miss",
+               outcome: str = "success", campaign_id: str = "", user_id: str = "") -> dict:
+        """
+        Account for one call. usage is the response's usage_metadata (or
+        None); cache is hit | miss | bypass | off.
+        """
+        prompt_tokens = getattr(usage, "prompt_token_count", None)
+        output_tokens = getattr(usage, "candidates_token_count", None)
+        estimated = prompt_tokens is None or output_tokens is None
+        if prompt_tokens is None:
+            prompt_tokens = estimate_tokens(prompt)
+        if output_tokens is None:
+            output_tokens = estimate_tokens(output)
+
+        cost = 0.0
+        if cache != "hit" and outcome != "fallback":
+            cost = (prompt_tokens * PRICE_INPUT_PER_MTOK + output_tokens * PRICE_OUTPUT_PER_MTOK) / 1_000_000
+
+        entry = {
+            "at": time.time(),
+            "kind": kind,
+            "model": model,
+            "campaign_id": campaign_id or "",
+            "user_id": user_id or "",
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "estimated": estimated,
+            "latency_seconds": round(latency, 4),
+            "cache": cache,
+            "outcome": outcome,
+            "cost_usd": round(cost, 8),
+        }
+
+        with self._lock:
+            self._recent.append(entry)
+            buckets = [self._totals, self._by_kind.setdefault(kind, _new_bucket())]
+            if campaign_id:
+                buckets.append(self._by_campaign.setdefault(campaign_id, _new_bucket()))
+            if user_id:
+                buckets.append(self._by_user.setdefault(user_id, _new_bucket()))
+            for bucket in buckets:
+                bucket["calls"] += 1
+                bucket["prompt_tokens"] += prompt_tokens
+                bucket["output_tokens"] += output_tokens
+                bucket["latency_seconds"] += latency
+                bucket["cost_usd"] += cost
+                bucket["cache_hits"] += cache == "hit"
+                bucket["fallbacks"] += outcome != "success"
+                bucket[outcome] += 1
+        return entry
+
+    def stats(self, campaign_id: str = None, user_id: str = None, recent: int = 20) -> dict:
+        """Totals and breakdowns, optionally narrowed to one campaign or user."""
+        with self._lock:
+            entries = [
+                e for e in self._recent
+                if (not campaign_id or e["campaign_id"] == campaign_id)
+                and (not user_id or e["user_id"] == user_id)
+            ]
+            if campaign_id:
+                return {"campaign_id": campaign_id,
+                        **_summarize(self._by_campaign.get(campaign_id, _new_bucket())),
+                        "recent": entries[-recent:]}
+            if user_id:
+                return {"user_id": user_id,
+                        **_summarize(self._by_user.get(user_id, _new_bucket())),
+                        "recent": entries[-recent:]}
+            return {
+                "totals": _summarize(self._totals),
+                "by_kind": {k: _summarize(b) for k, b in self._by_kind.items()},
+                "by_campaign": {k: _summarize(b) for k, b in self._by_campaign.items()},
+                "by_user": {k: _summarize(b) for k, b in self._by_user.items()},
+                "prices_per_mtok": {"input": PRICE_INPUT_PER_MTOK, "output": PRICE_OUTPUT_PER_MTOK},
+                "recent": entries[-recent:],
+            }
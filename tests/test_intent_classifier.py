@@ -0,0 +1,44 @@
+"""Keyword matching in utils.intent_classifier."""
+
+import pytest
+
+from utils.intent_classifier import DEFAULT_LEXICON, IntentClassifier
+
+classifier = IntentClassifier(DEFAULT_LEXICON)
+
+
+@pytest.mark.parametrize("message", [
+    "I have been busy lately",
+    "The invoice was issued today",
+    "I'll reply later",
+    "Ordering again next week",
+])
+def test_words_sharing_a_keyword_prefix_do_not_match(message):
+    result = classifier.classify(message)
+    assert result["intent"] == "general"
+    assert not result["escalate"]
+
+
+def test_greatly_is_not_praise():
+    assert "praise" not in classifier.scores("Greatly appreciated")
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("I want a refund", "refund"),
+    ("My order was cancelled", "refund"),
+    ("Please process the cancellation", "refund"),
+    ("I was refunded twice", "refund"),
+    ("Still having problems with the app", "complaint"),
+    ("My parcel is late", "complaint"),
+    ("What are your prices?", "pricing"),
+    ("Thanks so much", "praise"),
+])
+def test_listed_inflections_match(message, intent):
+    assert classifier.classify(message)["intent"] == intent
+
+
+def test_refund_escalates_over_other_intents():
+    result = classifier.classify("Thanks, but the item is broken and I want my money back")
+    assert result["intent"] == "refund"
+    assert result["escalate"]
+    assert {i["intent"] for i in result["intents"]} == {"refund", "complaint", "praise"}
@@ -0,0 +1,112 @@
+"""
+NEXUS — Analytics Summarizer
+Turns a campaign's raw per-channel analytics into the derived numbers the
+insights prompt actually needs — click-through, conversion and interaction
+rates, each channel's share of reach and conversions, rankings, deltas from
+the cross-channel average and a best posting window — and renders them as a
+compact pipe table for the model.
+
+Deterministic and local: the same analytics always give the same summary.
+"""
+
+_METRICS = ("eng", "ctr", "cvr", "ipk")   # ranked metrics, higher is better
+
+
+def _pct(part: float, whole: float) -> float:
+    return round(100 * part / whole, 2) if whole else 0.0
+
+
+def _hour(value) -> int:
+    try:
+        return int(str(value).split(":")[0])
+    except (TypeError, ValueError):
+        return -1
+
+
+def summarize_analytics(analytics_data: dict) -> dict:
+    """
+    Derived per-channel metrics, rankings and deltas.
+
+    Per channel: reach, conversions, eng (engagement rate %), ctr (clicks /
+    impressions %), cvr (conversions / clicks %), ipk (likes + shares +
+    comments per 1,000 reach), reach_share / conv_share (% of campaign total),
+    rank_<metric> (1 = best) and d_<metric> (difference from the average).
+    """
+    channels = analytics_data.get("channels", {}) or {}
+    total_reach = sum(m.get("reach", 0) for m in channels.values())
+    total_conversions = sum(m.get("conversions", 0) for m in channels.values())
+
+    rows = {}
+    for name, m in channels.items():
+        reach, clicks = m.get("reach", 0), m.get("clicks", 0)
+        interactions = m.get("likes", 0) + m.get("shares", 0) + m.get("comments", 0)
+        rows[name] = {
+            "reach": reach,
+            "conversions": m.get("conversions", 0),
+            "eng": round(float(m.get("engagement_rate", 0)), 2),
+            "ctr": _pct(clicks, m.get("impressions", 0)),
+            "cvr": _pct(m.get("conversions", 0), clicks),
+            "ipk": round(1000 * interactions / reach, 1) if reach else 0.0,
+            "reach_share": _pct(reach, total_reach),
+            "conv_share": _pct(m.get("conversions", 0), total_conversions),
+            "best_time": m.get("best_post_time", ""),
+            "top_type": m.get("top_content_type", ""),
+        }
+
+    averages = {}
+    for metric in _METRICS:
+        values = [row[metric] for row in rows.values()]
+        averages[metric] = round(sum(values) / len(values), 2) if values else 0.0
+        ranked = sorted(rows, key=lambda ch: (-rows[ch][metric], ch))
+        for rank, ch in enumerate(ranked, 1):
+            rows[ch][f"rank_{metric}"] = rank
+            rows[ch][f"d_{metric}"] = round(rows[ch][metric] - averages[metric], 2)
+
+    return {
+        "channels": rows,
+        "averages": averages,
+        "totals": {"reach": total_reach, "conversions": total_conversions},
+        "leaders": {
+            metric: min(rows, key=lambda ch: rows[ch][f"rank_{metric}"]) if rows else None
+            for metric in _METRICS
+        },
+        "posting_window": _posting_window(rows),
+    }
+
+
+def _posting_window(rows: dict) -> str:
+    """Span of best posting hours of the channels above average engagement."""
+    if not rows:
+        return ""
+    average = sum(row["eng"] for row in rows.values()) / len(rows)
+    hours = sorted(
+        _hour(row["best_time"]) for row in rows.values()
+        if row["eng"] >= average and _hour(row["best_time"]) >= 0
+    )
+    if not hours:
+        return ""
+    return f"{hours[0]}:00-{hours[-1] + 1}:00"
+
+
+def format_summary(summary: dict) -> str:
+    """
+    Compact text table for the prompt: one header, one row per channel
+    (sorted by engagement), and a line of leaders and averages.
+    """
+    rows = summary["channels"]
+    lines = ["channel|reach|conversions|eng%|ctr%|cvr%|int/1k|reach_share%|conv_share%|eng_vs_avg|best_time|top_type"]
+    for ch in sorted(rows, key=lambda c: rows[c]["rank_eng"]):
+        r = rows[ch]
+        lines.append("|".join(str(v) for v in (
+            ch, r["reach"], r["conversions"], f"{r['eng']:g}", f"{r['ctr']:g}", f"{r['cvr']:g}",
+            f"{r['ipk']:g}", f"{r['reach_share']:g}", f"{r['conv_share']:g}", f"{r['d_eng']:+g}",
+            r["best_time"], r["top_type"],
+        )))
+    leaders = summary["leaders"]
+    averages = summary["averages"]
+    lines.append(
+        f"best: eng={leaders['eng']} ctr={leaders['ctr']} cvr={leaders['cvr']} int/1k={leaders['ipk']}; "
+        f"avg: eng={averages['eng']:g} ctr={averages['ctr']:g} cvr={averages['cvr']:g}; "
+        f"window={summary['posting_window'] or 'n/a'}"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,199 @@
+"""
+NEXUS — AI Pipeline Benchmark
+Drives ai_service end to end against the local fake model server
+(utils/fake_llm.py): generation throughput, streaming time-to-first-piece, and
+how many pieces fell back to template content under injected faults.
+--insights instead compares the insights prompt built from raw JSON analytics
+with the compact summary table: prompt size and response time per channel count.
+
+Usage:
+    python -m utils.bench_ai [--campaigns 20] [--concurrency 4]
+                             [--latency lognormal --latency-ms 800 --jitter-ms 400]
+                             [--tokens-per-second 150] [--error-rate 0.1]
+                             [--malformed-rate 0.05] [--hang-rate 0.02]
+    python -m utils.bench_ai --insights [--prompt-tokens-per-second 2000]
+
+A fake server is started on --port for the run; pass --url to use one that is
+already running instead (its settings are still updated from the flags).
+The response cache is disabled so every call reaches the server.
+--prompt-tokens-per-second makes the fake server charge for prompt length.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_CHANNELS = ["instagram", "facebook", "tiktok", "email", "sms"]
+_FAULT_SETTINGS = ("latency", "latency_ms", "jitter_ms", "tokens_per_second", "prompt_tokens_per_second",
+                   "error_rate", "malformed_rate", "hang_rate", "hang_seconds")
+
+
+def _post(url: str, body: dict = None) -> dict:
+    request = urllib.request.Request(url, data=json.dumps(body or {}).encode(),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    server = subprocess.Popen([sys.executable, "-m", "utils.fake_llm", "--port", str(port)],
+                              cwd=os.path.join(os.path.dirname(__file__), ".."))
+    for _ in range(50):
+        try:
+            _post(f"http://127.0.0.1:{port}/_reset")
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("Fake model server did not start.")
+
+
+def _campaign(n: int) -> dict:
+    return {"_id": f"bench-{n}", "name": f"Bench {n}", "objective": f"Launch offer {n}",
+            "target_audience": "busy professionals", "tone": "friendly", "channels": _CHANNELS}
+
+
+def _fallbacks(pieces: list) -> int:
+    return sum(not str(p.get("body", "")).startswith("[fake-llm]") for p in pieces)
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)] if ordered else 0.0
+
+
+def run_generate(ai, campaigns: int, concurrency: int) -> dict:
+    latencies, fallbacks = [], 0
+
+    def one(n):
+        start = time.perf_counter()
+        pieces = ai.generate_content(_campaign(n), "Bench Co")
+        return time.perf_counter() - start, _fallbacks(pieces)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed, fell_back in pool.map(one, range(campaigns)):
+            latencies.append(elapsed)
+            fallbacks += fell_back
+    wall = time.perf_counter() - start
+    return {"campaigns/s": campaigns / wall, "p50": statistics.median(latencies),
+            "p95": _percentile(latencies, 0.95), "fallback pieces": fallbacks}
+
+
+def run_stream(ai, campaigns: int) -> dict:
+    first, totals, fallbacks = [], [], 0
+    for n in range(campaigns):
+        start = time.perf_counter()
+        pieces = []
+        for piece in ai.stream_content(_campaign(10_000 + n), "Bench Co"):
+            if not pieces:
+                first.append(time.perf_counter() - start)
+            pieces.append(piece)
+        totals.append(time.perf_counter() - start)
+        fallbacks += _fallbacks(pieces)
+    return {"first piece p50": statistics.median(first), "complete p50": statistics.median(totals),
+            "fallback pieces": fallbacks}
+
+
+def run_insights(ai, repeats: int) -> list:
+    """Prompt size and latency of both insights formats, for growing channel counts."""
+    from services.usage import estimate_tokens
+    from utils.seed_analytics import generate_analytics_data
+
+    rows = []
+    for count in (1, 3, 5, 10, 20):
+        random.seed(count)
+        channels = (_CHANNELS + [f"channel{n}" for n in range(6, count + 1)])[:count]
+        analytics = generate_analytics_data({"channels": channels})
+        row = {"channels": count}
+        for fmt in ("json", "compact"):
+            row[f"{fmt} tokens"] = estimate_tokens(ai._insights_data(analytics, fmt))
+            ai.AI_INSIGHTS_FORMAT = fmt
+            times = []
+            for n in range(repeats):
+                start = time.perf_counter()
+                ai.generate_insights(analytics, {"_id": f"bench-{fmt}-{count}-{n}", "objective": f"Run {n}"})
+                times.append(time.perf_counter() - start)
+            row[f"{fmt} s"] = statistics.median(times)
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--campaigns", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--url", default="", help="use an already running fake server")
+    parser.add_argument("--latency", default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--jitter-ms", type=float, default=400)
+    parser.add_argument("--tokens-per-second", type=float, default=150)
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=120)
+    parser.add_argument("--insights", action="store_true", help="compare insights prompt formats")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url.rstrip("/")
+    if not url:
+        server = _start_server(args.port)
+        url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        _post(f"{url}/_config", {key: getattr(args, key) for key in _FAULT_SETTINGS})
+        _post(f"{url}/_reset")
+        os.environ["AI_BASE_URL"] = url
+        os.environ["AI_CACHE"] = "0"
+        from services import ai_service
+
+        if args.insights:
+            rows = run_insights(ai_service, max(args.campaigns // 4, 1))
+            print(f"\n{'channels':>8}{'json tok':>10}{'compact tok':>13}{'saved':>8}{'json s':>9}{'compact s':>11}")
+            for r in rows:
+                saved = 1 - r["compact tokens"] / r["json tokens"]
+                print(f"{r['channels']:>8}{r['json tokens']:>10}{r['compact tokens']:>13}{saved:>8.0%}"
+                      f"{r['json s']:>9.2f}{r['compact s']:>11.2f}")
+            return
+
+        results = {}
+        for label, fn in (
+            ("generate (parallel channels)", lambda: run_generate(ai_service, args.campaigns, args.concurrency)),
+            ("stream (single call)", lambda: run_stream(ai_service, max(args.campaigns // 4, 1))),
+        ):
+            ai_service.AI_PARALLEL_CHANNELS = label.startswith("generate")
+            results[label] = fn()
+
+        with urllib.request.urlopen(f"{url}/_stats", timeout=5) as resp:
+            server_stats = json.loads(resp.read())
+    finally:
+        if server:
+            server.terminate()
+
+    for label, result in results.items():
+        print(f"\n{label}")
+        for metric, value in result.items():
+            print(f"  {metric:<18}{value:>10.2f}" if isinstance(value, float) else f"  {metric:<18}{value:>10}")
+
+    pipeline = ai_service.pipeline_stats()
+    print(f"\nserver: {server_stats['requests']} requests, {server_stats['errors']} errors, "
+          f"{server_stats['malformed']} malformed, {server_stats['hangs']} hangs, "
+          f"{server_stats['output_tokens']} output tokens")
+    print(f"pipeline: {pipeline['retries']} retries, {pipeline['timeouts']} timeouts, "
+          f"{pipeline['failed']} failed, breaker {pipeline['breaker']['state']}")
+
+
+if __name__ == "__main__":
+    main()
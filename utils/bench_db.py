@@ -0,0 +1,201 @@
+"""
+NEXUS — Database Backend Benchmark
+Times a representative db_service workload against each storage backend.
+
+Usage:
+    python -m utils.bench_db [--docs 10000] [--backends memory,sqlite,mongo]
+    python -m utils.bench_db --threads 1,2,4,8 [--ops 4000]
+    python -m utils.bench_db --alloc [--docs 10000]
+
+The mongo backend is skipped unless MONGODB_URI is set. --threads runs the
+contention profile instead: worker threads interleave save_content,
+update_content and auto_publish_overdue on one campaign, then the result is
+checked for lost inserts or updates. --alloc uses tracemalloc to compare
+allocations of the copying and read-only in-memory list paths.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_MONGO_URI = os.getenv("MONGODB_URI", "")
+
+
+def _load_backend(name: str, tmpdir: str):
+    os.environ.pop("NEXUS_DB_BACKEND", None)
+    os.environ["MONGODB_URI"] = _MONGO_URI
+    if name == "memory":
+        os.environ["MONGODB_URI"] = ""
+    elif name == "sqlite":
+        os.environ["NEXUS_DB_BACKEND"] = "sqlite"
+        os.environ["NEXUS_SQLITE_PATH"] = os.path.join(tmpdir, "bench.db")
+    from services import db_service
+    return importlib.reload(db_service)
+
+
+def _timed(label: str, fn, results: dict):
+    start = time.perf_counter()
+    fn()
+    results[label] = (time.perf_counter() - start) * 1000
+
+
+def run(db, docs: int) -> dict:
+    results = {}
+    campaign_ids = []
+    per_campaign = max(docs // 20, 1)
+
+    def create_campaigns():
+        for i in range(20):
+            campaign_ids.append(db.save_campaign({"name": f"bench {i}", "user_id": "bench"}))
+
+    def insert_content():
+        for cid in campaign_ids:
+            db.save_content(cid, [
+                {"channel": ("instagram", "email", "sms")[j % 3], "body": "x" * 400}
+                for j in range(per_campaign)
+            ])
+
+    def read_campaigns():
+        for _ in range(200):
+            for cid in campaign_ids[:5]:
+                db.get_campaign(cid)
+
+    def read_content():
+        for cid in campaign_ids:
+            db.get_content(cid)
+            db.get_content(cid, "sms")
+
+    def update_content():
+        for doc in db.get_content(campaign_ids[0])[:200]:
+            db.update_content(str(doc["_id"]), {"status": "scheduled",
+                                                "scheduled_at": "2000-01-01T09:00:00"})
+
+    _timed("save_campaign x20", create_campaigns, results)
+    _timed(f"save_content x{per_campaign * 20}", insert_content, results)
+    _timed("get_campaign x1000", read_campaigns, results)
+    _timed("get_content x40", read_content, results)
+    _timed("update_content x200", update_content, results)
+    _timed("auto_publish_overdue", db.auto_publish_overdue, results)
+
+    for cid in campaign_ids:
+        db.delete_campaign_content(cid)
+        db.delete_campaign(cid)
+    return results
+
+
+def run_contention(db, threads: int, ops: int) -> dict:
+    campaign_id = db.save_campaign({"name": f"contention x{threads}", "user_id": "bench"})
+    per_thread = ops // threads
+
+    def worker(n):
+        for i in range(per_thread):
+            ids = db.save_content(campaign_id, [{"channel": "sms", "body": f"{n}-{i}"}])
+            db.update_content(ids[0], {"status": "scheduled",
+                                       "scheduled_at": "2000-01-01T09:00:00"})
+            if i % 50 == 0:
+                db.auto_publish_overdue()
+                db.get_content(campaign_id, "sms")
+
+    # auto_publish_overdue logs every post it flips — keep the table readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(worker, range(threads)))
+        elapsed = time.perf_counter() - start
+        db.auto_publish_overdue()
+
+    docs = db.get_content(campaign_id)
+    correct = (
+        len(docs) == per_thread * threads
+        and len({d["body"] for d in docs}) == len(docs)
+        and all(d.get("status") == "published" for d in docs)
+    )
+    db.delete_campaign_content(campaign_id)
+    db.delete_campaign(campaign_id)
+    return {"ops/s": per_thread * threads / elapsed, "correct": correct}
+
+
+def run_alloc(db, docs: int) -> dict:
+    """Allocations for one content list request: db read + router serialization."""
+    from backend.routers.content import _doc_to_dict
+
+    campaign_id = db.save_campaign({"name": "alloc", "user_id": "bench"})
+    db.save_content(campaign_id, [
+        {"channel": "email", "body": "x" * 400, "hashtags": ["#a", "#b"],
+         "score_reasoning": "y" * 120}
+        for _ in range(docs)
+    ])
+
+    results = {}
+    for label, readonly in (("copy (old)", False), ("read-only (new)", True)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        payload = [_doc_to_dict(d) for d in db.get_content(campaign_id, readonly=readonly)]
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del payload
+        results[label] = {"peak_kb": peak / 1024, "ms": elapsed * 1000}
+
+    db.delete_campaign_content(campaign_id)
+    db.delete_campaign(campaign_id)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--backends", default="memory,sqlite,mongo")
+    parser.add_argument("--threads", default="", help="e.g. 1,2,4,8 — run the contention profile")
+    parser.add_argument("--ops", type=int, default=4000)
+    parser.add_argument("--alloc", action="store_true", help="tracemalloc copy vs read-only reads")
+    args = parser.parse_args()
+
+    if args.alloc:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = _load_backend("memory", tmpdir)
+            results = run_alloc(db, args.docs)
+        print(f"\n{args.docs} docs{'peak KiB':>22}{'time':>12}")
+        for label, r in results.items():
+            print(f"{label:<18}{r['peak_kb']:>16.0f}{r['ms']:>10.1f}ms")
+        return
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if "mongo" in backends and not _MONGO_URI:
+        print("Skipping mongo — MONGODB_URI not set.")
+        backends.remove("mongo")
+
+    if args.threads:
+        counts = [int(t) for t in args.threads.split(",")]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in backends:
+                db = _load_backend(name, tmpdir)
+                print(f"\n{name}: {'threads':>8}{'ops/s':>12}{'correct':>10}")
+                for n in counts:
+                    result = run_contention(db, n, args.ops)
+                    print(f"{'':<{len(name) + 1}} {n:>8}{result['ops/s']:>12.0f}{str(result['correct']):>10}")
+        return
+
+    table = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in backends:
+            db = _load_backend(name, tmpdir)
+            table[name] = run(db, args.docs)
+
+    labels = next(iter(table.values())).keys() if table else []
+    print(f"\n{'operation':<28}" + "".join(f"{b:>12}" for b in table))
+    for label in labels:
+        print(f"{label:<28}" + "".join(f"{table[b][label]:>10.1f}ms" for b in table))
+
+
+if __name__ == "__main__":
+    main()
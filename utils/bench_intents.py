@@ -0,0 +1,90 @@
+"""
+NEXUS — Intent Classifier Benchmark
+Throughput of the single-pass intent classifier against the old chain of
+per-intent any(keyword in message) scans, over a synthetic message corpus.
+
+Usage:
+    python -m utils.bench_intents [--messages 200000] [--extra-keywords 0,200,1000]
+
+--extra-keywords grows every intent's lexicon with synthetic keywords to show
+how each approach scales as the lexicon grows. Also reports how many messages
+carry more than one intent (which the old first-match chain classified by
+branch order alone).
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.intent_classifier import DEFAULT_LEXICON, IntentClassifier
+
+_FILLER = ("hi there I ordered the blue one last week and wanted to ask about it when you get a "
+           "chance my friend recommended your shop the website was easy to use").split()
+
+
+def _corpus(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    keywords = [w for entry in DEFAULT_LEXICON.values() for w in entry["keywords"]]
+    messages = []
+    for _ in range(n):
+        words = rng.choices(_FILLER, k=rng.randint(8, 40))
+        for _ in range(rng.choice((0, 0, 1, 1, 2, 3))):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        messages.append(" ".join(words).capitalize() + rng.choice(".?!"))
+    return messages
+
+
+def _lexicon(extra: int) -> dict:
+    lexicon = {name: dict(entry) for name, entry in DEFAULT_LEXICON.items()}
+    for name, entry in lexicon.items():
+        entry["keywords"] = entry["keywords"] + [f"{name}kw{n}" for n in range(extra)]
+    return lexicon
+
+
+def _legacy(lexicon: dict):
+    """The previous _fallback_reply matching: lower(), then one any() scan per intent, first match wins."""
+    order = [(name, entry["keywords"]) for name, entry in lexicon.items()]
+
+    def classify(message: str) -> str:
+        msg_lower = message.lower()
+        for name, words in order:
+            if any(w in msg_lower for w in words):
+                return name
+        return "general"
+    return classify
+
+
+def _rate(fn, messages: list) -> float:
+    start = time.perf_counter()
+    for message in messages:
+        fn(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--extra-keywords", default="0,200,1000")
+    args = parser.parse_args()
+
+    messages = _corpus(args.messages)
+    print(f"\n{args.messages} messages")
+    print(f"{'keywords/intent':>16}{'legacy msg/s':>15}{'classify msg/s':>16}{'scores msg/s':>14}")
+    for extra in (int(x) for x in args.extra_keywords.split(",")):
+        lexicon = _lexicon(extra)
+        classifier = IntentClassifier(lexicon)
+        per_intent = sum(len(e["keywords"]) for e in lexicon.values()) // len(lexicon)
+        print(f"{per_intent:>16}{_rate(_legacy(lexicon), messages):>15.0f}"
+              f"{_rate(classifier.classify, messages):>16.0f}{_rate(classifier.scores, messages):>14.0f}")
+
+    classifier = IntentClassifier(_lexicon(0))
+    multi = sum(1 for m in messages if len(classifier.scores(m)) > 1)
+    print(f"\nmessages with more than one intent: {multi} ({multi / len(messages):.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+NEXUS — Cold Start Benchmark
+Time to import the backend (backend.main, which pulls in every router and
+service) in a fresh interpreter, against import followed by warming both
+clients — the work the old import-time _init_client/_init_db did before the
+first line of app code could run.
+
+Usage:
+    python -m utils.bench_startup [--runs 5] [--mongo-uri mongodb://10.255.255.1:27017/nexus]
+
+--mongo-uri defaults to MONGODB_URI; an unreachable address shows the cost
+of the blocking ping (up to the 5 s server-selection timeout). Without one
+the database is in-memory. GEMINI_API_KEY is set to a dummy key so warming
+really imports google.genai and creates the client (no request is made).
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+_SCRIPT = """
+import time
+start = time.perf_counter()
+import backend.main
+imported = time.perf_counter()
+if {warm}:
+    from services import ai_service, db_service
+    db_service.warm_up()
+    ai_service.warm_up()
+print(imported - start, time.perf_counter() - start)
+"""
+
+
+def _run(warm: bool, env: dict) -> tuple:
+    out = subprocess.run(
+        [sys.executable, "-c", _SCRIPT.format(warm=warm)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout.strip().splitlines()[-1]
+    imported, total = (float(x) for x in out.split())
+    return imported, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", ""))
+    args = parser.parse_args()
+
+    env = dict(os.environ, MONGODB_URI=args.mongo_uri, GEMINI_API_KEY="bench-key",
+               NEXUS_DB_BACKEND="", AI_BASE_URL="", PYTHONDONTWRITEBYTECODE="1")
+    _run(False, env)   # populate the OS file cache before timing
+
+    lazy = [_run(False, env)[0] for _ in range(args.runs)]
+    eager = [_run(True, env)[1] for _ in range(args.runs)]
+
+    print(f"\nbackend import, median of {args.runs} fresh interpreters "
+          f"(database: {args.mongo_uri or 'in-memory'})")
+    print(f"{'':>28}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for label, times in (("lazy (import only)", lazy), ("eager (import + clients)", eager)):
+        ms = [t * 1000 for t in times]
+        print(f"{label:>28}{statistics.median(ms):>12.0f}{min(ms):>10.0f}{max(ms):>10.0f}")
+    print(f"\ncold start saved: {1000 * (statistics.median(eager) - statistics.median(lazy)):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
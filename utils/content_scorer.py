@@ -0,0 +1,200 @@
+"""
+NEXUS — Content Scorer
+Deterministic local quality score (0–100) and one-line reasoning for content
+pieces, replacing the model's opinion of its own output.
+
+Each piece is scored on seven components, each 0–1:
+
+    length       body length within the channel's ideal range (hard caps for SMS)
+    cta          a call to action is present
+    hashtags     hashtag count within the channel's range, and hashtags that
+                 relate to the body or campaign
+    readability  Flesch reading ease of the body, best around 60–80
+    compliance   channel rules: SMS opt-out, email subject line, no hashtags
+                 on email/SMS
+    hook         the opening line grabs attention (question, exclamation,
+                 emoji, number or direct "you")
+    relevance    the body mentions the campaign's objective/audience keywords
+
+Text features are extracted per piece from the lower-cased body; the scoring
+itself runs as array math over all pieces at once, so rescoring thousands of
+stored pieces is one call to score_pieces().
+"""
+
+import re
+
+import numpy as np
+
+# ─── Channel rules ──────────────────────────────────────────────────────────────
+
+# ideal body length (chars), hard max, hashtag range
+_RULES = {
+    "instagram": {"ideal": (80, 1000), "max": 2200, "tags": (3, 10)},
+    "facebook":  {"ideal": (40, 500),  "max": 5000, "tags": (0, 3)},
+    "tiktok":    {"ideal": (100, 600), "max": 2200, "tags": (3, 6)},
+    "email":     {"ideal": (300, 2000), "max": 10000, "tags": (0, 0)},
+    "sms":       {"ideal": (60, 160),  "max": 320,  "tags": (0, 0)},
+}
+_CHANNELS = list(_RULES)
+_DEFAULT_CHANNEL = "facebook"
+
+_WEIGHTS = np.array([0.20, 0.20, 0.10, 0.10, 0.15, 0.10, 0.15])
+_COMPONENTS = ("length", "cta", "hashtags", "readability", "compliance", "hook", "relevance")
+_RELEVANT_KEYWORDS = 3   # campaign keywords in the body for full relevance
+
+_STRENGTHS = {
+    "length": "well-sized for the channel",
+    "cta": "clear call to action",
+    "hashtags": "relevant hashtags",
+    "readability": "easy to read",
+    "compliance": "meets channel rules",
+    "hook": "strong opening hook",
+    "relevance": "on-message for the campaign",
+}
+_WEAKNESSES = {
+    "length": "length is outside the channel's sweet spot",
+    "cta": "add a clear call to action",
+    "hashtags": "hashtags need adjusting (count or relevance)",
+    "readability": "simplify the wording",
+    "compliance": "fix channel requirements (opt-out, subject line, hashtags)",
+    "hook": "open with a stronger hook",
+    "relevance": "tie the copy to the campaign's objective and audience",
+}
+
+_CTA = re.compile(
+    r"\b(shop|buy|order|book|call|click|tap|visit|sign ?up|register|join|subscribe|learn more|"
+    r"get (?:yours|started|it)|check (?:it|us) out|reply|follow|comment|share|download|claim|"
+    r"try|discover|grab|save|reserve|rsvp|dm)\b|\[(?:cta|link)[^\]]*\]|https?://|link in bio"
+)
+_OPT_OUT = re.compile(r"\b(stop|unsubscribe|opt[- ]?out)\b")
+_SUBJECT = re.compile(r"^\s*subject\s*:", re.MULTILINE)
+_HOOK = re.compile(r"[?!]|\b(you|your|new|free|\d+)\b|[\U0001F300-\U0001FAFF☀-➿]")
+_WORD = re.compile(r"[a-z]+")
+_SENTENCE = re.compile(r"[^.!?\n]*[a-z][^.!?\n]*")
+_VOWEL_GROUP = re.compile(r"[aeiouy]+")
+_SILENT_E = re.compile(r"[a-z][^aeiouy\W\d_]e\b")
+_TAG_PART = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])")
+_CHANNEL_INDEX = {channel: i for i, channel in enumerate(_CHANNELS)}
+
+
+def _features(piece, context: frozenset) -> list:
+    """[channel, chars, CTA, hashtags, on-topic hashtags, flesch, opt-out, subject, hook, campaign keywords]."""
+    body = str(piece.get("body", "") or "")
+    hashtags = piece.get("hashtags") or []
+    lower = body.lower()
+
+    words = _WORD.findall(lower)
+    if words:
+        # Syllables estimated as vowel groups less silent final e's, at least one per word
+        syllables = max(len(_VOWEL_GROUP.findall(lower)) - len(_SILENT_E.findall(lower)), len(words))
+        sentences = max(len(_SENTENCE.findall(lower)), 1)
+        flesch = 206.835 - 1.015 * len(words) / sentences - 84.6 * syllables / len(words)
+    else:
+        flesch = 0.0
+
+    # A hashtag is on-topic if any of its words (split on case: #SummerCoffee)
+    # appears in the body or the campaign brief
+    vocabulary = context.union(words)
+    relevant = 0
+    for tag in hashtags:
+        parts = [p.lower() for p in _TAG_PART.findall(str(tag)) if len(p) > 2]
+        if any(p in vocabulary or p in lower for p in parts):
+            relevant += 1
+
+    first_line = lower.lstrip().split("\n", 1)[0]
+    return [
+        _CHANNEL_INDEX.get(piece.get("channel"), _CHANNEL_INDEX[_DEFAULT_CHANNEL]),
+        len(body),
+        bool(_CTA.search(lower)),
+        len(hashtags),
+        relevant,
+        flesch,
+        bool(_OPT_OUT.search(lower)),
+        bool(_SUBJECT.search(lower)),
+        bool(_HOOK.search(first_line)),
+        len(context.intersection(words)),
+    ]
+
+
+def _context_words(campaign: dict) -> frozenset:
+    """Keywords of the campaign brief (objective, audience, name)."""
+    if not campaign:
+        return frozenset()
+    text = " ".join(str(campaign.get(k, "") or "") for k in ("objective", "audience", "name")).lower()
+    return frozenset(w for w in _WORD.findall(text) if len(w) > 3)
+
+
+# ─── Scoring ────────────────────────────────────────────────────────────────────
+
+def component_scores(pieces: list, campaign: dict = None) -> np.ndarray:
+    """(n, 7) array of component scores in _COMPONENTS order."""
+    if not pieces:
+        return np.zeros((0, len(_COMPONENTS)))
+    context = _context_words(campaign)
+    f = np.array([_features(p, context) for p in pieces], dtype=float)
+    ch = f[:, 0].astype(int)
+    chars, cta, tags, relevant, flesch, opt_out, subject, hook, keywords = f[:, 1:].T
+
+    lo = np.array([_RULES[c]["ideal"][0] for c in _CHANNELS])[ch]
+    hi = np.array([_RULES[c]["ideal"][1] for c in _CHANNELS])[ch]
+    cap = np.array([_RULES[c]["max"] for c in _CHANNELS])[ch]
+    tag_lo = np.array([_RULES[c]["tags"][0] for c in _CHANNELS])[ch]
+    tag_hi = np.array([_RULES[c]["tags"][1] for c in _CHANNELS])[ch]
+    is_sms = ch == _CHANNELS.index("sms")
+    is_email = ch == _CHANNELS.index("email")
+
+    # Length: 1 inside the ideal range, falling off linearly to 0 at 0 chars / the hard cap
+    length = np.where(chars < lo, chars / np.maximum(lo, 1),
+                      np.where(chars <= hi, 1.0, np.clip((cap - chars) / np.maximum(cap - hi, 1), 0, 1)))
+
+    # Hashtags: count inside the range, and the share of them that are on-topic
+    count_ok = np.where(tags < tag_lo, tags / np.maximum(tag_lo, 1),
+                        np.where(tags <= tag_hi, 1.0, np.clip(1 - (tags - tag_hi) / 5, 0, 1)))
+    share = np.where(tags > 0, relevant / np.maximum(tags, 1), 1.0)
+    hashtags = np.where(tag_hi == 0, (tags == 0).astype(float), 0.6 * count_ok + 0.4 * share)
+
+    readability = np.clip(np.where(flesch < 60, flesch / 60, 1 - (flesch - 80) / 40 * (flesch > 80)), 0, 1)
+
+    compliance = np.ones(len(pieces))
+    compliance = np.where(is_sms & (opt_out == 0), 0.0, compliance)
+    compliance = np.where(is_email & (subject == 0), 0.3, compliance)
+    compliance = np.where((is_sms | is_email) & (tags > 0), compliance * 0.5, compliance)
+
+    # No brief to compare against: relevance is neutral rather than a penalty
+    wanted = min(len(context), _RELEVANT_KEYWORDS)
+    relevance = np.clip(keywords / wanted, 0, 1) if wanted else np.ones(len(pieces))
+
+    return np.column_stack([length, cta, hashtags, readability, compliance, hook, relevance])
+
+
+def score_pieces(pieces: list, campaign: dict = None) -> list:
+    """[(ai_score, score_reasoning)] for each piece, in order."""
+    components = component_scores(pieces, campaign)
+    scores = np.rint(100 * components @ _WEIGHTS).astype(int)
+    # Components that score 1 by default aren't worth calling strengths
+    neutral = set()
+    if not _context_words(campaign):
+        neutral.add("relevance")
+    results = []
+    for piece, score, row in zip(pieces, scores.tolist(), components):
+        skip = neutral | ({"hashtags"} if piece.get("channel") in ("email", "sms") else set())
+        ranked = [i for i in np.argsort(-row * _WEIGHTS, kind="stable")
+                  if row[i] >= 0.8 and _COMPONENTS[i] not in skip]
+        strengths = [_STRENGTHS[_COMPONENTS[i]] for i in ranked[:2]]
+        weakest = int(np.argmin(row))
+        parts = []
+        if strengths:
+            parts.append(" and ".join(strengths))
+        if row[weakest] < 0.6:
+            parts.append(_WEAKNESSES[_COMPONENTS[weakest]])
+        reasoning = "; ".join(parts) if parts else "Meets the basics; no standout strengths"
+        results.append((score, reasoning[0].upper() + reasoning[1:] + "."))
+    return results
+
+
+def apply_scores(pieces: list, campaign: dict = None) -> list:
+    """Set ai_score and score_reasoning on each piece in place; returns pieces."""
+    for piece, (score, reasoning) in zip(pieces, score_pieces(pieces, campaign)):
+        piece["ai_score"] = score
+        piece["score_reasoning"] = reasoning
+    return pieces
@@ -0,0 +1,277 @@
+"""
+NEXUS — Fake Gemini Server
+Local, deterministic stand-in for the Gemini REST API, for benchmarking and
+failure testing ai_service offline. Speaks the slice of the API the
+google.genai client uses:
+
+    POST /{version}/models/{model}:generateContent
+    POST /{version}/models/{model}:streamGenerateContent?alt=sse
+
+Responses are synthesized from the NEXUS prompts (content arrays, single
+pieces, insights, replies) and seeded from the prompt, so the same prompt and
+settings always produce the same text, latency, and injected faults.
+
+Usage:
+    python -m utils.fake_llm [--port 8090] [--latency lognormal --latency-ms 800]
+                             [--tokens-per-second 150] [--error-rate 0.1]
+                             [--malformed-rate 0.05] [--hang-rate 0.02]
+
+Point ai_service at it with:
+    AI_BASE_URL=http://127.0.0.1:8090    (GEMINI_API_KEY may be left unset)
+
+Knobs can be changed while running: POST /_config with a JSON body of any
+setting below; GET /_stats returns request counters; POST /_reset clears them.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# ─── Settings ───────────────────────────────────────────────────────────────────
+
+settings = {
+    "seed": 0,
+    "latency": "fixed",          # fixed | uniform | normal | lognormal
+    "latency_ms": 300.0,         # time to first token (mean for the distributions)
+    "jitter_ms": 100.0,          # spread: half-width (uniform) or std dev (normal/lognormal)
+    "tokens_per_second": 0.0,    # output throughput; 0 = the whole body at once
+    "prompt_tokens_per_second": 0.0,  # prompt processing rate, added to latency; 0 = free
+    "chunk_tokens": 12,          # tokens per streamed chunk
+    "error_rate": 0.0,           # share of requests answered with error_code
+    "error_code": 503,
+    "malformed_rate": 0.0,       # share of responses whose JSON is truncated
+    "hang_rate": 0.0,            # share of requests that stall for hang_seconds
+    "hang_seconds": 120.0,
+}
+
+_ERROR_STATUS = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE", 504: "DEADLINE_EXCEEDED"}
+
+stats = {"requests": 0, "streamed": 0, "errors": 0, "malformed": 0, "hangs": 0, "output_tokens": 0}
+_counters = {}  # prompt hash -> times seen, so retries of one prompt differ
+
+
+# ─── Synthetic responses ────────────────────────────────────────────────────────
+
+_CONTENT_TYPES = {"instagram": "caption", "facebook": "post", "tiktok": "script",
+                  "email": "email", "sms": "sms"}
+
+
+def _piece(rng: random.Random, channel: str, content_type: str = None) -> dict:
+    social = channel not in ("email", "sms")
+    return {
+        "channel": channel,
+        "content_type": content_type or _CONTENT_TYPES.get(channel, "post"),
+        "body": f"[fake-llm] {channel.title()} copy #{rng.randint(1000, 9999)}: "
+                + " ".join(rng.choice(["Discover", "Save", "Join", "Try", "Love", "Share", "Today", "Now",
+                                       "your", "new", "favourite", "offer", "community", "launch"])
+                           for _ in range(rng.randint(25, 60))),
+        "hashtags": [f"#Tag{rng.randint(1, 99)}" for _ in range(rng.randint(3, 5))] if social else [],
+        "posting_time_suggestion": f"{rng.choice(['Monday', 'Wednesday', 'Friday'])} {rng.randint(8, 20)}:00",
+        "ai_score": rng.randint(60, 95),
+        "score_reasoning": "Synthetic response from the local fake model server.",
+    }
+
+
+def _respond(prompt: str, rng: random.Random):
+    """Build the JSON answer a NEXUS prompt asks for."""
+    if "for EACH of the following channels" in prompt:
+        match = re.search(r"^- Channels: (.*)$", prompt, re.MULTILINE)
+        channels = [c.strip() for c in match.group(1).split(",")] if match else ["instagram"]
+        return [_piece(rng, ch) for ch in channels if ch]
+
+    match = re.search(r'for the "(\w+)" channel', prompt)
+    if match:
+        content_type = re.search(r"^Content type: (\w+)", prompt, re.MULTILINE)
+        return _piece(rng, match.group(1), content_type.group(1) if content_type else None)
+
+    if "strategic insights" in prompt:
+        return [{
+            "title": f"Insight {i + 1}",
+            "insight": f"[fake-llm] Channel performance observation {rng.randint(1, 999)}.",
+            "recommendation": "Shift budget toward the best-performing channel.",
+        } for i in range(4)]
+
+    if "A customer sent this message" in prompt:
+        confidence = round(rng.uniform(0.3, 0.98), 2)
+        return {
+            "reply": f"[fake-llm] Thanks for reaching out! Reference #{rng.randint(1000, 9999)}.",
+            "confidence_score": confidence,
+            "escalate": confidence < 0.6,
+            "escalation_reason": "Low confidence." if confidence < 0.6 else "",
+        }
+
+    return {"text": "[fake-llm] ok"}
+
+
+def _tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+def _latency(rng: random.Random) -> float:
+    mean, spread = settings["latency_ms"] / 1000, settings["jitter_ms"] / 1000
+    kind = settings["latency"]
+    if kind == "uniform":
+        value = rng.uniform(mean - spread, mean + spread)
+    elif kind == "normal":
+        value = rng.gauss(mean, spread)
+    elif kind == "lognormal" and mean > 0:
+        # Parameterized so the distribution's mean and std dev are latency_ms / jitter_ms
+        sigma2 = math.log(1 + (spread / mean) ** 2)
+        value = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+    else:
+        value = mean
+    return max(value, 0.0)
+
+
+def _envelope(text: str, prompt: str, model: str, final: bool = True) -> dict:
+    body = {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "index": 0,
+            **({"finishReason": "STOP"} if final else {}),
+        }],
+        "modelVersion": model,
+    }
+    if final:
+        body["usageMetadata"] = {
+            "promptTokenCount": _tokens(prompt),
+            "candidatesTokenCount": _tokens(text),
+            "totalTokenCount": _tokens(prompt) + _tokens(text),
+        }
+    return body
+
+
+# ─── Server ─────────────────────────────────────────────────────────────────────
+
+app = FastAPI(title="NEXUS fake Gemini server")
+
+
+def _plan(prompt: str) -> tuple:
+    """Seeded RNG and the fault (if any) for this request."""
+    digest = hashlib.sha256(prompt.encode()).hexdigest()
+    seen = _counters.get(digest, 0)
+    _counters[digest] = seen + 1
+    rng = random.Random(f"{settings['seed']}:{digest}:{seen}")
+    roll = rng.random()
+    fault = None
+    if roll < settings["error_rate"]:
+        fault = "error"
+    elif roll < settings["error_rate"] + settings["hang_rate"]:
+        fault = "hang"
+    elif roll < settings["error_rate"] + settings["hang_rate"] + settings["malformed_rate"]:
+        fault = "malformed"
+    return random.Random(f"{settings['seed']}:{digest}"), rng, fault
+
+
+def _error_response() -> JSONResponse:
+    code = int(settings["error_code"])
+    stats["errors"] += 1
+    return JSONResponse(status_code=code, content={"error": {
+        "code": code,
+        "message": "Injected failure from the fake model server.",
+        "status": _ERROR_STATUS.get(code, "UNKNOWN"),
+    }})
+
+
+def _answer_text(content_rng: random.Random, prompt: str, fault: str) -> str:
+    text = json.dumps(_respond(prompt, content_rng), indent=2)
+    if fault == "malformed":
+        stats["malformed"] += 1
+        text = text[: max(len(text) * 2 // 3, 1)]
+    stats["output_tokens"] += _tokens(text)
+    return text
+
+
+async def _read_prompt(request: Request) -> str:
+    body = await request.json()
+    return "\n".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+
+@app.post("/{version}/models/{model_action}")
+async def generate(version: str, model_action: str, request: Request):
+    model, _, action = model_action.partition(":")
+    prompt = await _read_prompt(request)
+    stats["requests"] += 1
+    content_rng, rng, fault = _plan(prompt)
+
+    prefill = settings["prompt_tokens_per_second"]
+    await asyncio.sleep(_latency(rng) + (_tokens(prompt) / prefill if prefill else 0))
+    if fault == "hang":
+        stats["hangs"] += 1
+        await asyncio.sleep(settings["hang_seconds"])
+    if fault == "error":
+        return _error_response()
+
+    text = _answer_text(content_rng, prompt, fault)
+    tps = settings["tokens_per_second"]
+
+    if action == "streamGenerateContent":
+        stats["streamed"] += 1
+        step = max(int(settings["chunk_tokens"]) * 4, 1)
+        chunks = [text[i:i + step] for i in range(0, len(text), step)]
+
+        async def events():
+            for n, chunk in enumerate(chunks):
+                if tps:
+                    await asyncio.sleep(_tokens(chunk) / tps)
+                final = n == len(chunks) - 1
+                yield f"data: {json.dumps(_envelope(chunk, prompt, model, final))}\r\n\r\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    if tps:
+        await asyncio.sleep(_tokens(text) / tps)
+    return _envelope(text, prompt, model)
+
+
+@app.post("/_config")
+async def configure(request: Request):
+    updates = await request.json()
+    unknown = set(updates) - set(settings)
+    if unknown:
+        return JSONResponse(status_code=400, content={"detail": f"Unknown settings: {sorted(unknown)}"})
+    for key, value in updates.items():
+        settings[key] = type(settings[key])(value)
+    return settings
+
+
+@app.get("/_stats")
+def read_stats():
+    return {**stats, "settings": settings}
+
+
+@app.post("/_reset")
+def reset():
+    for key in stats:
+        stats[key] = 0
+    _counters.clear()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Gemini server for NEXUS.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    for key, default in settings.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+    for key in settings:
+        settings[key] = getattr(args, key)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+NEXUS — Intent Classifier
+Single-pass keyword classifier for customer messages, used by the fallback
+reply path when Gemini is unavailable.
+
+All keywords of all intents are compiled into one lookup table keyed on
+word tokens. Keywords match whole words exactly, so each inflection a
+keyword should cover is listed in the lexicon ("refund", "refunds",
+"refunded"); nothing is derived by appending suffixes, which would let
+"late" match "lately" or "issue" match "issued". One pass over the
+message's words then scores every intent at once, at a cost that doesn't grow with the size of the lexicon; a
+multi-word keyword ("money back") is tried longest first wherever its first
+word appears, and counts in addition to any single-word keywords inside it.
+
+The primary intent is the highest-scoring one, except that an escalating
+intent (e.g. refund) always outranks a non-escalating one. Confidence starts
+from the primary intent's base confidence and drops as other intents compete
+for the message; the reply is escalated if any escalating intent matched or
+the confidence falls below ESCALATE_BELOW.
+
+The lexicon can be extended or overridden with a JSON file named by
+AI_INTENT_LEXICON: {"intent": {"keywords": [...], "weight": 1.0, ...}}, with
+the same fields as DEFAULT_LEXICON (missing fields keep their defaults).
+"""
+
+import json
+import os
+import re
+
+ESCALATE_BELOW = 0.6
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+DEFAULT_LEXICON = {
+    "refund": {
+        "keywords": ["refund", "refunds", "refunded", "refunding",
+                     "cancel", "cancels", "cancelled", "canceled", "cancelling", "canceling",
+                     "cancellation", "money back", "chargeback", "chargebacks", "return my"],
+        "weight": 1.5,
+        "confidence": 0.45,
+        "escalate": "Refund/cancellation requests require human approval.",
+        "reply": (
+            "I understand your concern and I'm sorry for any inconvenience. "
+            "I'd like to help resolve this for you.\n\n"
+            "To process your request, I'll need to review your account details. "
+            "Could you share your order number? I'll escalate this to ensure a swift resolution.\n\n"
+            "Thank you for your patience."
+        ),
+        "addendum": "I've also noted your refund/cancellation request and passed it to our team for approval.",
+    },
+    "complaint": {
+        "keywords": ["complaint", "complaints", "issue", "issues", "problem", "problems", "broken",
+                     "not working", "disappointed", "disappointing", "damaged", "late", "wrong",
+                     "terrible"],
+        "weight": 1.2,
+        "confidence": 0.65,
+        "escalate": "",
+        "reply": (
+            "I'm truly sorry to hear about this issue. Your experience matters to us, and I want to make this right.\n\n"
+            "Could you provide me with your order number or account details so I can look into this immediately? "
+            "In the meantime, I've flagged this for priority handling.\n\n"
+            "We'll get this resolved for you as quickly as possible."
+        ),
+        "addendum": "I'm sorry about the trouble you've had — I've flagged it for priority handling.",
+    },
+    "pricing": {
+        "keywords": ["price", "prices", "pricing", "cost", "costs", "how much", "quote", "quotes",
+                     "discount", "discounts"],
+        "weight": 1.0,
+        "confidence": 0.82,
+        "escalate": "",
+        "reply": (
+            "Thank you for your interest in our pricing! We'd love to help you find the perfect plan.\n\n"
+            "Our pricing varies based on your specific needs. I'd recommend scheduling a quick call "
+            "with our team so we can understand your requirements and provide a tailored quote.\n\n"
+            "Would you like me to set that up for you?"
+        ),
+        "addendum": "On pricing: our team can put together a tailored quote for your needs.",
+    },
+    "praise": {
+        "keywords": ["thank", "thanks", "thanked", "great", "awesome", "love", "loved", "loving",
+                     "amazing"],
+        "weight": 0.8,
+        "confidence": 0.95,
+        "escalate": "",
+        "reply": (
+            "Thank you so much for your kind words! It means the world to us. 😊\n\n"
+            "We're always striving to deliver the best experience. If there's anything else "
+            "we can help with, don't hesitate to reach out!\n\n"
+            "Have a wonderful day!"
+        ),
+        "addendum": "",
+    },
+}
+
+GENERAL = {
+    "confidence": 0.72,
+    "reply": (
+        "Thank you for reaching out! I appreciate your message.\n\n"
+        "I'd like to make sure I address your query properly. "
+        "Could you provide a bit more detail about what you're looking for? "
+        "That way, I can connect you with the right resources or provide a detailed answer.\n\n"
+        "Looking forward to helping you!"
+    ),
+}
+
+
+def load_lexicon(path: str = None) -> dict:
+    """DEFAULT_LEXICON merged with the JSON file at path (or AI_INTENT_LEXICON)."""
+    lexicon = {name: dict(entry) for name, entry in DEFAULT_LEXICON.items()}
+    path = path if path is not None else os.getenv("AI_INTENT_LEXICON", "")
+    if not path:
+        return lexicon
+    try:
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not load intent lexicon {path} ({e}) — using defaults.")
+        return lexicon
+    for name, entry in overrides.items():
+        base = lexicon.get(name, {"weight": 1.0, "confidence": GENERAL["confidence"], "escalate": "",
+                                  "reply": GENERAL["reply"], "addendum": ""})
+        lexicon[name] = {**base, **entry}
+    return lexicon
+
+
+class IntentClassifier:
+    def __init__(self, lexicon: dict = None):
+        self.lexicon = lexicon if lexicon is not None else load_lexicon()
+        self._words = {}     # single word form -> intent
+        self._phrases = {}   # first word -> [(remaining words, intent)], longest first
+        for name, entry in self.lexicon.items():
+            for keyword in entry.get("keywords", []):
+                words = _WORD.findall(keyword.lower())
+                if not words:
+                    continue
+                if len(words) == 1:
+                    self._words.setdefault(words[0], name)
+                else:
+                    self._phrases.setdefault(words[0], []).append((tuple(words[1:]), name))
+        for entries in self._phrases.values():
+            entries.sort(key=lambda e: len(e[0]), reverse=True)
+        self._weights = {name: entry.get("weight", 1.0) for name, entry in self.lexicon.items()}
+
+    def scores(self, message: str) -> dict:
+        """Weighted keyword hits per intent, in one pass over the message."""
+        words, phrases, weights = self._words, self._phrases, self._weights
+        tokens = _WORD.findall(message.lower())
+        hits = [words[t] for t in tokens if t in words]
+        if not phrases.keys().isdisjoint(tokens):
+            for i, token in enumerate(tokens):
+                for rest, intent in phrases.get(token, ()):
+                    if tuple(tokens[i + 1:i + 1 + len(rest)]) == rest:
+                        hits.append(intent)
+                        break
+        scores = {}
+        for intent in hits:
+            scores[intent] = scores.get(intent, 0.0) + weights[intent]
+        return scores
+
+    def classify(self, message: str) -> dict:
+        """
+        {"intent", "intents" (all matched, strongest first, with share of the
+        total score), "confidence", "escalate", "escalation_reason"}.
+        """
+        scores = self.scores(message)
+        if not scores:
+            return {"intent": "general", "intents": [], "confidence": GENERAL["confidence"],
+                    "escalate": False, "escalation_reason": ""}
+
+        total = sum(scores.values())
+        ranked = sorted(scores, key=lambda i: (not self.lexicon[i].get("escalate"), -scores[i]))
+        primary = ranked[0]
+        share = scores[primary] / total
+
+        # A message split across intents is less certain than a single-topic one
+        confidence = round(self.lexicon[primary].get("confidence", GENERAL["confidence"]) * (0.75 + 0.25 * share), 2)
+        reasons = [self.lexicon[i]["escalate"] for i in ranked if self.lexicon[i].get("escalate")]
+        if not reasons and confidence < ESCALATE_BELOW:
+            reasons = ["Low confidence score — recommend human review."]
+        return {
+            "intent": primary,
+            "intents": [{"intent": i, "share": round(scores[i] / total, 3)} for i in ranked],
+            "confidence": confidence,
+            "escalate": bool(reasons),
+            "escalation_reason": reasons[0] if reasons else "",
+        }
+
+    def reply(self, classification: dict) -> str:
+        """Template reply for the primary intent, plus a line for each other intent."""
+        primary = classification["intent"]
+        if primary == "general":
+            return GENERAL["reply"]
+        text = self.lexicon[primary].get("reply") or GENERAL["reply"]
+        extras = [self.lexicon[i["intent"]].get("addendum") for i in classification["intents"][1:]]
+        extras = [e for e in extras if e]
+        return text + ("\n\n" + " ".join(extras) if extras else "")
+
+
+_classifier = None
+
+
+def get_classifier() -> IntentClassifier:
+    """The process-wide classifier, compiled on first use."""
+    global _classifier
+    if _classifier is None:
+        _classifier = IntentClassifier()
+    return _classifier
@@ -0,0 +1,81 @@
+"""
+NEXUS — Incremental JSON Array Parser
+Feeds a JSON array in arbitrary text chunks (e.g. a streamed model response)
+and emits each top-level object as soon as its closing brace arrives.
+
+Anything before the opening '[' (markdown fences, preamble) is ignored, as is
+anything after the closing ']'. An element that fails to parse is skipped and
+counted in .errors rather than aborting the rest of the array.
+"""
+
+import json
+
+
+class JSONArrayStream:
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0          # next character of _buffer to scan
+        self._start = None     # index where the current element began
+        self._depth = 0        # nesting depth inside the top-level array
+        self._in_string = False
+        self._escaped = False
+        self.started = False   # seen the opening '['
+        self.finished = False  # seen the closing ']'
+        self.errors = 0
+
+    def feed(self, chunk: str) -> list:
+        """Add text; return the objects completed by it, in order."""
+        if self.finished or not chunk:
+            return []
+        self._buffer += chunk
+        items = []
+        buf = self._buffer
+        i = self._pos
+
+        while i < len(buf):
+            c = buf[i]
+            if not self.started:
+                if c == "[":
+                    self.started = True
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c in "{[":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif c in "}]":
+                if self._depth == 0:          # closing ']' of the array itself
+                    self.finished = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    items.extend(self._emit(buf[self._start:i + 1]))
+                    self._start = None
+            i += 1
+
+        # Drop everything already consumed so the buffer stays one element long
+        keep = self._start if self._start is not None else i
+        self._buffer = buf[keep:]
+        self._pos = i - keep
+        if self._start is not None:
+            self._start = 0
+        return items
+
+    def _emit(self, text: str) -> list:
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            print(f"⚠️  Skipping malformed streamed JSON element: {e}")
+            self.errors += 1
+            return []
+        if not isinstance(value, dict):
+            self.errors += 1
+            return []
+        return [value]
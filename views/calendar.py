@@ -24,8 +24,10 @@ def render():
 
     campaign_id = campaign["id"]
 
-    # ── Load all content ──
-    content_list = api_client.list_content(campaign_id)
+    # ── Load all content (body only feeds the draft previews) ──
+    content_list = api_client.list_content(
+        campaign_id, fields=["status", "channel", "scheduled_at", "body"],
+    )
 
     if not content_list:
         st.info("No content yet. Head to **Generate** to create content first! ✦")
@@ -7,7 +7,7 @@ Features: F-01 (Campaign form), F-14 (Campaign list), F-18 (Tone/channel config)
 import streamlit as st
 from services import api_client
 from config.settings import (
-    CHANNELS, TONE_OPTIONS, OBJECTIVE_SUGGESTIONS, DURATION_OPTIONS
+    CHANNELS, TONE_OPTIONS, OBJECTIVE_SUGGESTIONS, DURATION_OPTIONS, LIST_PAGE_SIZE
 )
 
 
@@ -29,11 +29,26 @@ def render():
 #  CAMPAIGN LIST (F-14)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _load_campaign_pages(user_id: str) -> dict:
+    """Return the pages loaded so far, fetching the first one if needed."""
+    pages = st.session_state.get("campaign_pages")
+    if not pages or pages.get("user_id") != user_id:
+        page = api_client.list_campaigns_page(user_id, limit=LIST_PAGE_SIZE)
+        pages = {
+            "user_id": user_id,
+            "items": page.get("items", []),
+            "next_cursor": page.get("next_cursor"),
+        }
+        st.session_state["campaign_pages"] = pages
+    return pages
+
+
 def _render_campaign_list():
     """Show all campaigns as selectable cards with edit/delete actions."""
 
     user_id = st.session_state.get("user_id")
-    campaigns = api_client.list_campaigns(user_id)
+    pages = _load_campaign_pages(user_id)
+    campaigns = pages["items"]
 
     if not campaigns:
         st.info("No campaigns yet. Create your first one below! 👇")
@@ -124,6 +139,7 @@ def _render_campaign_list():
                 with c_yes:
                     if st.button("🗑️ Yes, Delete", key=f"confirm_yes_{camp['id']}", use_container_width=True, type="primary"):
                         result = api_client.delete_campaign(camp["id"])
+                        st.session_state.pop("campaign_pages", None)
                         # Clear active campaign if this was the active one
                         if is_active:
                             st.session_state["active_campaign"] = None
@@ -135,6 +151,16 @@ def _render_campaign_list():
                         del st.session_state[f"confirm_delete_{camp['id']}"]
                         st.rerun()
 
+    # ── Load more ──
+    if pages.get("next_cursor"):
+        if st.button("⬇️ Load more campaigns", key="campaigns_load_more", use_container_width=True):
+            page = api_client.list_campaigns_page(
+                user_id, limit=LIST_PAGE_SIZE, cursor=pages["next_cursor"],
+            )
+            pages["items"].extend(page.get("items", []))
+            pages["next_cursor"] = page.get("next_cursor")
+            st.rerun()
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  EDIT FORM
@@ -218,6 +244,7 @@ def _render_edit_form():
             result = api_client.update_campaign(campaign_id, updates)
 
             if result.get("id"):
+                st.session_state.pop("campaign_pages", None)
                 # Update active campaign if this was the active one
                 active = st.session_state.get("active_campaign")
                 if active and active.get("id") == campaign_id:
@@ -315,6 +342,7 @@ def _render_create_form():
             result = api_client.create_campaign(data)
 
             if result.get("id"):
+                st.session_state.pop("campaign_pages", None)
                 st.session_state["active_campaign"] = result
                 st.success(f"✅ Campaign **{name}** created and set as active!")
                 st.balloons()
@@ -1,12 +1,12 @@
 """
 NEXUS — Correspondence Page
 AI auto-reply drafting with confidence scoring, escalation flags, and FAQ handler.
-Features: F-17 (AI Reply), F-22 (Escalation), F-21 (FAQ Handler)
+Features: F-17 (AI Reply), F-22 (Escalation), F-21 (FAQ Handler), bulk inbox triage
 """
 
 import streamlit as st
 from services import api_client
-from config.settings import CHANNELS
+from config.settings import CHANNELS, LIST_PAGE_SIZE
 
 
 def render():
@@ -20,7 +20,9 @@ def render():
     campaign_id = campaign["id"]
 
     # ── Two-column layout ──
-    tab_reply, tab_history, tab_faq = st.tabs(["✉️ Draft Reply", "📜 History", "📋 FAQ Manager"])
+    tab_reply, tab_triage, tab_history, tab_faq = st.tabs(
+        ["✉️ Draft Reply", "📥 Bulk Triage", "📜 History", "📋 FAQ Manager"]
+    )
 
     # ═══════════════════════════════════════════════════════════════════════════
     #  TAB 1: Draft Reply (F-17 + F-22)
@@ -66,6 +68,7 @@ def render():
 
             if result.get("success"):
                 st.session_state["last_reply"] = result
+                st.session_state.pop("reply_history", None)
                 st.rerun()
             else:
                 st.error(f"Failed: {result.get('message', 'Unknown error')}")
@@ -77,19 +80,39 @@ def render():
             _render_reply_card(last_reply, campaign_id)
 
     # ═══════════════════════════════════════════════════════════════════════════
-    #  TAB 2: History
+    #  TAB 2: Bulk Triage
     # ═══════════════════════════════════════════════════════════════════════════
 
-    with tab_history:
-        st.subheader("📜 Conversation History")
+    with tab_triage:
+        st.subheader("📥 Bulk Inbox Triage")
+        st.caption("Paste many messages (one per line) or upload a CSV / JSONL file. "
+                   "Replies are drafted in parallel; escalations are listed first.")
 
-        history = api_client.list_correspondence(campaign_id)
+        pasted = st.text_area("Customer Messages", height=150, key="triage_input",
+                              placeholder="One customer message per line...")
+        upload = st.file_uploader("…or upload a file", type=["csv", "jsonl", "ndjson", "json"],
+                                  key="triage_upload")
+        triage_tone = st.selectbox("Reply Tone", ["Professional", "Friendly", "Casual", "Formal", "Empathetic"],
+                                   key="triage_tone")
 
-        if not history or isinstance(history, dict):
-            st.info("No conversation history yet. Draft a reply to get started!")
-            return
+        lines = [line.strip() for line in pasted.splitlines() if line.strip()]
+        if st.button("🤖 Triage Inbox", type="primary", use_container_width=True,
+                     disabled=not (lines or upload)):
+            _run_triage(campaign_id, lines, upload, triage_tone)
+
+        triage = st.session_state.get("triage_results")
+        if triage and triage.get("campaign_id") == campaign_id:
+            _render_triage(triage)
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    #  TAB 3: History
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    with tab_history:
+        st.subheader("📜 Conversation History")
 
-        replies = [h for h in history if h.get("type") == "reply"]
+        history = _load_reply_history(campaign_id)
+        replies = history["items"]
 
         if not replies:
             st.info("No replies drafted yet.")
@@ -122,8 +145,18 @@ def render():
                                 unsafe_allow_html=True,
                             )
 
+            if history.get("next_cursor"):
+                if st.button("⬇️ Load older replies", key="history_load_more", use_container_width=True):
+                    page = api_client.list_correspondence_page(
+                        campaign_id, type_filter="reply",
+                        limit=LIST_PAGE_SIZE, cursor=history["next_cursor"],
+                    )
+                    history["items"].extend(page.get("items", []))
+                    history["next_cursor"] = page.get("next_cursor")
+                    st.rerun()
+
     # ═══════════════════════════════════════════════════════════════════════════
-    #  TAB 3: FAQ Manager (F-21)
+    #  TAB 4: FAQ Manager (F-21)
     # ═══════════════════════════════════════════════════════════════════════════
 
     with tab_faq:
@@ -152,6 +185,79 @@ def render():
                     st.markdown(f"**A:** {faq.get('ai_reply', '—')}")
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  BULK TRIAGE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _run_triage(campaign_id: str, lines: list, upload, brand_tone: str):
+    """Stream triage results into a progress bar, then keep them in session state."""
+    rows, done = [], None
+    progress = st.progress(0.0, text="Drafting replies...")
+    events = api_client.triage_replies(
+        campaign_id,
+        messages=None if upload else lines,
+        upload=upload.getvalue() if upload else None,
+        upload_name=upload.name if upload else "",
+        business_name="My Business",
+        brand_tone=brand_tone,
+    )
+    total = len(lines) if not upload else None
+    for event in events:
+        if event.get("type") == "result":
+            rows.append(event)
+            fraction = min(len(rows) / total, 1.0) if total else 0.0
+            progress.progress(fraction, text=f"Drafted {len(rows)} repl{'y' if len(rows) == 1 else 'ies'}...")
+        elif event.get("type") == "done":
+            done = event
+        elif event.get("type") == "error":
+            progress.empty()
+            st.error(f"Triage failed: {event.get('message', 'Unknown error')}")
+            return
+    progress.empty()
+
+    by_index = {row["index"]: row for row in rows}
+    order = done.get("order", []) if done else sorted(by_index)
+    st.session_state["triage_results"] = {
+        "campaign_id": campaign_id,
+        "rows": [by_index[i] for i in order if i in by_index],
+        "summary": done or {},
+    }
+    st.session_state.pop("reply_history", None)
+
+
+def _render_triage(triage: dict):
+    summary = triage["summary"]
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Messages", summary.get("total", len(triage["rows"])))
+    m2.metric("Escalated", summary.get("escalated", 0))
+    m3.metric("Answered from FAQ", summary.get("faq_answers", 0))
+
+    for row in triage["rows"]:
+        label = f"{'⚠️ ' if row.get('escalate') else ''}{row.get('customer_message', '')[:80]}"
+        with st.expander(label, expanded=False):
+            if row.get("escalate"):
+                st.warning(row.get("escalation_reason") or "This reply needs human review.")
+            st.markdown(row.get("reply", "—"))
+            source = "FAQ" if row.get("source") == "faq" else "AI"
+            st.caption(f"{source} · confidence {row.get('confidence_score', 0):.0%}")
+
+
+def _load_reply_history(campaign_id: str) -> dict:
+    """Return the reply pages loaded so far, fetching the newest page if needed."""
+    history = st.session_state.get("reply_history")
+    if not history or history.get("campaign_id") != campaign_id:
+        page = api_client.list_correspondence_page(
+            campaign_id, type_filter="reply", limit=LIST_PAGE_SIZE,
+        )
+        history = {
+            "campaign_id": campaign_id,
+            "items": page.get("items", []),
+            "next_cursor": page.get("next_cursor"),
+        }
+        st.session_state["reply_history"] = history
+    return history
+
+
 def _render_reply_card(reply_data: dict, campaign_id: str):
     """Render the AI reply result with confidence score and escalation flag."""
 
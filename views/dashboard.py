@@ -675,7 +675,8 @@ def _render_campaign_details(camp: dict):
     )
 
     # ── Content stats as HTML cards ──
-    content = api_client.list_content(campaign_id)
+    # Counters and upcoming posts only need these — skip the large body text
+    content = api_client.list_content(campaign_id, fields=["status", "channel", "scheduled_at"])
     if not content or not isinstance(content, list):
         content = []
 
@@ -34,21 +34,16 @@ def render():
     # ── Generate button ──
     col_gen, col_info = st.columns([1, 2])
     with col_gen:
-        if st.button("🚀 Generate All Content", use_container_width=True, type="primary"):
-            with st.spinner("🤖 AI is generating content for all channels..."):
-                result = api_client.generate_content(campaign_id)
-            if result.get("success"):
-                st.session_state["generated_content"] = result.get("content", [])
-                st.success(f"✅ {result.get('message', 'Content generated!')}")
-                st.rerun()
-            else:
-                st.error(f"Generation failed: {result.get('message', 'Unknown error')}")
+        start_generation = st.button("🚀 Generate All Content", use_container_width=True, type="primary")
 
     with col_info:
         st.caption("This will generate one content piece per selected channel using AI. Any existing content will be replaced.")
 
     st.divider()
 
+    if start_generation:
+        _stream_generation(campaign_id)
+
     # ── Load existing content ──
     content_list = st.session_state.get("generated_content")
     if not content_list:
@@ -68,6 +63,44 @@ def render():
         _render_content_card(piece, i, campaign_id, campaign)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  STREAMED GENERATION (F-02)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _stream_generation(campaign_id: str):
+    """Show each piece the moment the backend generates it, then reload the full cards."""
+    status = st.status("🤖 AI is generating content...", expanded=True)
+    generated = 0
+    result = {"type": "error", "message": "No response from backend."}
+
+    for event in api_client.generate_content_stream(campaign_id):
+        if event.get("type") == "piece":
+            generated += 1
+            with status:
+                _render_preview_card(event["content"])
+            status.update(label=f"🤖 Generated {generated} piece(s)...")
+        else:
+            result = event
+            break
+
+    if result.get("type") == "done":
+        status.update(label="✅ Generation complete", state="complete", expanded=False)
+        st.session_state["generated_content"] = api_client.list_content(campaign_id)
+        st.success(f"✅ {result.get('message', 'Content generated!')}")
+        st.rerun()
+    else:
+        status.update(label="Generation failed", state="error")
+        st.error(f"Generation failed: {result.get('message', 'Unknown error')}")
+
+
+def _render_preview_card(piece: dict):
+    """Read-only card for a piece that has just arrived."""
+    ch = _CHANNEL_MAP.get(piece.get("channel", ""), {"icon": "📌", "name": piece.get("channel", "")})
+    with st.container(border=True):
+        st.markdown(f"**{ch['icon']} {ch['name']}**  ·  Score: **{piece.get('ai_score', 0)}**")
+        st.markdown(f"```\n{piece.get('body', '')}\n```")
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  CONTENT CARD (F-03)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -193,6 +226,8 @@ def _render_content_card(piece: dict, index: int, campaign_id: str, campaign: di
             # Edited badge
             if piece.get("is_edited"):
                 st.caption("✏️ *Manually edited*")
+            if piece.get("near_duplicate"):
+                st.caption("♻️ *Very similar to earlier content — try regenerating again*")
 
         # ── Action buttons ──
         if not is_editing and not is_scheduling: